@@ -29,7 +29,7 @@ import time
 import traceback
 import sys
 import threading
-from typing import Dict, Optional, Tuple, Iterable, Callable, Union, Sequence, Mapping
+from typing import Dict, Optional, Tuple, Iterable, Callable, Union, Sequence, Mapping, List, Set
 from base64 import b64decode, b64encode
 from collections import defaultdict
 import concurrent
@@ -422,6 +422,11 @@ class Daemon(Logger):
         self.gui_object = None
         # path -> wallet;   make sure path is standardized.
         self._wallets = {}  # type: Dict[str, Abstract_Wallet]
+        # path -> (loader, on_loaded) of the wallets registered but not loaded yet, see add_lazy_wallet
+        self._lazy_wallets = {}  # type: Dict[str, Tuple[Callable[[], Optional[Abstract_Wallet]], Optional[Callable]]]
+        self._loading_wallets = {}  # type: Dict[str, Tuple[int, threading.Event]]
+        self._removed_loading_wallets = set()  # type: Set[str]  # stopped or deleted while being loaded
+        self._lazy_wallets_lock = threading.Lock()
         daemon_jobs = []
         # Setup commands server
         self.commands_server = None
@@ -491,15 +496,119 @@ class Daemon(Logger):
     def add_wallet(self, wallet: Abstract_Wallet) -> None:
         path = wallet.storage.path
         path = standardize_path(path)
-        self._wallets[path] = wallet
+        with self._lazy_wallets_lock:
+            if path in self._removed_loading_wallets:
+                return  # stopped or deleted while being loaded lazily, not to resurrect it
+            self._wallets[path] = wallet
+
+    def add_lazy_wallet(
+        self,
+        path: str,
+        loader: Callable[[], Optional[Abstract_Wallet]],
+        on_loaded: Callable[[str, Abstract_Wallet], None] = None,
+    ) -> None:
+        """Register a wallet to be loaded by loader on first use, i.e. get_wallet(path).
+        on_loaded(path, wallet) is called once the wallet is loaded and added, before its waiters return.
+        """
+        path = standardize_path(path)
+        with self._lazy_wallets_lock:
+            if path not in self._wallets:
+                self._lazy_wallets[path] = (loader, on_loaded)
+
+    def _materialize_wallet(self, path: str) -> Optional[Abstract_Wallet]:
+        with self._lazy_wallets_lock:
+            loading = self._loading_wallets.get(path)
+            lazy = self._lazy_wallets.pop(path, None) if loading is None else None
+            if lazy is not None:
+                loading = self._loading_wallets[path] = (threading.get_ident(), threading.Event())
+            elif loading is None or loading[0] == threading.get_ident():
+                return self._wallets.get(path)  # loaded already, or being loaded by the loader itself
+        if lazy is None:
+            loading[1].wait()  # being loaded by another thread
+            return self._wallets.get(path)
+        on_loaded = lazy[1]
+        start = time.time()
+        try:
+            wallet = self._load_lazy_wallet(path, lazy)
+            if wallet is not None and on_loaded is not None:
+                on_loaded(path, wallet)
+        except Exception:
+            self.logger.exception(f"failed to load wallet lazily. path: {path}")
+        finally:
+            loading[1].set()
+        self.logger.debug(f"wallet loaded lazily in {time.time() - start:.3f}s. path: {path}")
+        return self._wallets.get(path)
+
+    def _load_lazy_wallet(self, path: str, lazy: Tuple[Callable, Optional[Callable]]) -> Optional[Abstract_Wallet]:
+        wallet, is_failed = None, True
+        try:
+            wallet = lazy[0]()
+            is_failed = False
+        finally:
+            # re-check under the lock, as the wallet may be stopped or deleted meanwhile, or the daemon stopped
+            with self._lazy_wallets_lock:
+                self._loading_wallets.pop(path)
+                is_removed = path in self._removed_loading_wallets
+                self._removed_loading_wallets.discard(path)
+                if is_removed:
+                    pass
+                elif is_failed:
+                    if path not in self._wallets:
+                        self._lazy_wallets.setdefault(path, lazy)  # keep it registered, to be loaded on next use
+                elif wallet is not None:
+                    self._wallets[path] = wallet
+        if wallet is not None and is_removed:
+            wallet.stop()
+            return None
+        return wallet
+
+    def prefetch_lazy_wallets(self, max_workers: int = 4) -> None:
+        """Load the lazy wallets on a worker pool in background."""
+        paths = list(self._lazy_wallets)
+        if not paths:
+            return
+        executor = futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="wallet_prefetch")
+        for path in paths:
+            executor.submit(self._materialize_wallet, path)
+        executor.shutdown(wait=False)
 
     def get_wallet(self, path: str) -> Optional[Abstract_Wallet]:
         path = standardize_path(path)
-        return self._wallets.get(path)
+        wallet = self._wallets.get(path)
+        if wallet is None and (path in self._lazy_wallets or path in self._loading_wallets):
+            wallet = self._materialize_wallet(path)
+        return wallet
 
     def get_wallets(self) -> Dict[str, Abstract_Wallet]:
+        """Return all the wallets, the lazy ones are loaded synchronously, see get_loaded_wallets."""
+        for path in list(self._lazy_wallets) + list(self._loading_wallets):
+            self._materialize_wallet(path)
         return dict(self._wallets)  # copy
 
+    def get_loaded_wallets(self) -> Dict[str, Abstract_Wallet]:
+        """Return the wallets loaded already, without loading the lazy ones."""
+        with self._lazy_wallets_lock:
+            return dict(self._wallets)  # copy
+
+    def get_wallet_paths(self) -> List[str]:
+        """Return the paths of all the wallets, including the lazy ones not loaded yet."""
+        with self._lazy_wallets_lock:
+            return list(dict.fromkeys([*self._wallets, *self._loading_wallets, *self._lazy_wallets]))
+
+    def _remove_lazy_wallet(self, path: str) -> bool:
+        # with _lazy_wallets_lock held
+        is_lazy = self._lazy_wallets.pop(path, None) is not None
+        if path in self._loading_wallets:
+            self._removed_loading_wallets.add(path)  # not to be added once loaded
+            is_lazy = True
+        return is_lazy
+
+    def clear_wallets(self) -> None:
+        with self._lazy_wallets_lock:
+            for path in list(self._lazy_wallets) + list(self._loading_wallets):
+                self._remove_lazy_wallet(path)
+            self._wallets.clear()
+
     def delete_wallet(self, path: str) -> bool:
         self.stop_wallet(path)
         if os.path.exists(path):
@@ -509,12 +618,18 @@ class Daemon(Logger):
 
     def pop_wallet(self, path):
         path = standardize_path(path)
-        wallet = self._wallets.pop(path, None)
+        with self._lazy_wallets_lock:
+            self._remove_lazy_wallet(path)
+            wallet = self._wallets.pop(path, None)
 
     def stop_wallet(self, path: str) -> bool:
         """Returns True iff a wallet was found."""
         path = standardize_path(path)
-        wallet = self._wallets.pop(path, None)
+        with self._lazy_wallets_lock:
+            is_lazy = self._remove_lazy_wallet(path)
+            wallet = self._wallets.pop(path, None)
+        if not wallet and is_lazy:
+            return True
         if not wallet:
             return False
         wallet.stop()
@@ -541,7 +656,11 @@ class Daemon(Logger):
         if self.gui_object:
             self.gui_object.stop()
         # stop network/wallets
-        for k, wallet in self._wallets.items():
+        with self._lazy_wallets_lock:
+            self._lazy_wallets.clear()
+            self._removed_loading_wallets.update(self._loading_wallets)  # stopped once loaded
+            wallets = list(self._wallets.values())
+        for wallet in wallets:
             wallet.stop()
         if self.network:
             self.logger.info("shutting down network")
@@ -63,6 +63,105 @@ from electrum_gui.common.wallet import utils as wallet_utils
 _logger = logging.get_logger(__name__)
 
 
+class _SharedBalanceCache(object):
+    """
+    Balances of the main coin and the tokens by (chain_code, address), shared by all the wallets watching the address.
+    All the balances of an address are fetched by one batch query, and the stale ones are returned at once
+    while refreshed in background, so that only the first query of an address waits for the network,
+    and the concurrent queries wait for the same refreshing instead of sending their own.
+    The tokens not queried for watch_seconds are not refreshed any more
+    """
+
+    def __init__(self, fresh_seconds: float = 10, watch_seconds: float = 10 * 60):
+        self.fresh_seconds = fresh_seconds
+        self.watch_seconds = watch_seconds
+        self._balances: Dict[Tuple[str, str], Dict[Optional[str], int]] = {}
+        self._updated_times: Dict[Tuple[str, str], float] = {}
+        self._watched_tokens: Dict[Tuple[str, str], Dict[str, float]] = {}  # token address -> last queried time
+        self._refreshing: Dict[Tuple[str, str], threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def get_balances(self, chain_code: str, address: str, token_addresses: Sequence[str]) -> Dict[Optional[str], int]:
+        """
+        Get the balances of address
+        :param chain_code: chain code
+        :param address: checksum address
+        :param token_addresses: token addresses
+        :return: balances by the lowercase token address, the one of main coin by None
+        """
+        key = (chain_code, address.lower())
+        token_addresses = {i.lower() for i in token_addresses}
+
+        while True:
+            with self._lock:
+                self._watched_tokens.setdefault(key, {}).update(dict.fromkeys(token_addresses, time.time()))
+                balances = self._balances.get(key, {})
+                is_missing = any(i not in balances for i in (None, *token_addresses))
+                is_stale = time.time() - self._updated_times.get(key, 0) > self.fresh_seconds
+                refreshing = self._refreshing.get(key)
+
+                if not is_missing and (not is_stale or refreshing is not None):
+                    return balances.copy()
+
+                is_refresher = refreshing is None
+                if is_refresher:
+                    refreshing = self._refreshing[key] = threading.Event()
+
+            if not is_refresher:
+                refreshing.wait()  # missing, wait for the refreshing in flight and check again
+            elif is_missing:
+                self._refresh(chain_code, address)
+            else:
+                threading.Thread(target=self._refresh, args=(chain_code, address), daemon=True).start()
+                return balances.copy()
+
+    def _refresh(self, chain_code: str, address: str):
+        key = (chain_code, address.lower())
+
+        try:
+            with self._lock:
+                watched_tokens = self._watched_tokens.get(key, {})
+                expired_at = time.time() - self.watch_seconds
+                for token_address in [i for i, queried_time in watched_tokens.items() if queried_time < expired_at]:
+                    watched_tokens.pop(token_address)
+
+                token_addresses = sorted(watched_tokens)
+                balances = {
+                    k: v for k, v in self._balances.get(key, {}).items() if k is None or k in watched_tokens
+                }
+
+            pairs = [(address, None), *((address, i) for i in token_addresses)]
+            try:
+                results = provider_manager.batch_get_balance(chain_code, pairs)
+            except Exception:
+                _logger.exception("Failed to get balances of chain %s address %s", chain_code, address)
+                results = [None] * len(pairs)
+
+            for (_, token_address), balance in zip(pairs, results):
+                if balance is None:
+                    _logger.error(
+                        "Failed to get balance for %s of chain %s address %s",
+                        token_address or "main coin",
+                        chain_code,
+                        address,
+                    )
+                    balance = balances.get(token_address, 0)  # keep the last known balance
+
+                balances[token_address] = balance
+
+            with self._lock:
+                self._balances[key] = balances
+                self._updated_times[key] = time.time()
+        finally:
+            with self._lock:
+                refreshing = self._refreshing.pop(key, None)
+            if refreshing is not None:
+                refreshing.set()
+
+
+_balance_cache = _SharedBalanceCache()
+
+
 class InternalAddressCorruption(Exception):
     def __str__(self):
         return i18n._(
@@ -116,7 +215,6 @@ class Abstract_Eth_Wallet(abc.ABC):
         self.receive_requests = db.get_dict('payment_requests')  # type: Dict[str, invoices.Invoice]
         self.invoices = db.get_dict('invoices')  # type: Dict[str, invoices.Invoice]
         self._reserved_addresses = set(db.get('reserved_addresses', []))
-        self._total_balance = {}  # Cache total balance for a short period of time
         self.calc_unused_change_addresses()
         # save wallet type the first time
         if self.db.get('address_index') is None:
@@ -248,50 +346,13 @@ class Abstract_Eth_Wallet(abc.ABC):
         return eth_keys.keys.PublicKey(bytes.fromhex(public_key)).to_checksum_address()
 
     def get_all_balance(self) -> Tuple[decimal.Decimal, Dict]:
-        if (
-            self._total_balance.get("time")
-            and time.time() - self._total_balance["time"] <= 10  # Only cache for 10s
-        ):
-            return (
-                self._total_balance["balance_info"][0],
-                self._total_balance["balance_info"][1].copy()
-            )
-
-        chain_code = self.coin
         checksum_address = eth_utils.to_checksum_address(self.get_addresses()[0])
-        try:
-            raw_main_balance = provider_manager.get_balance(chain_code, checksum_address)
-        except Exception:
-            _logger.error(
-                "Failed to get balance for main coin of chain %s address %s",
-                chain_code,
-                checksum_address
-            )
-            raw_main_balance = 0
-        main_balance = decimal.Decimal(eth_utils.from_wei(raw_main_balance, "ether"))
+        token_addresses = [i.lower() for i in self.contracts.keys()]
+        balances = _balance_cache.get_balances(self.coin, checksum_address, token_addresses)
 
-        tokens_balance_info = {}
-        for token_address in self.contracts.keys():
-            try:
-                erc_balance = provider_manager.get_balance(
-                    chain_code,
-                    checksum_address,
-                    token_address=token_address
-                )
-            except Exception:
-                _logger.error(
-                    "Failed to get balance for token %s of chain %s address %s",
-                    token_address,
-                    chain_code,
-                    checksum_address
-                )
-                erc_balance = 0
-
-            tokens_balance_info[token_address.lower()] = erc_balance
-
-        self._total_balance['balance_info'] = main_balance, tokens_balance_info
-        self._total_balance['time'] = time.time()
-        return main_balance, tokens_balance_info.copy()
+        main_balance = decimal.Decimal(eth_utils.from_wei(balances[None], "ether"))
+        tokens_balance_info = {i: balances[i] for i in token_addresses}
+        return main_balance, tokens_balance_info
 
     def get_all_token_address(self):
         return list(self.contracts.keys())
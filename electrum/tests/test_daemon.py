@@ -0,0 +1,142 @@
+import asyncio
+import os
+import threading
+from unittest import mock
+
+from electrum.daemon import Daemon
+from electrum.simple_config import SimpleConfig
+
+from . import ElectrumTestCase
+
+
+class TestDaemonLazyWallets(ElectrumTestCase):
+
+    def setUp(self):
+        super().setUp()
+        asyncio.set_event_loop(asyncio.new_event_loop())
+        config = SimpleConfig({'offline': True, 'electrum_path': self.electrum_path})
+        self.daemon = Daemon(config, listen_jsonrpc=False)
+
+    def tearDown(self):
+        asyncio.get_event_loop().close()
+        super().tearDown()
+
+    def _new_wallet(self, name):
+        wallet = mock.Mock()
+        wallet.storage.path = os.path.join(self.electrum_path, name)
+        return wallet
+
+    def test_add_lazy_wallet(self):
+        wallet_a, wallet_b = self._new_wallet("wallet_a"), self._new_wallet("wallet_b")
+        loader = mock.Mock(return_value=wallet_b)
+        on_loaded = mock.Mock()
+        self.daemon.add_wallet(wallet_a)
+        self.daemon.add_lazy_wallet(wallet_b.storage.path, loader, on_loaded=on_loaded)
+
+        with self.subTest("Register without loading"):
+            self.assertEqual([wallet_a.storage.path, wallet_b.storage.path], self.daemon.get_wallet_paths())
+            self.assertEqual({wallet_a.storage.path: wallet_a}, self.daemon.get_loaded_wallets())
+            loader.assert_not_called()
+
+        with self.subTest("Load on first use only"):
+            self.assertIs(wallet_b, self.daemon.get_wallet(wallet_b.storage.path))
+            self.assertIs(wallet_b, self.daemon.get_wallet(wallet_b.storage.path))
+            loader.assert_called_once_with()
+            on_loaded.assert_called_once_with(wallet_b.storage.path, wallet_b)
+            self.assertEqual(
+                {wallet_a.storage.path: wallet_a, wallet_b.storage.path: wallet_b}, self.daemon.get_loaded_wallets()
+            )
+
+        with self.subTest("Not registered again once loaded"):
+            self.daemon.add_lazy_wallet(wallet_b.storage.path, loader)
+            self.assertEqual([wallet_a.storage.path, wallet_b.storage.path], self.daemon.get_wallet_paths())
+
+    def test_get_wallets__load_all(self):
+        wallets = [self._new_wallet("wallet_a"), self._new_wallet("wallet_b")]
+        for wallet in wallets:
+            self.daemon.add_lazy_wallet(wallet.storage.path, mock.Mock(return_value=wallet))
+
+        self.assertEqual({}, self.daemon.get_loaded_wallets())
+        self.assertEqual({i.storage.path: i for i in wallets}, self.daemon.get_wallets())
+        self.assertEqual({i.storage.path: i for i in wallets}, self.daemon.get_loaded_wallets())
+
+    def test_stop_wallet__not_loaded(self):
+        wallet = self._new_wallet("wallet_a")
+        loader = mock.Mock(return_value=wallet)
+        self.daemon.add_lazy_wallet(wallet.storage.path, loader)
+
+        self.assertTrue(self.daemon.stop_wallet(wallet.storage.path))
+        self.assertEqual([], self.daemon.get_wallet_paths())
+        self.assertIsNone(self.daemon.get_wallet(wallet.storage.path))
+        loader.assert_not_called()
+
+    def test_delete_wallet__while_loading(self):
+        wallet = self._new_wallet("wallet_a")
+        loading, deleted = threading.Event(), threading.Event()
+        on_loaded = mock.Mock()
+
+        def _loader():
+            loading.set()
+            deleted.wait(5)
+            self.daemon.add_wallet(wallet)  # the loader adds the wallet by itself, likes the console
+            return wallet
+
+        self.daemon.add_lazy_wallet(wallet.storage.path, _loader, on_loaded=on_loaded)
+        thread = threading.Thread(target=self.daemon.get_wallet, args=(wallet.storage.path,))
+        thread.start()
+        loading.wait(5)
+
+        self.assertFalse(self.daemon.delete_wallet(wallet.storage.path))  # no such file
+        self.assertEqual([wallet.storage.path], self.daemon.get_wallet_paths())  # until loaded
+        deleted.set()
+        thread.join(5)
+
+        self.assertEqual([], self.daemon.get_wallet_paths())
+        self.assertEqual({}, self.daemon.get_loaded_wallets())
+        self.assertIsNone(self.daemon.get_wallet(wallet.storage.path))
+        wallet.stop.assert_called_once_with()
+        on_loaded.assert_not_called()
+
+        with self.subTest("Load again once registered again"):
+            self.daemon.add_lazy_wallet(wallet.storage.path, mock.Mock(return_value=wallet))
+            self.assertIs(wallet, self.daemon.get_wallet(wallet.storage.path))
+
+    def test_get_wallet__failed(self):
+        wallet = self._new_wallet("wallet_a")
+        loader = mock.Mock(side_effect=[IOError("Boom"), wallet])
+        self.daemon.add_lazy_wallet(wallet.storage.path, loader)
+
+        self.assertIsNone(self.daemon.get_wallet(wallet.storage.path))
+        self.assertEqual([wallet.storage.path], self.daemon.get_wallet_paths())  # still registered
+
+        self.assertIs(wallet, self.daemon.get_wallet(wallet.storage.path))
+        self.assertEqual(2, loader.call_count)
+
+    @mock.patch("electrum.daemon.remove_lockfile")
+    @mock.patch("electrum.daemon.asyncio.run_coroutine_threadsafe")
+    def test_on_stop__while_loading(self, fake_run_coroutine_threadsafe, fake_remove_lockfile):
+        fake_run_coroutine_threadsafe.side_effect = lambda coro, loop: coro.close() or mock.Mock()
+        wallet_a, wallet_b, wallet_c = (self._new_wallet(i) for i in ("wallet_a", "wallet_b", "wallet_c"))
+        loading, stopped = threading.Event(), threading.Event()
+
+        def _loader():
+            loading.set()
+            stopped.wait(5)
+            return wallet_b
+
+        self.daemon.add_wallet(wallet_a)
+        self.daemon.add_lazy_wallet(wallet_b.storage.path, _loader)
+        self.daemon.add_lazy_wallet(wallet_c.storage.path, mock.Mock(return_value=wallet_c))
+        thread = threading.Thread(target=self.daemon.get_wallet, args=(wallet_b.storage.path,))
+        thread.start()
+        loading.wait(5)
+
+        self.daemon.on_stop()
+        wallet_a.stop.assert_called_once_with()
+        stopped.set()
+        thread.join(5)
+
+        wallet_b.stop.assert_called_once_with()  # stopped once loaded
+        self.assertEqual({wallet_a.storage.path: wallet_a}, self.daemon.get_loaded_wallets())
+        self.assertIsNone(self.daemon.get_wallet(wallet_c.storage.path))  # never loaded since then
+        wallet_c.stop.assert_not_called()
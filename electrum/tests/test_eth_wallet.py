@@ -0,0 +1,104 @@
+import threading
+from unittest import mock
+
+from electrum.eth_wallet import _SharedBalanceCache
+
+from . import ElectrumTestCase
+
+
+class TestSharedBalanceCache(ElectrumTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = _SharedBalanceCache(fresh_seconds=10, watch_seconds=60)
+        self.balances = {None: 1, "token_a": 2, "token_b": 3}
+
+    def _batch_get_balance(self, chain_code, pairs):
+        return [self.balances.get(token_address) for _, token_address in pairs]
+
+    @mock.patch("electrum.eth_wallet.time.time")
+    @mock.patch("electrum.eth_wallet.threading.Thread")
+    @mock.patch("electrum.eth_wallet.provider_manager")
+    def test_get_balances(self, fake_provider_manager, fake_thread_class, fake_time):
+        fake_provider_manager.batch_get_balance.side_effect = self._batch_get_balance
+        fake_time.return_value = 1000
+
+        with self.subTest("Wait for the missing balances"):
+            self.assertEqual({None: 1, "token_a": 2}, self.cache.get_balances("eth", "Address_A", ["Token_A"]))
+            fake_provider_manager.batch_get_balance.assert_called_once_with(
+                "eth", [("Address_A", None), ("Address_A", "token_a")]
+            )
+            fake_thread_class.assert_not_called()
+
+        with self.subTest("Return the fresh balances"):
+            fake_provider_manager.batch_get_balance.reset_mock()
+            self.assertEqual({None: 1, "token_a": 2}, self.cache.get_balances("eth", "address_a", ["token_a"]))
+            fake_provider_manager.batch_get_balance.assert_not_called()
+
+        with self.subTest("Return the stale balances at once, and refresh in background"):
+            self.balances[None] = 10
+            fake_time.return_value = 1000 + 11
+            self.assertEqual({None: 1, "token_a": 2}, self.cache.get_balances("eth", "address_a", ["token_a"]))
+            fake_thread_class.assert_called_once_with(
+                target=self.cache._refresh, args=("eth", "address_a"), daemon=True
+            )
+            fake_thread_class.return_value.start.assert_called_once_with()
+
+            self.assertEqual({None: 1, "token_a": 2}, self.cache.get_balances("eth", "address_a", ["token_a"]))
+            fake_thread_class.assert_called_once()  # refreshing already
+
+            self.cache._refresh("eth", "address_a")
+            self.assertEqual({None: 10, "token_a": 2}, self.cache.get_balances("eth", "address_a", ["token_a"]))
+
+        with self.subTest("Keep the last balances if failed"):
+            fake_provider_manager.batch_get_balance.side_effect = ValueError("Boom")
+            self.cache._refresh("eth", "address_a")
+            self.assertEqual({None: 10, "token_a": 2}, self.cache.get_balances("eth", "address_a", ["token_a"]))
+
+            fake_provider_manager.batch_get_balance.side_effect = None
+            fake_provider_manager.batch_get_balance.return_value = [11, None]
+            self.cache._refresh("eth", "address_a")
+            self.assertEqual({None: 11, "token_a": 2}, self.cache.get_balances("eth", "address_a", ["token_a"]))
+
+    @mock.patch("electrum.eth_wallet.time.time")
+    @mock.patch("electrum.eth_wallet.provider_manager")
+    def test_get_balances__unwatch_tokens(self, fake_provider_manager, fake_time):
+        fake_provider_manager.batch_get_balance.side_effect = self._batch_get_balance
+        fake_time.return_value = 1000
+        self.cache.get_balances("eth", "address_a", ["token_a"])
+        fake_time.return_value = 1000 + 30
+        self.cache.get_balances("eth", "address_a", ["token_b"])
+
+        fake_provider_manager.batch_get_balance.reset_mock()
+        fake_time.return_value = 1000 + 61
+        self.cache._refresh("eth", "address_a")
+        fake_provider_manager.batch_get_balance.assert_called_once_with(
+            "eth", [("address_a", None), ("address_a", "token_b")]
+        )
+        self.assertEqual({None: 1, "token_b": 3}, self.cache.get_balances("eth", "address_a", []))
+
+    @mock.patch("electrum.eth_wallet.provider_manager")
+    def test_get_balances__wait_for_refreshing(self, fake_provider_manager):
+        requested, released = threading.Event(), threading.Event()
+
+        def _batch_get_balance(chain_code, pairs):
+            requested.set()
+            released.wait(5)
+            return self._batch_get_balance(chain_code, pairs)
+
+        fake_provider_manager.batch_get_balance.side_effect = _batch_get_balance
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.get_balances("eth", "address_a", ["token_a"])))
+            for _ in range(3)
+        ]
+        threads[0].start()
+        requested.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        released.set()
+        for thread in threads:
+            thread.join(5)
+
+        fake_provider_manager.batch_get_balance.assert_called_once()
+        self.assertEqual([{None: 1, "token_a": 2}] * 3, results)
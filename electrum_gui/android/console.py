@@ -1,7 +1,10 @@
 from __future__ import absolute_import, division, print_function
 
 import asyncio
+import collections
 import copy
+import functools
+import heapq
 import itertools
 import json
 import logging
@@ -10,6 +13,7 @@ import os
 import random
 import string
 import threading
+import time
 import urllib.parse
 from code import InteractiveConsole
 from contextlib import contextmanager
@@ -29,7 +33,7 @@ from mnemonic import Mnemonic
 from electrum import MutiBase, bitcoin, commands, constants, daemon, ecc, keystore
 from electrum import mnemonic as electrum_mnemonic
 from electrum import paymentrequest, simple_config, util
-from electrum.address_synchronizer import TX_HEIGHT_FUTURE, TX_HEIGHT_LOCAL
+from electrum.address_synchronizer import TX_HEIGHT_FUTURE, TX_HEIGHT_LOCAL, HistoryItem
 from electrum.bip32 import BIP32Node, get_uncompressed_key
 from electrum.bitcoin import COIN
 from electrum.constants import read_json
@@ -82,6 +86,7 @@ from electrum_gui.common.conf import chains as chains_config
 from electrum_gui.common.conf import settings
 from electrum_gui.common.hardware import manager as hardware_manager
 from electrum_gui.common.price import manager as price_manager
+from electrum_gui.common.price import signals as price_signals
 from electrum_gui.common.provider import data as provider_data
 from electrum_gui.common.provider import exceptions as provider_exceptions
 from electrum_gui.common.provider import provider_manager
@@ -90,12 +95,14 @@ from electrum_gui.common.secret import manager as secret_manager
 from electrum_gui.common.transaction import data as transaction_data
 from electrum_gui.common.transaction import manager as transaction_manager
 from electrum_gui.common.wallet import manager as wallet_manager
+from electrum_gui.common.wallet import signals as wallet_signals
 
 from ..common.basic.functional.require import require
 from ..common.secret.data import CurveEnum
 from .create_wallet_info import CreateWalletInfo
 from .derived_info import DerivedInfo
 from .migrating import GeneralWallet, is_coin_migrated
+from .portfolio import PortfolioAggregator
 from .tx_db import TxDb
 
 log_info = logging.getLogger(__name__)
@@ -110,6 +117,7 @@ PURPOSE_POS = 1
 ACCOUNT_POS = 3
 INDEX_POS = 5
 BTC_BLOCK_INTERVAL_TIME = 10
+BTC_HISTORY_ROW_CACHE_SIZE = 2000
 DEFAULT_ADDR_TYPE = 49
 ticker = None
 
@@ -248,12 +256,19 @@ class AndroidCommands(commands.Commands):
         for k, v in util.base_units_inverse.items():
             if k == self.decimal_point:
                 self.base_unit = v
-        self.old_history_len = 0
-        self.old_history_info = []
+        self.btc_history_rows = collections.OrderedDict()  # formatted rows by (wallet, txid, height, ccy, unit)
         self.num_zeros = int(self.config.get("num_zeros", 0))
         self.config.set_key("log_to_file", True, save=True)
         self.rbf = self.config.get("use_rbf", True)
         self.ccy = self.daemon.fx.get_currency()
+        self.portfolio = PortfolioAggregator(self._get_wallet_balance_info, self._build_wallet_balance_summary)
+        price_signals.prices_changed_signal.connect(self.portfolio.mark_dirty)
+        wallet_signals.assets_changed_signal.connect(self._on_assets_changed)
+        # the password changes to apply once the lazy wallets are loaded, with the number of changes by path
+        # the wallet is already at, see update_wallet_password
+        self._password_lock = threading.Lock()
+        self._password_changes = []
+        self._password_versions = {}
         self.pre_balance_info = ""
         self.addr_index = 0
         self.rbf_tx = ""
@@ -298,6 +313,14 @@ class AndroidCommands(commands.Commands):
         set_language(language)
         self.config.set_key("language", language)
 
+    @api.api_entry()
+    def set_foreground(self, is_foreground):
+        """
+        Notify the app goes to foreground or background, the background jobs run less often in background
+        :param is_foreground: True if the app is in foreground
+        """
+        the_begging.set_foreground(bool(is_foreground))
+
     # BEGIN commands from the argparse interface.
     def stop_loop(self):
         self.asyncio_loop.call_soon_threadsafe(self._stop_loop.set_result, 1)
@@ -428,6 +451,8 @@ class AndroidCommands(commands.Commands):
             "new_transaction",
             "verified",
         ):
+            if event in ("wallet_updated", "new_transaction", "verified") and args and hasattr(args[0], "identity"):
+                self.portfolio.mark_dirty([args[0].identity])
             self._update_status()
 
     def _daemon_action(self):
@@ -1293,6 +1318,7 @@ class AndroidCommands(commands.Commands):
         if ccy != self.ccy:
             self.daemon.fx.set_currency(ccy)
             self.ccy = ccy
+            self.portfolio.mark_dirty()
         self._update_status()
 
     @api.api_entry()
@@ -1332,6 +1358,7 @@ class AndroidCommands(commands.Commands):
         self.base_unit = base_unit
         self.decimal_point = util.base_unit_name_to_decimal_point(self.base_unit)
         self.config.set_key("decimal_point", self.decimal_point, True)
+        self.portfolio.mark_dirty()
         self._update_status()
 
     def format_amount_and_units(self, amount):
@@ -1561,12 +1588,6 @@ class AndroidCommands(commands.Commands):
             )
         self.wallet.save_db()
 
-    def _get_history_tx(self):
-        self._assert_wallet_isvalid()
-        history = reversed(self.wallet.get_history())
-        all_data = [self._get_card(*item) for item in history]
-        return all_data
-
     async def _gettransaction(self, txid, n):
         """Retrieve a transaction. get input address for receive tx"""
         tx = None
@@ -1579,78 +1600,120 @@ class AndroidCommands(commands.Commands):
             raise Exception("Mismatching txid")
         return tx._outputs[n].address, tx._outputs[n].value
 
-    def _get_btc_tx_list(self, start=None, end=None, search_type=None):  # noqa
-        history_data = []
-        try:
-            history_info = self._get_history_tx()
-            local_tx = self.txdb.get_tx_info(self.wallet.get_addresses()[0])
-        except BaseException as e:
-            raise e
-
-        if search_type is None:
-            history_data = history_info
-        elif search_type == "send":
-            for info in history_info:
-                if info["is_mine"]:
-                    history_data.append(info)
-        elif search_type == "receive":
-            for info in history_info:
-                if not info["is_mine"]:
-                    history_data.append(info)
-
-        history_len = len(history_data)
-        local_len = len(local_tx)
-        all_tx_len = history_len + local_len
-        if start is None or end is None:
-            start = 0
-            if "receive" == search_type:
-                end = history_len
-            else:
-                end = all_tx_len
-        if (search_type is None or "send" in search_type) and all_tx_len == self.old_history_len:
-            return self.old_history_info[start:end]
+    def _iter_btc_history(self, search_type=None):
+        """
+        Yield (timestamp, tx_hash, item) of the history and the local txs lazily, newest first.
+        The history of wallet is sorted already, and so are the local txs, so they are merged without sorting all
+        """
+        now = time.time()
+        history_items = (
+            (item.tx_mined_status.timestamp or now, item.txid, item)
+            for item in reversed(self.wallet.get_history())
+            if search_type is None or (search_type == "send") == (item.delta is not None and item.delta < 0)
+        )
 
-        all_data = []
         if search_type == "receive":
-            for pos, info in enumerate(history_data):
-                if pos >= start and pos <= end:
-                    self._get_history_show_info(info, all_data)
-            return all_data
+            local_items = ()
         else:
-            self.old_history_len = all_tx_len
-            for info in history_data:
-                self._get_history_show_info(info, all_data)
-
-            # local_tx = self.txdb.get_tx_info(self.wallet.get_addresses()[0])
-            for info in local_tx:
-                i = {}
-                i["type"] = "history"
-                data = self._get_tx_info_from_raw(info[3], tx_list=True)
-                i["tx_status"] = {"status": provider_data.TransactionStatus.CONFIRM_REVERTED, "other_info": ""}
-                i["date"] = util.format_time(int(info[4]))
-                i["tx_hash"] = info[0]
-                i["is_mine"] = True
-                i["confirmations"] = 0
-                data = json.loads(data)
-                i["address"] = helpers.get_show_addr(data["output_addr"][0]["addr"])
-                amount = data["amount"].split(" ")[0]
-                if amount[0] == "-":
-                    amount = amount[1:]
-                fee = data["fee"].split(" ")[0]
-                fiat = (
-                    (Decimal(amount) + Decimal(fee)) / COIN * price_manager.get_last_price(self.wallet.coin, self.ccy)
-                )
-                fiat_str = f"{self.daemon.fx.ccy_amount_str(fiat, True)} {self.ccy}"
-                show_amount = "%.8f" % (float(amount) + float(fee))
-                show_amount = str(show_amount).rstrip("0")
-                if show_amount[-1] == ".":
-                    show_amount = show_amount[0:-1]
-                i["amount"] = "%s %s (%s)" % (show_amount, self.base_unit, fiat_str)
-                all_data.append(i)
-
-            all_data.sort(reverse=True, key=lambda info: info["date"])
-            self.old_history_info = all_data
-            return all_data[start:end]
+            local_txs = self.txdb.get_tx_info(self.wallet.get_addresses()[0])
+            local_items = ((float(info[4]), info[0], info) for info in reversed(local_txs))
+
+        yield from heapq.merge(history_items, local_items, key=lambda i: -i[0])
+
+    def _get_btc_tx_list(self, start=None, end=None, search_type=None, cursor=None):
+        self._assert_wallet_isvalid()
+        start = int(start) if start is not None else 0
+        end = int(end) if end is not None else None
+
+        entries = self._iter_btc_history(search_type=search_type)
+        if cursor:
+            entries = itertools.dropwhile(lambda i: i[1] != cursor, entries)
+            next(entries, None)  # skip the cursor itself
+
+        page = [item for _, _, item in itertools.islice(entries, start, end)]
+        return self._format_btc_history(page)
+
+    def _format_btc_history(self, items: list) -> List[dict]:
+        """
+        The rows of the confirmed txs are cached without the fiat value,
+        which is re-computed each time as the price history may be backfilled since then
+        """
+        wallet_identity = self.wallet.identity
+        rows = [None] * len(items)
+        history_items = [(index, item) for index, item in enumerate(items) if isinstance(item, HistoryItem)]
+        timestamps = [item.tx_mined_status.timestamp or int(time.time()) for _, item in history_items]
+        prices = price_manager.get_prices_at(self.wallet.coin, self.ccy, timestamps) if history_items else []
+        uncached_items = []
+
+        for index, item in enumerate(items):
+            if not isinstance(item, HistoryItem):
+                rows[index] = self._get_local_btc_tx_row(item)
+
+        for (index, item), price in zip(history_items, prices):
+            cache_key = (wallet_identity, item.txid, item.tx_mined_status.height, self.ccy, self.base_unit)
+            cached_row = self.btc_history_rows.get(cache_key)
+            if cached_row is None:
+                uncached_items.append((index, item, price))
+                continue
+
+            self.btc_history_rows.move_to_end(cache_key)
+            row = {**cached_row, "tx_status": dict(cached_row["tx_status"])}
+            row["message"] = self.wallet.get_label(item.txid)
+            row["confirmations"] = item.tx_mined_status.conf
+            if row["tx_status"]["other_info"]:
+                row["tx_status"]["other_info"] = str(item.tx_mined_status.conf)
+            if item.delta is not None and self.fiat_unit:
+                row["quote_text"] = self._get_quote_text(item.txid, item.delta, price=price)
+            rows[index] = row
+
+        uncached_txids = [item.txid for _, item, _ in uncached_items]
+        tx_time_infos = self.txdb.get_tx_time_infos(uncached_txids) if uncached_txids else {}
+        for index, item, price in uncached_items:
+            row = self._get_history_show_info(self._get_card(*item, price=price), tx_time_infos=tx_time_infos)
+            rows[index] = row
+
+            if item.tx_mined_status.height > 0:  # the rows of unconfirmed txs are subject to change
+                cache_key = (wallet_identity, item.txid, item.tx_mined_status.height, self.ccy, self.base_unit)
+                cached_row = {k: v for k, v in row.items() if k != "quote_text"}
+                self.btc_history_rows[cache_key] = {**cached_row, "tx_status": dict(row["tx_status"])}
+                if len(self.btc_history_rows) > BTC_HISTORY_ROW_CACHE_SIZE:
+                    self.btc_history_rows.popitem(last=False)
+
+        return rows
+
+    def _get_local_btc_tx_row(self, info) -> dict:
+        cache_key = (self.wallet.identity, info[0], TX_HEIGHT_LOCAL, None, self.base_unit)
+        parsed = self.btc_history_rows.get(cache_key)
+        if parsed is None:
+            data = json.loads(self._get_tx_info_from_raw(info[3], tx_list=True))
+            amount = data["amount"].split(" ")[0]
+            parsed = {
+                "address": helpers.get_show_addr(data["output_addr"][0]["addr"]),
+                "amount": amount[1:] if amount[0] == "-" else amount,
+                "fee": data["fee"].split(" ")[0],
+            }
+            self.btc_history_rows[cache_key] = parsed
+            if len(self.btc_history_rows) > BTC_HISTORY_ROW_CACHE_SIZE:
+                self.btc_history_rows.popitem(last=False)
+
+        amount, fee = parsed["amount"], parsed["fee"]
+        fiat = (Decimal(amount) + Decimal(fee)) / COIN * price_manager.get_last_price(self.wallet.coin, self.ccy)
+        fiat_str = f"{self.daemon.fx.ccy_amount_str(fiat, True)} {self.ccy}"
+        show_amount = "%.8f" % (float(amount) + float(fee))
+        show_amount = str(show_amount).rstrip("0")
+        if show_amount[-1] == ".":
+            show_amount = show_amount[0:-1]
+
+        return {
+            "type": "history",
+            "tx_status": {"status": provider_data.TransactionStatus.CONFIRM_REVERTED, "other_info": ""},
+            "date": util.format_time(int(info[4])),
+            "tx_hash": info[0],
+            "is_mine": True,
+            "confirmations": 0,
+            "address": parsed["address"],
+            "amount": "%s %s (%s)" % (show_amount, self.base_unit, fiat_str),
+        }
 
     def _get_general_coin_tx_list(
         self,
@@ -1697,11 +1760,12 @@ class AndroidCommands(commands.Commands):
             best_block_number = 0
 
         address = provider_manager.verify_address(chain_code, address).normalized_address
-        transfer_coin_price = price_manager.get_last_price(transfer_coin.code, self.ccy)
-        fee_coin_price = (
-            transfer_coin_price
+        timestamps = [i.block_time if i.block_time is not None else int(i.created_time.timestamp()) for i in actions]
+        transfer_coin_prices = price_manager.get_prices_at(transfer_coin.code, self.ccy, timestamps)
+        fee_coin_prices = (
+            transfer_coin_prices
             if fee_coin.code == transfer_coin.code
-            else price_manager.get_last_price(fee_coin.code, self.ccy)
+            else price_manager.get_prices_at(fee_coin.code, self.ccy, timestamps)
         )
         transfer_coin_decimal_divisor = pow(10, transfer_coin.decimals)
         fee_coin_decimal_divisor = pow(10, fee_coin.decimals)
@@ -1713,7 +1777,7 @@ class AndroidCommands(commands.Commands):
             transaction_data.TxActionStatus.PENDING,
         }
 
-        for action in actions:
+        for action, transfer_coin_price, fee_coin_price in zip(actions, transfer_coin_prices, fee_coin_prices):
             if action.status not in processing_statuses:
                 continue
 
@@ -1792,7 +1856,9 @@ class AndroidCommands(commands.Commands):
             yield
 
     @api.api_entry()
-    def get_all_tx_list(self, search_type=None, coin="btc", contract_address=None, start=None, end=None, id=None):
+    def get_all_tx_list(
+        self, search_type=None, coin="btc", contract_address=None, start=None, end=None, id=None, cursor=None
+    ):
         """
         Get the histroy list with the wallet that you select
         :param search_type: None/send/receive as str
@@ -1800,6 +1866,8 @@ class AndroidCommands(commands.Commands):
         :param contract_address: contract address on eth base chains
         :param start: start position as int
         :param end: end position as int
+        :param cursor: tx_hash of the last item of the previous page, for btc only,
+        start and end are counted from the item after it, return empty list if it is not found any more
         :return:
             exp:
                 [{"type":"",
@@ -1814,7 +1882,7 @@ class AndroidCommands(commands.Commands):
         with self.override_wallet(id):
             chain_affinity = _get_chain_affinity(coin)
             if chain_affinity == "btc":
-                ret = self._get_btc_tx_list(start=start, end=end, search_type=search_type)
+                ret = self._get_btc_tx_list(start=start, end=end, search_type=search_type, cursor=cursor)
             elif chain_affinity == "eth" or is_coin_migrated(coin):
                 ret = self._get_general_coin_tx_list(
                     coin=self.wallet.coin,
@@ -1829,7 +1897,11 @@ class AndroidCommands(commands.Commands):
 
             return json.dumps(ret, cls=json_encoders.DecimalEncoder)
 
-    def _get_history_show_info(self, info, list_info):
+    def _get_history_show_info(self, info, tx_time_infos=None):
+        """
+        :param tx_time_infos: time infos by tx_hash fetched in batch, the tx without row is missing from it,
+        query the time info of the tx alone if None
+        """
         info["type"] = "history"
         data = self._get_tx_info(info["tx_hash"], coin=self.wallet.coin, tx_list=True)
         info["tx_status"] = json.loads(data)["tx_status"]
@@ -1838,10 +1910,13 @@ class AndroidCommands(commands.Commands):
             if info["is_mine"]
             else helpers.get_show_addr(json.loads(data)["input_addr"][0]["address"])
         )
-        time = self.txdb.get_tx_time_info(info["tx_hash"])
+        if tx_time_infos is None:
+            time = self.txdb.get_tx_time_info(info["tx_hash"])
+        else:
+            time = [tx_time_infos[info["tx_hash"]]] if info["tx_hash"] in tx_time_infos else []
         if len(time) != 0:
             info["date"] = util.format_time(int(time[0][1]))
-        list_info.append(info)
+        return info
 
     def _get_btc_raw_tx(self, tx_hash):
         self._assert_wallet_isvalid()
@@ -2021,7 +2096,7 @@ class AndroidCommands(commands.Commands):
         }
         return json.dumps(ret, cls=json_encoders.DecimalEncoder)
 
-    def _get_card(self, tx_hash, tx_mined_status, delta, fee, balance):
+    def _get_card(self, tx_hash, tx_mined_status, delta, fee, balance, price=None):
         self._assert_wallet_isvalid()
         self._assert_daemon_running()
         status, status_str = self.wallet.get_tx_status(tx_hash, tx_mined_status)
@@ -2037,12 +2112,17 @@ class AndroidCommands(commands.Commands):
                 delta = -delta
             ri["amount"] = self.format_amount_and_units(delta)
             if self.fiat_unit:
-                fx = self.daemon.fx
-                fiat_value = delta / Decimal(bitcoin.COIN) * self.wallet.price_at_timestamp(tx_hash, fx.timestamp_rate)
-                fiat_value = Fiat(fiat_value, fx.ccy)
-                ri["quote_text"] = fiat_value.to_ui_string()
+                ri["quote_text"] = self._get_quote_text(tx_hash, delta, price=price)
         return ri
 
+    def _get_quote_text(self, tx_hash, delta, price=None):
+        fx = self.daemon.fx
+        if not price:  # fall back to the exchange rate of electrum
+            price = self.wallet.price_at_timestamp(tx_hash, fx.timestamp_rate)
+        fiat_value = abs(delta) / Decimal(bitcoin.COIN) * price
+        fiat_value = Fiat(fiat_value, fx.ccy)
+        return fiat_value.to_ui_string()
+
     @api.api_entry()
     def get_wallet_address_show_UI(self, next=None):
         """
@@ -3962,17 +4042,36 @@ class AndroidCommands(commands.Commands):
 
     def _load_all_wallet(self):
         """
-        Load all wallet info
+        Load the hd wallets at once, since the derived wallets and the password checking rely on them,
+        the others are loaded on first use, and prefetched in background
         :return:None
         """
+        start_time = time.time()
         name_wallets = sorted([name for name in os.listdir(self._wallet_path())])
+        hd_wallets = [name for name in name_wallets if self.wallet_context.is_hd(name)]
         for name in name_wallets:
-            try:
-                self.load_wallet(name, password=self.android_id)
-            except InvalidPassword:
-                storage_password = "112233%s" % self.android_id[-8:]
-                wallet = self.load_wallet(name, password=storage_password)
-                wallet.force_change_storage_password(self.android_id)
+            if name in hd_wallets:
+                self._load_wallet_by_android_id(name)
+            else:
+                self.daemon.add_lazy_wallet(
+                    self._wallet_path(name),
+                    functools.partial(self._load_wallet_by_android_id, name),
+                    on_loaded=self._on_lazy_wallet_loaded,
+                )
+        self.daemon.prefetch_lazy_wallets(max_workers=4)
+        log_info.info(
+            f"Loaded {len(hd_wallets)} hd wallets and deferred {len(name_wallets) - len(hd_wallets)} wallets "
+            f"in {time.time() - start_time:.3f}s"
+        )
+
+    def _load_wallet_by_android_id(self, name):
+        try:
+            return self.load_wallet(name, password=self.android_id)
+        except InvalidPassword:
+            storage_password = "112233%s" % self.android_id[-8:]
+            wallet = self.load_wallet(name, password=storage_password)
+            wallet.force_change_storage_password(self.android_id)
+            return wallet
 
     @api.api_entry()
     def update_wallet_password(self, old_password, new_password):
@@ -3983,9 +4082,36 @@ class AndroidCommands(commands.Commands):
         :return:None
         """
         self._assert_daemon_running()
-        for _name, wallet in self.daemon._wallets.items():
-            if not wallet.is_watching_only():
+        with self._password_lock:
+            wallets = self.daemon.get_loaded_wallets()
+            for path, wallet in wallets.items():
+                if path in self._password_versions:
+                    self._apply_password_changes(path, wallet)  # catch up, loaded but not notified yet
+                if not wallet.is_watching_only():
+                    wallet.update_password(old_pw=old_password, new_pw=new_password, str_pw=self.android_id)
+
+            # the wallets not loaded yet apply the change once loaded, instead of loading them on the ui thread
+            lazy_paths = [i for i in self.daemon.get_wallet_paths() if i not in wallets]
+            self._password_versions = {
+                i: self._password_versions.get(i, len(self._password_changes)) for i in lazy_paths
+            }
+            self._password_changes.append((old_password, new_password))
+            if not self._password_versions:
+                self._password_changes.clear()
+
+    def _on_lazy_wallet_loaded(self, path, wallet):
+        with self._password_lock:
+            if path in self._password_versions:
+                self._apply_password_changes(path, wallet)
+
+    def _apply_password_changes(self, path, wallet):
+        # with _password_lock held
+        version = self._password_versions.pop(path)
+        if not wallet.is_watching_only():
+            for old_password, new_password in self._password_changes[version:]:
                 wallet.update_password(old_pw=old_password, new_pw=new_password, str_pw=self.android_id)
+        if not self._password_versions:
+            self._password_changes.clear()
 
     @api.api_entry()
     def check_password(self, password):
@@ -4062,13 +4188,29 @@ class AndroidCommands(commands.Commands):
         self.hd_wallet = None
 
     def _get_check_wallet(self):
-        wallets = self.daemon.get_wallets()
-        for key, wallet in wallets.items():
-            if not isinstance(wallet.keystore, Hardware_KeyStore) and not wallet.is_watching_only():
+        return self._find_wallet(
+            lambda wallet: not isinstance(wallet.keystore, Hardware_KeyStore) and not wallet.is_watching_only(),
+            lambda wallet_id: not self.wallet_context.is_hw(wallet_id)
+            and "watch" not in self.wallet_context.get_wallet_type_by_id(wallet_id),
+        )
+
+    def _find_wallet(self, is_matched, is_candidate):
+        """
+        Find a wallet in the loaded ones first, and then load the lazy candidates one by one only if none matched
+        :param is_matched: check the wallet
+        :param is_candidate: check the wallet id of the lazy wallet before loading it
+        """
+        wallets = self.daemon.get_loaded_wallets()
+        for wallet in wallets.values():
+            if is_matched(wallet):
+                return wallet
+
+        for path in self.daemon.get_wallet_paths():
+            if path in wallets or not is_candidate(os.path.basename(path)):
+                continue
+            wallet = self.daemon.get_wallet(path)
+            if wallet is not None and is_matched(wallet):
                 return wallet
-                # key = sorted(wallets.keys())[0]
-                # # value = wallets.values()[0]
-                # return wallets[key]
 
     def _filter_wallet(self):
         recovery_list = []
@@ -4179,12 +4321,10 @@ class AndroidCommands(commands.Commands):
 
     def _get_hd_wallet(self):
         if self.hd_wallet is None:
-            wallets = self.daemon.get_wallets()
-            for key, wallet in wallets.items():
-                if self.wallet_context.is_hd(wallet.identity):
-                    self.hd_wallet = wallet
-                    break
-            else:
+            self.hd_wallet = self._find_wallet(
+                lambda wallet: self.wallet_context.is_hd(wallet.identity), self.wallet_context.is_hd
+            )
+            if self.hd_wallet is None:
                 raise BaseException(UnavaiableHdWallet())
 
         return self.hd_wallet
@@ -4463,13 +4603,15 @@ class AndroidCommands(commands.Commands):
         return json.dumps(Wordlist.from_file("english.txt"))
 
     @api.api_entry()
-    def get_all_wallet_balance(self):
+    def get_all_wallet_balance(self, since_version=None):
         """
         Get all wallet balances
+        :param since_version: only return the wallets changed since this version if specified, optional
         :return:
         {
           "all_balance": "21,233.46 CNY",
           "btc_asset":"",
+          "version": 12,
           "wallet_info": [
             {
               "name": "",
@@ -4490,71 +4632,76 @@ class AndroidCommands(commands.Commands):
                 { "coin": "usdt", "address":"", "balance": "", "fiat": "", "icon":""}
               ]
             }
-          ]
+          ],
+          "wallet_order": ["name", ...]  # names of all the wallets in order, only if since_version specified
         }
         """
-        out = {}
-        try:
-            all_balance = Decimal("0")
-            all_wallet_info = []
-            for wallet in self.daemon.get_wallets().values():
-                wallet_info = {"name": wallet.identity, "label": wallet.get_name()}
-                coin = wallet.coin
-                wallet_info["coin"] = coin
-                chain_affinity = _get_chain_affinity(coin)
-                if is_coin_migrated(coin):
-                    main_balance_info, contracts_balance_info, sum_fiat = self._get_general_wallet_all_balance(wallet)
-                    wallet_info["wallets"] = [main_balance_info, *contracts_balance_info]
-                    wallet_info["sum_fiat"] = sum_fiat
-                    all_balance += sum_fiat
-                    all_wallet_info.append(wallet_info)
-                elif chain_affinity == "eth":
-                    main_balance_info, contracts_balance_info, sum_fiat = self._get_eth_wallet_all_balance(wallet)
-                    wallet_info["wallets"] = [main_balance_info] + contracts_balance_info
-                    wallet_info["sum_fiat"] = sum_fiat
-                    all_balance += sum_fiat
-                    all_wallet_info.append(wallet_info)
-                elif chain_affinity == "btc":
-                    c, u, x = wallet.get_balance()
-                    balance = c + u
-                    fiat = Decimal(balance) / COIN * price_manager.get_last_price(coin, self.ccy)
-                    fiat_str = f"{self.daemon.fx.ccy_amount_str(fiat, True)} {self.ccy}"
-                    all_balance += fiat
-                    wallet_info["wallets"] = [
-                        {
-                            "coin": wallet.coin,
-                            "address": wallet.get_addresses()[0],
-                            "balance": self.format_amount(balance),
-                            "fiat": fiat_str,
-                            "icon": self._get_icon_by_token(coin),
-                        }
-                    ]
-                    wallet_info["sum_fiat"] = fiat
-                    all_wallet_info.append(wallet_info)
-                else:
-                    raise util.UnsupportedCurrencyCoin()
+        since_version = int(since_version) if since_version is not None else None
+        # the lazy wallets join the summary once loaded in background
+        return self.portfolio.get_serialized_summary(self.daemon.get_loaded_wallets(), since_version=since_version)
 
-            no_zero_balance_wallets = (i for i in all_wallet_info if i["sum_fiat"] > 0)
-            no_zero_balance_wallets = sorted(
-                no_zero_balance_wallets, key=lambda i: i["sum_fiat"], reverse=True
-            )  # sort no-zero balance wallet by fiat currency in reverse order
+    def _get_wallet_balance_info(self, wallet) -> dict:
+        wallet_info = {"name": wallet.identity, "label": wallet.get_name()}
+        coin = wallet.coin
+        wallet_info["coin"] = coin
+        chain_affinity = _get_chain_affinity(coin)
+        if is_coin_migrated(coin):
+            main_balance_info, contracts_balance_info, sum_fiat = self._get_general_wallet_all_balance(wallet)
+            wallet_info["wallets"] = [main_balance_info, *contracts_balance_info]
+            wallet_info["sum_fiat"] = sum_fiat
+        elif chain_affinity == "eth":
+            main_balance_info, contracts_balance_info, sum_fiat = self._get_eth_wallet_all_balance(wallet)
+            wallet_info["wallets"] = [main_balance_info] + contracts_balance_info
+            wallet_info["sum_fiat"] = sum_fiat
+        elif chain_affinity == "btc":
+            c, u, x = wallet.get_balance()
+            balance = c + u
+            fiat = Decimal(balance) / COIN * price_manager.get_last_price(coin, self.ccy)
+            fiat_str = f"{self.daemon.fx.ccy_amount_str(fiat, True)} {self.ccy}"
+            wallet_info["wallets"] = [
+                {
+                    "coin": wallet.coin,
+                    "address": wallet.get_addresses()[0],
+                    "balance": self.format_amount(balance),
+                    "fiat": fiat_str,
+                    "icon": self._get_icon_by_token(coin),
+                }
+            ]
+            wallet_info["sum_fiat"] = fiat
+        else:
+            raise util.UnsupportedCurrencyCoin()
 
-            zero_balance_wallets = (i for i in all_wallet_info if i["sum_fiat"] <= 0)
-            zero_balance_wallets_dict = {i["name"]: i for i in zero_balance_wallets}
-            sorted_wallet_labels = (i[0] for i in self.wallet_context.get_stored_wallets_types())
+        return wallet_info
 
-            zero_balance_wallets = [
-                zero_balance_wallets_dict[i] for i in sorted_wallet_labels if i in zero_balance_wallets_dict
-            ]  # sort zero balance wallet by created time in reverse order
+    def _build_wallet_balance_summary(self, all_wallet_info: List[dict]) -> dict:
+        all_balance = sum((i["sum_fiat"] for i in all_wallet_info), Decimal("0"))
 
-            all_wallet_info = [*no_zero_balance_wallets, *zero_balance_wallets]
+        no_zero_balance_wallets = (i for i in all_wallet_info if i["sum_fiat"] > 0)
+        no_zero_balance_wallets = sorted(
+            no_zero_balance_wallets, key=lambda i: i["sum_fiat"], reverse=True
+        )  # sort no-zero balance wallet by fiat currency in reverse order
 
-            out["all_balance"] = f"{self.daemon.fx.ccy_amount_str(all_balance, True)} {self.ccy}"
-            out["btc_asset"] = self._fill_balance_info_with_coin(all_balance, "btc")
-            out["wallet_info"] = all_wallet_info
-            return json.dumps(out, cls=json_encoders.DecimalEncoder)
-        except BaseException as e:
-            raise e
+        zero_balance_wallets = (i for i in all_wallet_info if i["sum_fiat"] <= 0)
+        zero_balance_wallets_dict = {i["name"]: i for i in zero_balance_wallets}
+        sorted_wallet_labels = (i[0] for i in self.wallet_context.get_stored_wallets_types())
+
+        zero_balance_wallets = [
+            zero_balance_wallets_dict[i] for i in sorted_wallet_labels if i in zero_balance_wallets_dict
+        ]  # sort zero balance wallet by created time in reverse order
+
+        return {
+            "all_balance": f"{self.daemon.fx.ccy_amount_str(all_balance, True)} {self.ccy}",
+            "btc_asset": self._fill_balance_info_with_coin(all_balance, "btc"),
+            "wallet_info": [*no_zero_balance_wallets, *zero_balance_wallets],
+        }
+
+    def _on_assets_changed(self, wallet_ids):
+        wallet_ids = set(wallet_ids)
+        self.portfolio.mark_dirty(
+            wallet.identity
+            for wallet in self.daemon.get_loaded_wallets().values()  # the lazy ones are computed once loaded
+            if isinstance(wallet, GeneralWallet) and wallet.general_wallet_id in wallet_ids
+        )
 
     @api.api_entry()  # TODO: not used, will used for rbf
     def set_rbf(self, status_rbf):
@@ -5000,8 +5147,9 @@ class AndroidCommands(commands.Commands):
 
         balances_info = {}
         _sort_helper_dict = {}
+        prices = price_manager.get_last_prices(list(assets.keys()), self.ccy)
         for coin_code, asset in assets.items():
-            price = price_manager.get_last_price(coin_code, self.ccy)
+            price = prices[coin_code]
             balance_with_decimals = Decimal(asset["balance"]) / pow(10, Decimal(asset["decimals"]))
             fiat = balance_with_decimals * price
             sum_fiat += fiat
@@ -5049,10 +5197,12 @@ class AndroidCommands(commands.Commands):
         _sort_helper_dict = {}
 
         token_addresses = list(tokens_balance_info.keys())
-        for token in coin_manager.query_coins_by_token_addresses(chain_code, token_addresses):
+        tokens = coin_manager.query_coins_by_token_addresses(chain_code, token_addresses)
+        prices = price_manager.get_last_prices([i.code for i in tokens], self.ccy)
+        for token in tokens:
             token_address = token.token_address.lower()
             token_balance = Decimal(tokens_balance_info.get(token_address)) / pow(10, token.decimals)
-            price = price_manager.get_last_price(token.code, self.ccy)
+            price = prices[token.code]
             fiat = token_balance * price
             fiat_str = f"{self.daemon.fx.ccy_amount_str(fiat, True)} {self.ccy}"
             if with_sum_fiat:
@@ -5164,7 +5314,7 @@ class AndroidCommands(commands.Commands):
         self._reset_config_info()
         self.hd_wallet = None
         self.check_pw_wallet = None
-        self.daemon._wallets.clear()
+        self.daemon.clear_wallets()
 
     def _delete_wallet_derived_info(self, wallet_obj, hw=False):
         coin = wallet_obj.coin
@@ -0,0 +1,162 @@
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from electrum_gui.common.basic.functional import json_encoders
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry(object):
+    def __init__(self, info: dict, version: int, computed_time: float):
+        self.info = info
+        self.version = version
+        self.computed_time = computed_time
+
+
+class PortfolioAggregator(object):
+    """
+    Materialized balance info of the wallets for the home screen.
+    A wallet is recomputed only if it is marked dirty by the balance or price events, or expired,
+    and the summary is rebuilt and serialized only if any wallet changed.
+    Every change of a wallet bumps the version, so that the caller can ask for the wallets changed since a version
+    """
+
+    def __init__(
+        self,
+        compute_wallet_info: Callable[[Any], dict],
+        build_summary: Callable[[List[dict]], dict],
+        max_age: float = 30,
+    ):
+        """
+        :param compute_wallet_info: compute the balance info of a wallet, with the key "name" at least
+        :param build_summary: build the summary by the sorted wallet infos, which is put in "wallet_info"
+        :param max_age: seconds, recompute the wallet even if not marked dirty, as not all the changes are notified
+        """
+        self._compute_wallet_info = compute_wallet_info
+        self._build_summary = build_summary
+        self.max_age = max_age
+        self._entries: Dict[str, _Entry] = {}
+        self._dirty_names = set()
+        self._all_dirty = False
+        self._version = 0
+        self._summary: Optional[dict] = None
+        self._serialized_summary: Optional[str] = None
+        self._lock = threading.Lock()  # of the entries and the summary
+        self._dirty_lock = threading.Lock()  # of the dirty marks only, never held while computing
+        self._refresh_lock = threading.Lock()  # one refreshing at a time, so that a stale info never overwrites
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def mark_dirty(self, names: Iterable[str] = None):
+        """
+        Mark wallets dirty
+        :param names: names of wallets, all the wallets if None
+        """
+        with self._dirty_lock:
+            if names is None:
+                self._all_dirty = True
+            else:
+                self._dirty_names.update(names)
+
+    def _pop_dirty_marks(self) -> Tuple[bool, set]:
+        with self._dirty_lock:
+            all_dirty, dirty_names = self._all_dirty, self._dirty_names
+            self._all_dirty, self._dirty_names = False, set()
+
+        return all_dirty, dirty_names
+
+    def _is_stale(self, name: str, now: float, all_dirty: bool, dirty_names: set) -> bool:
+        entry = self._entries.get(name)
+        return entry is None or all_dirty or name in dirty_names or now - entry.computed_time >= self.max_age
+
+    def refresh(self, wallets: Dict[str, Any]) -> bool:
+        """
+        Recompute the stale wallets, the wallet infos are computed without holding the lock of the summary
+        :param wallets: all the wallets by name
+        :return: True if any wallet changed
+        """
+        with self._refresh_lock:
+            all_dirty, dirty_names = self._pop_dirty_marks()
+            now = time.time()
+
+            with self._lock:
+                stale_wallets = {
+                    name: wallet
+                    for name, wallet in wallets.items()
+                    if self._is_stale(name, now, all_dirty, dirty_names)
+                }
+
+            infos = {}
+            for name, wallet in stale_wallets.items():
+                try:
+                    infos[name] = self._compute_wallet_info(wallet)
+                except Exception as e:
+                    logger.exception(f"Error in computing wallet balance. name: {name}, error: {e}")
+
+            with self._lock:
+                is_changed = False
+
+                for name in set(self._entries) - set(wallets):
+                    self._entries.pop(name)
+                    self._version += 1
+                    is_changed = True
+
+                for name, info in infos.items():
+                    entry = self._entries.get(name)
+                    if entry is not None and entry.info == info:
+                        entry.computed_time = now
+                        continue
+
+                    self._version += 1
+                    self._entries[name] = _Entry(info, self._version, now)
+                    is_changed = True
+
+                if is_changed or self._summary is None:
+                    self._summary = self._build_summary([i.info for i in self._entries.values()])
+                    self._summary["version"] = self._version
+                    self._serialized_summary = None
+
+                return is_changed
+
+    def get_summary(self, wallets: Dict[str, Any], since_version: int = None) -> dict:
+        """
+        Get the summary of the wallets
+        :param wallets: all the wallets by name
+        :param since_version: only the wallets changed since this version are put in "wallet_info" if specified,
+        with the sorted names of all the wallets in "wallet_order"
+        """
+        self.refresh(wallets)
+
+        with self._lock:
+            if since_version is None:
+                return self._summary
+
+            wallet_order = [i["name"] for i in self._summary["wallet_info"]]
+            return {
+                **self._summary,
+                "wallet_info": [
+                    i
+                    for i in self._summary["wallet_info"]
+                    if self._entries.get(i["name"]) and self._entries[i["name"]].version > since_version
+                ],
+                "wallet_order": wallet_order,
+            }
+
+    def get_serialized_summary(self, wallets: Dict[str, Any], since_version: int = None) -> str:
+        summary = self.get_summary(wallets, since_version=since_version)
+        if since_version is not None:
+            return json.dumps(summary, cls=json_encoders.DecimalEncoder)
+
+        with self._lock:
+            if summary is not self._summary:  # changed by another refreshing meanwhile
+                return json.dumps(summary, cls=json_encoders.DecimalEncoder)
+
+            if self._serialized_summary is None:
+                self._serialized_summary = json.dumps(summary, cls=json_encoders.DecimalEncoder)
+
+            return self._serialized_summary
@@ -0,0 +1,154 @@
+import collections
+import functools
+import json
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from electrum.address_synchronizer import HistoryItem
+from electrum.util import TxMinedInfo
+from electrum_gui.android.console import AndroidCommands
+
+
+def _history_item(txid, timestamp, delta):
+    return HistoryItem(
+        txid=txid,
+        tx_mined_status=TxMinedInfo(height=1 if timestamp else 0, timestamp=timestamp),
+        delta=delta,
+        fee=None,
+        balance=None,
+    )
+
+
+class TestBtcHistory(TestCase):
+    def setUp(self) -> None:
+        self.commands = Mock()
+        self.commands.wallet.get_history.return_value = [  # the oldest first
+            _history_item("history_a", 100, 5),
+            _history_item("history_b", 300, -3),
+            _history_item("history_c", None, -1),  # unconfirmed
+        ]
+        self.commands.wallet.get_addresses.return_value = ["address_a"]
+        self.commands.txdb.get_tx_info.return_value = [  # (tx_hash, address, psbt_tx, raw_tx, time, failed_info)
+            ("local_a", "address_a", "", "", 200, ""),
+            ("local_b", "address_a", "", "", 400, ""),
+        ]
+        self.commands._iter_btc_history = functools.partial(AndroidCommands._iter_btc_history, self.commands)
+        self.commands._format_btc_history.side_effect = lambda items: [
+            i.txid if isinstance(i, HistoryItem) else i[0] for i in items
+        ]
+
+    @patch("electrum_gui.android.console.time.time", Mock(return_value=1000))
+    def test_iter_btc_history(self):
+        def _iter_tx_hashes(search_type=None):
+            return [tx_hash for _, tx_hash, _ in AndroidCommands._iter_btc_history(self.commands, search_type)]
+
+        with self.subTest("Merge the history and the local txs, newest first"):
+            self.assertEqual(["history_c", "local_b", "history_b", "local_a", "history_a"], _iter_tx_hashes())
+            self.commands.txdb.get_tx_info.assert_called_once_with("address_a")
+
+        with self.subTest("The local txs are sent ones"):
+            self.assertEqual(["history_c", "local_b", "history_b", "local_a"], _iter_tx_hashes("send"))
+
+        with self.subTest("The received ones only"):
+            self.commands.txdb.get_tx_info.reset_mock()
+            self.assertEqual(["history_a"], _iter_tx_hashes("receive"))
+            self.commands.txdb.get_tx_info.assert_not_called()
+
+    @patch("electrum_gui.android.console.time.time", Mock(return_value=1000))
+    def test_get_btc_tx_list(self):
+        def _get_btc_tx_list(**kwargs):
+            return AndroidCommands._get_btc_tx_list(self.commands, **kwargs)
+
+        with self.subTest("Page by start and end"):
+            self.assertEqual(["local_b", "history_b"], _get_btc_tx_list(start=1, end=3))
+            self.assertEqual(["history_a"], _get_btc_tx_list(start="4"))
+
+        with self.subTest("Page after the cursor"):
+            self.assertEqual(["history_b", "local_a"], _get_btc_tx_list(end=2, cursor="local_b"))
+            self.assertEqual(["history_a"], _get_btc_tx_list(start=1, cursor="history_b"))
+            self.assertEqual([], _get_btc_tx_list(cursor="history_a"))
+
+        with self.subTest("Page after the cursor with the filter"):
+            self.assertEqual(["local_a"], _get_btc_tx_list(end=1, cursor="history_b", search_type="send"))
+
+        with self.subTest("Empty if the cursor is not found any more"):
+            self.assertEqual([], _get_btc_tx_list(cursor="history_d"))
+
+    @patch("electrum_gui.android.console.price_manager.get_prices_at")
+    def test_format_btc_history(self, fake_get_prices_at):
+        self.commands.btc_history_rows = collections.OrderedDict()
+        self.commands.txdb.get_tx_time_infos.return_value = {}
+        self.commands._get_card.side_effect = lambda tx_hash, tx_mined_status, delta, fee, balance, price: {
+            "tx_hash": tx_hash,
+            "quote_text": str(price),
+        }
+        self.commands._get_history_show_info.side_effect = lambda info, tx_time_infos: {
+            **info,
+            "tx_status": {"other_info": ""},
+        }
+        self.commands._get_quote_text.side_effect = lambda tx_hash, delta, price: str(price)
+        items = [_history_item("history_a", 100, 5)]
+
+        def _format_btc_history():
+            return AndroidCommands._format_btc_history(self.commands, items)
+
+        fake_get_prices_at.return_value = [1]
+        self.assertEqual("1", _format_btc_history()[0]["quote_text"])
+        self.assertNotIn("quote_text", next(iter(self.commands.btc_history_rows.values())))
+
+        with self.subTest("Re-compute the fiat value of the cached row"):
+            fake_get_prices_at.return_value = [2]  # backfilled since then
+            self.assertEqual("2", _format_btc_history()[0]["quote_text"])
+            self.commands._get_card.assert_called_once()
+
+
+class TestHistoryShowInfo(TestCase):
+    @patch("electrum_gui.android.console.util.format_time", Mock(side_effect=str))
+    def test_get_history_show_info(self):
+        commands = Mock()
+        commands._get_tx_info.return_value = json.dumps(
+            {"tx_status": {}, "output_addr": [{"addr": "address_b"}], "input_addr": [{"address": "address_c"}]}
+        )
+        commands.txdb.get_tx_time_info.return_value = [("txid_a", 100)]
+
+        def _get_date(tx_hash, tx_time_infos=None):
+            info = {"tx_hash": tx_hash, "is_mine": True}
+            return AndroidCommands._get_history_show_info(commands, info, tx_time_infos=tx_time_infos).get("date")
+
+        with self.subTest("Query the time info alone"):
+            self.assertEqual("100", _get_date("txid_a"))
+            commands.txdb.get_tx_time_info.assert_called_once_with("txid_a")
+
+        with self.subTest("Use the time infos fetched in batch"):
+            commands.txdb.get_tx_time_info.reset_mock()
+            self.assertEqual("200", _get_date("txid_b", tx_time_infos={"txid_b": ("txid_b", 200)}))
+            self.assertIsNone(_get_date("txid_a", tx_time_infos={"txid_b": ("txid_b", 200)}))
+            self.assertIsNone(_get_date("txid_a", tx_time_infos={}))
+            commands.txdb.get_tx_time_info.assert_not_called()
+
+
+class TestFindWallet(TestCase):
+    def test_find_wallet(self):
+        wallets = {"/wallets/" + i: Mock(identity=i) for i in ("wallet_a", "wallet_b", "wallet_c", "wallet_d")}
+        commands = Mock()
+        commands.daemon.get_loaded_wallets.return_value = {"/wallets/wallet_a": wallets["/wallets/wallet_a"]}
+        commands.daemon.get_wallet_paths.return_value = list(wallets)
+        commands.daemon.get_wallet.side_effect = wallets.get
+
+        def _find_wallet(*identities):
+            return AndroidCommands._find_wallet(
+                commands, lambda wallet: wallet.identity in identities, lambda wallet_id: wallet_id != "wallet_b"
+            )
+
+        with self.subTest("Find in the loaded wallets without loading any"):
+            self.assertIs(wallets["/wallets/wallet_a"], _find_wallet("wallet_a", "wallet_c"))
+            commands.daemon.get_wallet.assert_not_called()
+
+        with self.subTest("Load the lazy candidates one by one"):
+            self.assertIs(wallets["/wallets/wallet_d"], _find_wallet("wallet_b", "wallet_d"))
+            self.assertEqual(
+                ["/wallets/wallet_c", "/wallets/wallet_d"], [i.args[0] for i in commands.daemon.get_wallet.call_args_list]
+            )
+
+        with self.subTest("Nothing matched"):
+            self.assertIsNone(_find_wallet("wallet_e"))
@@ -0,0 +1,124 @@
+import json
+import threading
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from electrum_gui.android.portfolio import PortfolioAggregator
+
+
+def _build_summary(wallet_infos):
+    return {"wallet_info": sorted(wallet_infos, key=lambda i: i["name"])}
+
+
+class TestPortfolioAggregator(TestCase):
+    def setUp(self) -> None:
+        self.balances = {"wallet_a": 1, "wallet_b": 2}
+        self.compute_wallet_info = Mock(side_effect=lambda name: {"name": name, "balance": self.balances[name]})
+        self.portfolio = PortfolioAggregator(self.compute_wallet_info, _build_summary, max_age=30)
+
+    def _computed_names(self):
+        names = {i[0][0] for i in self.compute_wallet_info.call_args_list}
+        self.compute_wallet_info.reset_mock()
+        return names
+
+    @patch("electrum_gui.android.portfolio.time.time")
+    def test_refresh(self, fake_time):
+        fake_time.return_value = 1000
+        wallets = {"wallet_a": "wallet_a", "wallet_b": "wallet_b"}
+
+        with self.subTest("Compute all the wallets at the first time"):
+            self.assertTrue(self.portfolio.refresh(wallets))
+            self.assertEqual({"wallet_a", "wallet_b"}, self._computed_names())
+            self.assertEqual(2, self.portfolio.version)
+
+        with self.subTest("Skip the wallets not dirty"):
+            self.assertFalse(self.portfolio.refresh(wallets))
+            self.assertEqual(set(), self._computed_names())
+
+        with self.subTest("Recompute the dirty wallets only"):
+            self.balances["wallet_a"] = 10
+            self.portfolio.mark_dirty(["wallet_a"])
+            self.assertTrue(self.portfolio.refresh(wallets))
+            self.assertEqual({"wallet_a"}, self._computed_names())
+            self.assertEqual(3, self.portfolio.version)
+
+        with self.subTest("Keep the version if nothing changed"):
+            self.portfolio.mark_dirty()
+            self.assertFalse(self.portfolio.refresh(wallets))
+            self.assertEqual({"wallet_a", "wallet_b"}, self._computed_names())
+            self.assertEqual(3, self.portfolio.version)
+
+        with self.subTest("Recompute the expired wallets"):
+            fake_time.return_value = 1000 + 30
+            self.assertFalse(self.portfolio.refresh(wallets))
+            self.assertEqual({"wallet_a", "wallet_b"}, self._computed_names())
+
+        with self.subTest("Keep the last info if failed"):
+            self.portfolio.mark_dirty(["wallet_b"])
+            self.compute_wallet_info.side_effect = ValueError("Boom")
+            self.assertFalse(self.portfolio.refresh(wallets))
+            self.assertEqual(
+                [{"name": "wallet_a", "balance": 10}, {"name": "wallet_b", "balance": 2}],
+                self.portfolio.get_summary(wallets)["wallet_info"],
+            )
+
+        with self.subTest("Drop the wallets removed"):
+            wallets = {"wallet_a": "wallet_a"}
+            self.assertTrue(self.portfolio.refresh(wallets))
+            self.assertEqual([{"name": "wallet_a", "balance": 10}], self.portfolio.get_summary(wallets)["wallet_info"])
+            self.assertEqual(4, self.portfolio.version)
+            self.assertEqual(4, self.portfolio.get_summary(wallets)["version"])
+
+    def test_refresh__mark_dirty_while_computing(self):
+        computing, marked, waited = threading.Event(), threading.Event(), []
+
+        def _compute_wallet_info(name):
+            computing.set()
+            waited.append(marked.wait(1))
+            return {"name": name, "balance": self.balances[name]}
+
+        self.compute_wallet_info.side_effect = _compute_wallet_info
+        wallets = {"wallet_a": "wallet_a"}
+        thread = threading.Thread(target=self.portfolio.refresh, args=(wallets,))
+        thread.start()
+        computing.wait(5)
+
+        self.portfolio.mark_dirty(["wallet_a"])  # not blocked by the computing
+        marked.set()
+        thread.join(5)
+        self.assertEqual([True], waited)
+
+        self.portfolio.refresh(wallets)
+        self.assertEqual(2, self.compute_wallet_info.call_count)  # still dirty after the refreshing in flight
+
+    def test_get_summary__since_version(self):
+        wallets = {"wallet_a": "wallet_a", "wallet_b": "wallet_b"}
+        summary = self.portfolio.get_summary(wallets)
+        self.assertEqual(2, summary["version"])
+        self.assertNotIn("wallet_order", summary)
+
+        with self.subTest("Nothing changed since the version"):
+            summary = self.portfolio.get_summary(wallets, since_version=2)
+            self.assertEqual([], summary["wallet_info"])
+            self.assertEqual(["wallet_a", "wallet_b"], summary["wallet_order"])
+
+        with self.subTest("Only the wallets changed since the version"):
+            self.balances["wallet_b"] = 20
+            self.portfolio.mark_dirty(["wallet_b"])
+            summary = self.portfolio.get_summary(wallets, since_version=2)
+            self.assertEqual([{"name": "wallet_b", "balance": 20}], summary["wallet_info"])
+            self.assertEqual(["wallet_a", "wallet_b"], summary["wallet_order"])
+            self.assertEqual(3, summary["version"])
+
+    def test_get_serialized_summary(self):
+        wallets = {"wallet_a": "wallet_a"}
+        serialized_summary = self.portfolio.get_serialized_summary(wallets)
+        self.assertEqual(
+            {"wallet_info": [{"name": "wallet_a", "balance": 1}], "version": 1}, json.loads(serialized_summary)
+        )
+
+        with self.subTest("Serialize once until changed"):
+            self.assertIs(serialized_summary, self.portfolio.get_serialized_summary(wallets))
+            self.balances["wallet_a"] = 2
+            self.portfolio.mark_dirty(["wallet_a"])
+            self.assertEqual(2, json.loads(self.portfolio.get_serialized_summary(wallets))["version"])
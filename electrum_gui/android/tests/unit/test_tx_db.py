@@ -0,0 +1,91 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from electrum_gui.android import tx_db
+from electrum_gui.android.tx_db import TxDb
+
+
+class TestTxDb(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "tx_info.db")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def _user_version(self) -> int:
+        with sqlite3.connect(self.path) as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def test_schema_migrations(self):
+        with sqlite3.connect(self.path) as conn:  # the db of the former version, without the schema version
+            conn.execute("CREATE TABLE txtimeinfo (tx_hash TEXT PRIMARY KEY, time INTEGER)")
+            conn.execute("INSERT INTO txtimeinfo VALUES('txid_a', 100)")
+
+        db = TxDb(self.path)
+        self.assertEqual([("txid_a", 100)], db.get_tx_time_info("txid_a"))
+        self.assertEqual(tx_db.SCHEMA_VERSION, self._user_version())
+        db.close()
+
+        with self.subTest("Upgrade from the current version only"):
+            schema_migrations = {
+                **tx_db.schema_migrations,
+                tx_db.SCHEMA_VERSION: ("CREATE TABLE extrainfo (tx_hash TEXT PRIMARY KEY)",),
+            }
+            with patch.object(tx_db, "SCHEMA_VERSION", tx_db.SCHEMA_VERSION + 1), patch.object(
+                tx_db, "schema_migrations", schema_migrations
+            ):
+                db = TxDb(self.path)
+                self.assertEqual([], db._fetchall("SELECT * FROM extrainfo", ()))
+                self.assertEqual([("txid_a", 100)], db.get_tx_time_info("txid_a"))
+                self.assertEqual(tx_db.SCHEMA_VERSION, self._user_version())
+                db.close()
+
+        with self.subTest("Keep the newer version"):
+            db = TxDb(self.path)
+            self.assertEqual([("txid_a", 100)], db.get_tx_time_info("txid_a"))
+            self.assertEqual(tx_db.SCHEMA_VERSION + 1, self._user_version())
+            db.close()
+
+    def test_connection_per_thread(self):
+        db = TxDb(self.path)
+        conn = db._get_conn()
+        self.assertIs(conn, db._get_conn())
+
+        other_conns = []
+        thread = threading.Thread(target=lambda: other_conns.append(db._get_conn()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(conn, other_conns[0])
+
+        with self.subTest("Reconnect once closed"):
+            db.close()
+            self.assertIsNot(conn, db._get_conn())
+            db.close()
+
+    @patch.object(tx_db, "SQLITE_MAX_VARIABLES", 2)
+    def test_batch(self):
+        db = TxDb(self.path)
+
+        db.add_tx_infos([("address_a", "psbt_a", "txid_a", "raw_a", ""), ("address_a", "psbt_b", "txid_b", "", "")])
+        self.assertEqual(["txid_a", "txid_b"], [i[0] for i in db.get_tx_info("address_a")])
+
+        for txid in ("txid_a", "txid_b", "txid_c"):
+            db.add_tx_time_info(txid)
+        self.assertEqual(
+            {"txid_a", "txid_b", "txid_c"},
+            set(db.get_tx_time_infos(["txid_a", "txid_b", "txid_c", "txid_d", "txid_a"])),
+        )
+        self.assertEqual({}, db.get_tx_time_infos([]))
+
+        with self.subTest("Rollback all if failed"):
+            with self.assertRaises(ValueError):
+                db.add_tx_infos([("address_a", "", "txid_c", "", ""), ("address_a", "", "txid_d", "")])
+            self.assertEqual(["txid_a", "txid_b"], [i[0] for i in db.get_tx_info("address_a")])
+
+        db.close()
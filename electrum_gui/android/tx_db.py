@@ -1,111 +1,146 @@
-import functools
+import contextlib
 import sqlite3
+import threading
 import time
+from typing import Dict, Iterable, List, Tuple
 
+SCHEMA_VERSION = 1
 
-tx_info_table_cmd = "CREATE TABLE IF NOT EXISTS txinfo (tx_hash TEXT PRIMARY KEY, address TEXT, psbt_tx TEXT, raw_tx Text, time INTEGER, faile_info TEXT)"
-tx_time_table_cmd = "CREATE TABLE IF NOT EXISTS txtimeinfo (tx_hash TEXT PRIMARY KEY, time INTEGER)"
-tx_fee_table_cmd = "CREATE TABLE IF NOT EXISTS receviedtxfeeinfo (tx_hash TEXT PRIMARY KEY, fee TEXT)"
-tx_input_table_cmd = "CREATE TABLE IF NOT EXISTS receviedtxinputinfo (tx_hash TEXT PRIMARY KEY, input_list TEXT)"
-
-def connect_db(cmd, is_add=False):
-    def middle(f):
-        @functools.wraps(f)
-        def wrapper(cls, *args, **kwargs):
-            try:
-                cls.conn = sqlite3.connect(cls.path)
-                cls.cursor = cls.conn.cursor()
-                cls.create_table(cmd)
-                result = f(cls, *args, **kwargs)
-            except Exception as e:
-                if is_add:
-                    cls.conn.rollback()
-                raise e
-            else:
-                if is_add:
-                    cls.conn.commit()
-                return result
-            finally:
-                if cls.cursor:
-                    cls.cursor.close()
-                if cls.conn:
-                    cls.conn.close()
-        return wrapper
-    return middle
-
-class TxDb:
-    conn = None
-    cursor = None
-    path = None
+# statements of the schema, upgrading from the version as the key to the next one
+schema_migrations = {
+    0: (
+        "CREATE TABLE IF NOT EXISTS txinfo (tx_hash TEXT PRIMARY KEY, address TEXT, psbt_tx TEXT, raw_tx Text, time INTEGER, faile_info TEXT)",
+        "CREATE TABLE IF NOT EXISTS txtimeinfo (tx_hash TEXT PRIMARY KEY, time INTEGER)",
+        "CREATE TABLE IF NOT EXISTS receviedtxfeeinfo (tx_hash TEXT PRIMARY KEY, fee TEXT)",
+        "CREATE TABLE IF NOT EXISTS receviedtxinputinfo (tx_hash TEXT PRIMARY KEY, input_list TEXT)",
+        "CREATE INDEX IF NOT EXISTS txinfo_address_time ON txinfo (address, time)",
+    ),
+}
+
+# the statements are constant, so that they are compiled once and reused by the statement cache of each connection
+select_tx_info_cmd = "SELECT * FROM txinfo WHERE address=? ORDER BY time"
+insert_tx_info_cmd = "INSERT OR IGNORE INTO txinfo VALUES(?, ?, ?, ?, ?, ?)"
+select_tx_time_cmd = "SELECT * FROM txtimeinfo WHERE tx_hash=?"
+insert_tx_time_cmd = "INSERT OR IGNORE INTO txtimeinfo VALUES(?, ?)"
+select_tx_fee_cmd = "SELECT * FROM receviedtxfeeinfo WHERE tx_hash=?"
+insert_tx_fee_cmd = "INSERT OR IGNORE INTO receviedtxfeeinfo VALUES(?, ?)"
+select_tx_input_cmd = "SELECT * FROM receviedtxinputinfo WHERE tx_hash=?"
+insert_tx_input_cmd = "INSERT OR IGNORE INTO receviedtxinputinfo VALUES(?, ?)"
+
+SQLITE_MAX_VARIABLES = 500
+
+
+class TxDb(object):
+    """
+    Local tx infos of the android app.
+    Every thread keeps its own connection to the db, which is opened on first use and reused since then,
+    and the schema is created or upgraded only once, by the first connection
+    """
 
     def __init__(self, path=""):
-        TxDb.path = path
-
-    @classmethod
-    def create_table(cls, cmd):
-        cls.cursor.execute(cmd)
-
-    @classmethod
-    @connect_db(tx_info_table_cmd)
-    def get_tx_info(cls, address):
-        cls.cursor.execute("SELECT * FROM txinfo WHERE address=? ORDER BY time", (address,))
-        result = cls.cursor.fetchall()
-        tx_list = []
-        for info in result:
-            tx_list.append(info)
-        return tx_list
-
-    @classmethod
-    @connect_db(tx_info_table_cmd, is_add=True)
-    def add_tx_info(cls, address, psbt_tx, tx_hash, raw_tx="", failed_info=""):
-        cls.cursor.execute("INSERT OR IGNORE INTO txinfo VALUES(?, ?, ?, ?, ?, ?)",
-                           (tx_hash, address, str(psbt_tx), str(raw_tx), time.time(), failed_info))
-
-    @classmethod
-    @connect_db(tx_time_table_cmd)
-    def get_tx_time_info(cls, tx_hash):
-        cls.cursor.execute("SELECT * FROM txtimeinfo WHERE tx_hash=?", (tx_hash,))
-        result = cls.cursor.fetchall()
-        tx_list = []
-        for info in result:
-            tx_list.append(info)
-        return tx_list
-
-    @classmethod
-    @connect_db(tx_time_table_cmd, is_add=True)
-    def add_tx_time_info(cls, tx_hash):
-        cls.cursor.execute("INSERT OR IGNORE INTO txtimeinfo VALUES(?, ?)",
-                           (tx_hash, time.time()))
-
-    ### API for recevied tx fee
-    @classmethod
-    @connect_db(tx_fee_table_cmd)
-    def get_received_tx_fee_info(cls, tx_hash):
-        cls.cursor.execute("SELECT * FROM receviedtxfeeinfo WHERE tx_hash=?", (tx_hash,))
-        result = cls.cursor.fetchall()
-        tx_list = []
-        for info in result:
-            tx_list.append(info)
-        return tx_list
-
-    @classmethod
-    @connect_db(tx_fee_table_cmd, is_add=True)
-    def add_received_tx_fee_info(cls, tx_hash, fee):
-        cls.cursor.execute("INSERT OR IGNORE INTO receviedtxfeeinfo VALUES(?, ?)",
-                           (tx_hash, fee))
-
-    @classmethod
-    @connect_db(tx_input_table_cmd)
-    def get_received_tx_input_info(cls, tx_hash):
-        cls.cursor.execute("SELECT * FROM receviedtxinputinfo WHERE tx_hash=?", (tx_hash,))
-        result = cls.cursor.fetchall()
-        tx_list = []
-        for info in result:
-            tx_list.append(info)
-        return tx_list
-
-    @classmethod
-    @connect_db(tx_input_table_cmd, is_add=True)
-    def add_received_tx_input_info(cls, tx_hash, input_list):
-        cls.cursor.execute("INSERT OR IGNORE INTO receviedtxinputinfo VALUES(?, ?)",
-                           (tx_hash, input_list))
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._is_schema_ready = False
+
+    def _get_conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, cached_statements=64)
+            self._ensure_schema(conn)
+            self._local.conn = conn
+
+        return conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection):
+        if self._is_schema_ready:
+            return
+
+        with self._schema_lock:
+            if self._is_schema_ready:
+                return
+
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            with conn:
+                for from_version in range(version, SCHEMA_VERSION):
+                    for cmd in schema_migrations[from_version]:
+                        conn.execute(cmd)
+                conn.execute(f"PRAGMA user_version = {max(version, SCHEMA_VERSION)}")
+
+            self._is_schema_ready = True
+
+    def close(self):
+        """
+        Close the connection of the current thread
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _fetchall(self, cmd: str, params: tuple) -> List[tuple]:
+        with contextlib.closing(self._get_conn().execute(cmd, params)) as cursor:
+            return cursor.fetchall()
+
+    def _fetch_by_tx_hashes(self, table: str, tx_hashes: Iterable[str]) -> Dict[str, tuple]:
+        tx_hashes = list(set(tx_hashes))
+        result = {}
+
+        for i in range(0, len(tx_hashes), SQLITE_MAX_VARIABLES):
+            chunk = tx_hashes[i : i + SQLITE_MAX_VARIABLES]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self._fetchall(f"SELECT * FROM {table} WHERE tx_hash IN ({placeholders})", tuple(chunk))
+            result.update((row[0], row) for row in rows)
+
+        return result
+
+    def _executemany(self, cmd: str, rows: Iterable[tuple]):
+        conn = self._get_conn()
+        with conn:  # commit on success, or rollback on error
+            conn.executemany(cmd, rows)
+
+    def get_tx_info(self, address):
+        return self._fetchall(select_tx_info_cmd, (address,))
+
+    def add_tx_info(self, address, psbt_tx, tx_hash, raw_tx="", failed_info=""):
+        self.add_tx_infos([(address, psbt_tx, tx_hash, raw_tx, failed_info)])
+
+    def add_tx_infos(self, tx_infos: Iterable[Tuple[str, str, str, str, str]]):
+        """
+        Add tx infos in one transaction
+        :param tx_infos: list of (address, psbt_tx, tx_hash, raw_tx, failed_info)
+        """
+        now = time.time()
+        self._executemany(
+            insert_tx_info_cmd,
+            (
+                (tx_hash, address, str(psbt_tx), str(raw_tx), now, failed_info)
+                for address, psbt_tx, tx_hash, raw_tx, failed_info in tx_infos
+            ),
+        )
+
+    def get_tx_time_info(self, tx_hash):
+        return self._fetchall(select_tx_time_cmd, (tx_hash,))
+
+    def get_tx_time_infos(self, tx_hashes: Iterable[str]) -> Dict[str, tuple]:
+        """
+        Get the time infos of txs in batch
+        :return: rows by tx_hash, the missing ones are not included
+        """
+        return self._fetch_by_tx_hashes("txtimeinfo", tx_hashes)
+
+    def add_tx_time_info(self, tx_hash):
+        self._executemany(insert_tx_time_cmd, [(tx_hash, time.time())])
+
+    # API for recevied tx fee
+    def get_received_tx_fee_info(self, tx_hash):
+        return self._fetchall(select_tx_fee_cmd, (tx_hash,))
+
+    def add_received_tx_fee_info(self, tx_hash, fee):
+        self._executemany(insert_tx_fee_cmd, [(tx_hash, fee)])
+
+    def get_received_tx_input_info(self, tx_hash):
+        return self._fetchall(select_tx_input_cmd, (tx_hash,))
+
+    def add_received_tx_input_info(self, tx_hash, input_list):
+        self._executemany(insert_tx_input_cmd, [(tx_hash, input_list)])
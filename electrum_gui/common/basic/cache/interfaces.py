@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+MISSING = object()  # returned by get if the key is not cached or expired
+
+
+class CacheInterface(ABC):
+    @abstractmethod
+    def get(self, key: Any) -> Any:
+        """
+        Get the cached value
+        :param key: cache key
+        :return: cached value, or MISSING if not cached or expired
+        """
+
+    @abstractmethod
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        """
+        Cache the value
+        :param key: cache key
+        :param value: value
+        :param ttl: time to live in seconds, None means the default ttl of the cache
+        """
+
+    @abstractmethod
+    def delete(self, key: Any):
+        """
+        Remove the cached value
+        :param key: cache key
+        """
+
+    @abstractmethod
+    def clear(self):
+        """
+        Remove all the cached values
+        """
@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from electrum_gui.common.basic.cache.interfaces import MISSING, CacheInterface
+from electrum_gui.common.basic.dataclass.dataclass import DataClassMixin
+
+
+@dataclass
+class CacheStats(DataClassMixin):
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0
+
+
+class MemoryCache(CacheInterface):
+    """
+    Thread-safe LRU cache with expiration
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: Optional[float] = None,
+        on_evict: Callable[[Any, Any], None] = None,
+    ):
+        """
+        :param max_size: the least recently used entries are evicted if exceeded
+        :param ttl: default time to live in seconds, None means never expired
+        :param on_evict: called with (key, value) once the entry is evicted, expired, replaced or removed
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data = OrderedDict()  # key -> (value, expired_at)
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            value, expired_at = self._data.get(key, (MISSING, None))
+
+            if value is not MISSING and expired_at is not None and expired_at <= time.time():
+                self._pop(key)
+                value = MISSING
+
+            if value is MISSING:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+                self._data.move_to_end(key)
+
+            return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expired_at = time.time() + ttl if ttl is not None else None
+
+        with self._lock:
+            if key in self._data and self._data[key][0] is not value:
+                self._pop(key)
+
+            self._data[key] = (value, expired_at)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_size:
+                self._pop(next(iter(self._data)))
+                self._stats.evictions += 1
+
+    def delete(self, key: Any):
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._data):
+                self._pop(key)
+
+    def purge_expired(self):
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (_, expired_at) in self._data.items() if expired_at is not None and expired_at <= now]:
+                self._pop(key)
+
+    def _pop(self, key: Any):
+        value, _ = self._data.pop(key)
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_stats(self) -> CacheStats:
+        with self._lock:
+            return self._stats.clone(size=len(self._data))
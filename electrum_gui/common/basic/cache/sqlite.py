@@ -0,0 +1,83 @@
+import pickle  # nosec B403
+import threading
+import time
+from typing import Any, Optional
+
+import peewee
+
+from electrum_gui.common.basic.cache.interfaces import MISSING, CacheInterface
+
+
+class SqliteCache(CacheInterface):
+    """
+    Persistent cache on a standalone sqlite file, values are pickled, so only cache the data created by ourselves
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None, max_rows: Optional[int] = None):
+        """
+        :param path: path of the sqlite file
+        :param ttl: default time to live in seconds, None means never expired
+        :param max_rows: max rows kept by trim, the least recently written ones are deleted first, None means unbounded
+        """
+        self.db = peewee.SqliteDatabase(path, pragmas={"journal_mode": "wal", "synchronous": "normal"})
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._initialized = False
+        self._lock = threading.Lock()
+
+    def _ensure_table(self):
+        if self._initialized:
+            return
+
+        with self._lock:
+            if not self._initialized:
+                self.db.execute_sql(
+                    "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expired_at REAL)"
+                )
+                self._initialized = True
+
+    def get(self, key: Any) -> Any:
+        self._ensure_table()
+        row = self.db.execute_sql("SELECT value, expired_at FROM cache WHERE key = ?", (repr(key),)).fetchone()
+
+        if row is None:
+            return MISSING
+
+        value, expired_at = row
+        if expired_at is not None and expired_at <= time.time():
+            self.delete(key)
+            return MISSING
+
+        return pickle.loads(value)  # nosec B301
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        self._ensure_table()
+        ttl = self.ttl if ttl is None else ttl
+        expired_at = time.time() + ttl if ttl is not None else None
+        self.db.execute_sql(
+            "INSERT OR REPLACE INTO cache (key, value, expired_at) VALUES (?, ?, ?)",
+            (repr(key), pickle.dumps(value), expired_at),
+        )
+
+    def delete(self, key: Any):
+        self._ensure_table()
+        self.db.execute_sql("DELETE FROM cache WHERE key = ?", (repr(key),))
+
+    def clear(self):
+        self._ensure_table()
+        self.db.execute_sql("DELETE FROM cache")
+
+    def purge_expired(self):
+        self._ensure_table()
+        self.db.execute_sql("DELETE FROM cache WHERE expired_at IS NOT NULL AND expired_at <= ?", (time.time(),))
+
+    def trim(self):
+        if self.max_rows is None:
+            return
+
+        self._ensure_table()
+        # INSERT OR REPLACE gives the row a new rowid, so the smaller rowid is the earlier written
+        self.db.execute_sql(
+            "DELETE FROM cache WHERE rowid <= (SELECT rowid FROM cache ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+            (int(self.max_rows),),
+        )
@@ -0,0 +1,151 @@
+import threading
+import time
+from enum import Enum, unique
+from typing import Optional
+
+
+class TokenBucket(object):
+    """
+    Token bucket rate limiter, thread-safe
+    """
+
+    def __init__(self, rate: Optional[float] = None, capacity: Optional[float] = None):
+        """
+        :param rate: tokens generated per second, None means unlimited
+        :param capacity: max tokens could be accumulated, default to rate
+        """
+        self.rate = rate
+        self.capacity = max(capacity or rate or 1, 1)
+        self.tokens = self.capacity
+        self.paused_until = 0.0
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if self.rate:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def _wait_time(self, now: float) -> float:
+        """
+        Take a token and return 0 if available, otherwise return the seconds to wait
+        """
+        if now < self.paused_until:
+            return self.paused_until - now
+
+        if not self.rate:
+            return 0
+
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        else:
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take a token, blocking until it is available
+        :param timeout: max seconds to wait, None means waiting forever
+        :return: True if taken, False if timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait_time = self._wait_time(now)
+
+            if wait_time <= 0:
+                return True
+            elif deadline is not None and now + wait_time > deadline:
+                return False
+            else:
+                time.sleep(wait_time)
+
+    def pause(self, seconds: float):
+        """
+        Stop giving out tokens for a while, i.e. the server responds with 429 and Retry-After
+        """
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    @property
+    def is_paused(self) -> bool:
+        return time.monotonic() < self.paused_until
+
+
+@unique
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker(object):
+    """
+    Opens after {failure_threshold} consecutive failures, and half-opens after {cooldown} seconds,
+    then lets a single trial call through, closes if it succeeds, or opens again if not
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 60):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.is_trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        opened_at = self.opened_at
+
+        if opened_at is None:
+            return CircuitState.CLOSED
+        elif time.monotonic() - opened_at < self.cooldown:
+            return CircuitState.OPEN
+        else:
+            return CircuitState.HALF_OPEN
+
+    def allow_request(self) -> bool:
+        """
+        Check if a request is allowed, without taking the trial call of half open state
+        """
+        state = self.state
+        return state == CircuitState.CLOSED or (state == CircuitState.HALF_OPEN and not self.is_trial_running)
+
+    def acquire(self) -> bool:
+        """
+        Take the permission to send a request, which is the only trial call in half open state
+        :return: True if allowed
+        """
+        with self._lock:
+            state = self.state
+            if state == CircuitState.CLOSED:
+                return True
+            elif state == CircuitState.HALF_OPEN and not self.is_trial_running:
+                self.is_trial_running = True
+                return True
+            else:
+                return False
+
+    def release(self):
+        """
+        Give up the trial call without any result, i.e. throttled by the server
+        """
+        with self._lock:
+            self.is_trial_running = False
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.is_trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.is_trial_running = False
+
+            if self.opened_at is not None or self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()  # (re)open, the failure of trial call in half open state as well
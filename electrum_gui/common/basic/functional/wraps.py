@@ -3,28 +3,114 @@ import functools
 import logging
 import threading
 import time
-from typing import Any
+from typing import Any, Callable
 
+from electrum_gui.common.basic.cache.interfaces import MISSING
+from electrum_gui.common.basic.cache.memory import MemoryCache
+
+logger = logging.getLogger("app.wraps")
+
+
+def _cache_if_possible(cache: MemoryCache, key: Any, value: Any, timeout: float, cacheable: Callable[[Any], bool]):
+    if cacheable is None or cacheable(value):
+        cache.set(key, (value, time.time() + timeout))
+
+
+def cache_it(
+    timeout: float = 60,
+    max_size: int = 1024,
+    stale_while_revalidate: float = 0,
+    cacheable: Callable[[Any], bool] = None,
+):
+    """
+    Cache the result by the arguments of the decorated function, only one caller recomputes the expired entry,
+    and the others wait for it. The decorated function comes with invalidate(*args, **kwargs), clear() and get_stats()
+    :param timeout: seconds before the cached result becomes stale
+    :param max_size: the least recently used entries are evicted if exceeded
+    :param stale_while_revalidate: seconds the stale result can still be returned while being refreshed in background
+    :param cacheable: decide whether the result can be cached, i.e. not the None meaning not found yet
+    """
 
-def cache_it(timeout: int = 60):  # in seconds
     def wrapper(fn):
-        _cache = {}
+        cache = MemoryCache(max_size=max_size, ttl=timeout + stale_while_revalidate)
+        locks = {}  # key -> (lock, counter)
+        refreshing = set()
+        table_lock = threading.Lock()
+
+        def _make_key(args: tuple, kwargs: dict) -> Any:
+            key = (args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                key = str(key)
+
+            return key
+
+        @contextlib.contextmanager
+        def _key_lock(key: Any):
+            with table_lock:
+                lock, counter = locks.get(key) or (threading.Lock(), 0)
+                locks[key] = (lock, counter + 1)
+
+            try:
+                with lock:
+                    yield
+            finally:
+                with table_lock:
+                    lock, counter = locks[key]
+                    if counter == 1:
+                        locks.pop(key)
+                    else:
+                        locks[key] = (lock, counter - 1)
+
+        def _load(key: Any, args: tuple, kwargs: dict, force_update: bool = False) -> Any:
+            with _key_lock(key):
+                entry = MISSING if force_update else cache.get(key)
+                if entry is not MISSING and entry[1] > time.time():  # refreshed by the other caller already
+                    return entry[0]
+
+                value = fn(*args, **kwargs)
+                _cache_if_possible(cache, key, value, timeout, cacheable)
+                return value
+
+        def _refresh_in_background(key: Any, args: tuple, kwargs: dict):
+            try:
+                _load(key, args, kwargs, force_update=True)
+            except Exception as e:
+                logger.exception(f"Error in refreshing cache of {fn}, error: {e}")
+            finally:
+                with table_lock:
+                    refreshing.discard(key)
 
         @functools.wraps(fn)
         def inner(*args, **kwargs):
-            nonlocal _cache
             force_update = kwargs.pop("__force_update_cache_it__", False)
-            key_ = str((args, tuple(sorted(kwargs.items()))))
-            val, expired_at = _cache.get(key_) or (None, None)
+            key = _make_key(args, kwargs)
+            entry = MISSING if force_update else cache.get(key)
+
+            if entry is not MISSING:
+                value, fresh_until = entry
+                if fresh_until > time.time():
+                    return value
+
+                if stale_while_revalidate > 0:
+                    with table_lock:
+                        required = key not in refreshing
+                        refreshing.add(key)
+
+                    if required:
+                        threading.Thread(target=_refresh_in_background, args=(key, args, kwargs), daemon=True).start()
+
+                    return value
 
-            if force_update or expired_at is None or expired_at < time.time():
-                _cache.pop(key_, None)
-                val = fn(*args, **kwargs)
-                expired_at = time.time() + timeout
-                _cache[key_] = (val, expired_at)
+            return _load(key, args, kwargs, force_update=force_update)
 
-            return val
+        def invalidate(*args, **kwargs):
+            cache.delete(_make_key(args, kwargs))
 
+        inner.invalidate = invalidate
+        inner.clear = cache.clear
+        inner.get_stats = cache.get_stats
         return inner
 
     return wrapper
@@ -1,5 +1,73 @@
+import logging
+
 from peewee import SqliteDatabase
 
+from electrum_gui.common.basic.functional.timing import timing_logger
 from electrum_gui.common.conf import settings
 
-db = SqliteDatabase(settings.DATABASE["default"]["name"])
+logger = logging.getLogger("app.orm")
+
+
+def _create_database(config: dict) -> SqliteDatabase:
+    # Connections are thread-local with thread_safe=True, so that the ticker and the UI threads never share one,
+    # and the pragmas are applied each time a thread connects
+    return SqliteDatabase(
+        config["name"],
+        pragmas=config.get("pragmas") or {},
+        timeout=config.get("timeout", 5),
+        thread_safe=True,
+    )
+
+
+db = _create_database(settings.DATABASE["default"])
+
+
+def enable_incremental_vacuum(database: SqliteDatabase, max_size: int = None) -> bool:
+    """
+    Switch the existing database to the incremental auto vacuum, which takes a full vacuum locking all the writers,
+    so it is done once at startup before the scheduler starts, and skipped if the database is too large
+    :param database: database
+    :param max_size: in bytes, skip the database larger than it, never skipped if None
+    :return: True if the incremental auto vacuum is enabled
+    """
+    if database.pragma("auto_vacuum") == 2:
+        return True
+
+    size = database.pragma("page_count") * database.pragma("page_size")
+    if max_size is not None and size > max_size:
+        logger.info(f"Skip switching to incremental vacuum as the database is too large. size: {size}")
+        return False
+
+    database.pragma("auto_vacuum", 2)
+    database.execute_sql("VACUUM;")  # the mode of the existing database changes only after a full vacuum
+    return True
+
+
+def optimize(database: SqliteDatabase, vacuum_pages: int = 0):
+    """
+    Refresh the statistics of the query planner, and release the free pages to the file system
+    if the incremental auto vacuum is enabled, see enable_incremental_vacuum
+    :param database: database
+    :param vacuum_pages: max number of free pages to release, all of them if 0
+    """
+    database.execute_sql("PRAGMA optimize;")
+
+    if database.pragma("auto_vacuum") == 2:
+        # it releases one page per step, which is only stepped once by execute_sql
+        database.connection().executescript(f"PRAGMA incremental_vacuum({int(vacuum_pages)});")
+
+
+@timing_logger("orm_database.on_startup")
+def on_startup():
+    try:
+        enable_incremental_vacuum(db, max_size=settings.DATABASE["default"].get("vacuum_max_size"))
+    except Exception as e:
+        logger.exception(f"Error in enabling incremental vacuum. error: {e}")
+
+
+@timing_logger("orm_database.on_ticker_signal")
+def on_ticker_signal():
+    try:
+        optimize(db, vacuum_pages=settings.DATABASE["default"].get("vacuum_pages", 0))
+    except Exception as e:
+        logger.exception(f"Error in optimizing database. error: {e}")
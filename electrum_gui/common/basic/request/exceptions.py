@@ -1,4 +1,6 @@
-from typing import Any
+import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
 
 from requests import Response
 
@@ -14,6 +16,34 @@ class ResponseException(IOError):
 
         super(ResponseException, self).__init__(message)
 
+    @property
+    def is_rate_limited(self) -> bool:
+        return self.response is not None and self.response.status_code == 429
+
+    @property
+    def retry_after(self) -> Optional[float]:
+        """
+        Parse the Retry-After header, which is either seconds or a http date
+        :return: seconds, or None if not specified
+        """
+        value = self.response.headers.get("Retry-After") if self.response is not None else None
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.replace(".", "", 1).isdigit():
+            return float(value)
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+
+        return max((retry_at - datetime.datetime.now(tz=datetime.timezone.utc)).total_seconds(), 0)
+
 
 class JsonRPCException(IOError):
     def __init__(self, message: str, json_response: Any = None):
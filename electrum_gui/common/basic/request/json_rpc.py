@@ -1,4 +1,5 @@
-from typing import Any, Callable, List, Tuple, Union
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from requests import Response, Session
 
@@ -7,6 +8,21 @@ from electrum_gui.common.basic.request.interfaces import JsonRPCInterface
 from electrum_gui.common.basic.request.restful import RestfulRequest
 
 
+class _CoalescedCall(object):
+    def __init__(self, method: str, params: Union[list, dict, None]):
+        self.method = method
+        self.params = params
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class _CoalescedBatch(object):
+    def __init__(self):
+        self.calls: List[_CoalescedCall] = []
+        self.full = threading.Event()
+
+
 class JsonRPCRequest(JsonRPCInterface):
     def __init__(
         self,
@@ -14,6 +30,8 @@ class JsonRPCRequest(JsonRPCInterface):
         timeout: int = 30,  # in seconds
         debug_mode: bool = False,
         session_initializer: Callable[[Session], None] = None,
+        coalesce_window: float = 0,  # in seconds, merge calls issued within the window while others are in flight, 0 means disabled
+        coalesce_max_size: int = 20,  # max calls merged into one batch
     ):
         self.inner = RestfulRequest(
             base_url=url,
@@ -22,6 +40,12 @@ class JsonRPCRequest(JsonRPCInterface):
             debug_mode=debug_mode,
             session_initializer=session_initializer,
         )
+        self.timeout = timeout
+        self.coalesce_window = coalesce_window
+        self.coalesce_max_size = coalesce_max_size
+        self._coalescing_batches: Dict[Tuple[str, Optional[int]], _CoalescedBatch] = {}
+        self._in_flight_counts: Dict[Tuple[str, Optional[int]], int] = {}
+        self._coalescing_lock = threading.Lock()
 
     def call(
         self,
@@ -32,6 +56,9 @@ class JsonRPCRequest(JsonRPCInterface):
         path: str = "",
         **kwargs,
     ) -> Union[Response, Any]:
+        if self.coalesce_window > 0 and headers is None and not kwargs:
+            return self._coalesce_call(method, params, timeout, path)
+
         payload = self.normalize_params(method, params)
         try:
             resp = self.inner.post(path, json=payload, timeout=timeout, headers=headers, **kwargs)
@@ -73,6 +100,103 @@ class JsonRPCRequest(JsonRPCInterface):
                         raise e
             return results
 
+    def _coalesce_call(self, method: str, params: Union[list, dict, None], timeout: Optional[int], path: str) -> Any:
+        """
+        Merge concurrent calls into one batch request.
+        The call is sent at once if no other request is in flight, so that a single call never waits for the window.
+        Otherwise, the first caller of a batch waits for the window (or until the batch is full), then sends the batch,
+        and the others just wait for their own results
+        """
+        key = (path, timeout)
+        call = _CoalescedCall(method, params)
+
+        with self._coalescing_lock:
+            batch = self._coalescing_batches.get(key)
+            is_direct = batch is None and not self._in_flight_counts.get(key)
+            if is_direct:
+                self._in_flight_counts[key] = 1
+
+        if is_direct:
+            self._send_coalesced_batch(key, [call], timeout, path)
+            return self._get_coalesced_result(call)
+
+        with self._coalescing_lock:
+            batch = self._coalescing_batches.get(key)
+            is_leader = batch is None
+            if is_leader:
+                batch = self._coalescing_batches[key] = _CoalescedBatch()
+
+            batch.calls.append(call)
+            if len(batch.calls) >= self.coalesce_max_size:
+                self._coalescing_batches.pop(key, None)
+                batch.full.set()
+
+        if is_leader:
+            batch.full.wait(self.coalesce_window)
+
+            with self._coalescing_lock:
+                if self._coalescing_batches.get(key) is batch:
+                    self._coalescing_batches.pop(key)
+                self._in_flight_counts[key] = self._in_flight_counts.get(key, 0) + 1
+
+            self._send_coalesced_batch(key, batch.calls, timeout, path)
+        elif not call.done.wait((timeout or self.timeout) + self.coalesce_window):  # likes the leader at most
+            raise JsonRPCException(f"Json RPC call timed out. method: {method}")
+
+        return self._get_coalesced_result(call)
+
+    @staticmethod
+    def _get_coalesced_result(call: _CoalescedCall) -> Any:
+        if call.error is not None:
+            raise call.error
+
+        return call.result
+
+    def _send_coalesced_batch(
+        self, key: Tuple[str, Optional[int]], calls: List[_CoalescedCall], timeout: Optional[int], path: str
+    ):
+        try:
+            responses = self._post_coalesced_batch(calls, timeout, path)
+        except Exception as e:
+            responses = None
+            for call in calls:
+                call.error = e
+        finally:
+            with self._coalescing_lock:
+                self._in_flight_counts[key] -= 1
+
+        if responses is not None:
+            for order_id, (call, response) in enumerate(zip(calls, responses)):
+                try:
+                    call.result = self.parse_response(response, order_id=None if len(calls) == 1 else order_id)
+                except JsonRPCException as e:
+                    call.error = e
+
+        for call in calls:
+            call.done.set()
+
+    def _post_coalesced_batch(self, calls: List[_CoalescedCall], timeout: Optional[int], path: str) -> List[Any]:
+        if len(calls) == 1:
+            payload = self.normalize_params(calls[0].method, calls[0].params)
+        else:
+            payload = [
+                self.normalize_params(call.method, call.params, order_id=order_id)
+                for order_id, call in enumerate(calls)
+            ]
+
+        try:
+            resp = self.inner.post(path, json=payload, timeout=timeout)
+        except RequestException:
+            raise JsonRPCException("Json RPC call failed.")
+
+        if len(calls) == 1:
+            return [resp]
+        elif not isinstance(resp, list):
+            raise JsonRPCException(f"Responses of batch call should be a list, but got <{resp}>", json_response=resp)
+        else:
+            resp_by_id = {i.get("id"): i for i in resp if isinstance(i, dict)}
+            return [resp_by_id.get(order_id) for order_id in range(len(calls))]
+
     @staticmethod
     def parse_response(response: dict, order_id: int = None) -> Any:
         resp_tag = "RPC response" if order_id is None else f"{order_id} response of batch"
@@ -3,14 +3,12 @@ from urllib.parse import urljoin
 
 from requests import RequestException, Response, Session
 
-from electrum_gui.common.basic.request import exceptions
+from electrum_gui.common.basic.request import exceptions, transport
 from electrum_gui.common.basic.request.enums import Method
 from electrum_gui.common.basic.request.interfaces import RestfulInterface
 
 
 class RestfulRequest(RestfulInterface):
-    __DEFAULT_HEADER__ = {"User-Agent": "Electrum"}
-
     def __init__(
         self,
         base_url: str,
@@ -23,16 +21,13 @@ class RestfulRequest(RestfulInterface):
         self.timeout = timeout
         self.response_jsonlize = response_jsonlize
         self.debug_mode = debug_mode
-        self.session = self._new_session()
 
         if session_initializer:
+            # the initializer may mutate the session, so don't share it with others
+            self.session = transport.new_session(base_url)
             session_initializer(self.session)
-
-    @classmethod
-    def _new_session(cls):
-        session = Session()
-        session.headers.update(cls.__DEFAULT_HEADER__)
-        return session
+        else:
+            self.session = transport.get_shared_session(base_url)
 
     def __str__(self):
         return (
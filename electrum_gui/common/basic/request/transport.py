@@ -0,0 +1,159 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from electrum_gui.common.basic.dataclass.dataclass import DataClassMixin
+from electrum_gui.common.conf import settings
+
+DEFAULT_HEADERS = {"User-Agent": "Electrum"}
+
+
+@dataclass
+class TransportStats(DataClassMixin):
+    host: str
+    requests: int = 0
+    new_connections: int = 0
+    handshake_time: float = 0  # in seconds, total time spent on TCP connect and TLS handshake
+
+    @property
+    def reused_connections(self) -> int:
+        return max(self.requests - self.new_connections, 0)
+
+    @property
+    def avg_handshake_time(self) -> float:
+        return self.handshake_time / self.new_connections if self.new_connections else 0
+
+
+_STATS: Dict[str, TransportStats] = {}
+_STATS_LOCK = threading.Lock()
+
+
+def _record(host: str, requests: int = 0, new_connections: int = 0, handshake_time: float = 0):
+    with _STATS_LOCK:
+        stats = _STATS.get(host)
+        if stats is None:
+            stats = _STATS[host] = TransportStats(host=host)
+
+        stats.requests += requests
+        stats.new_connections += new_connections
+        stats.handshake_time += handshake_time
+
+
+class _InstrumentedPoolMixin(object):
+    def _new_conn(self):
+        conn = super(_InstrumentedPoolMixin, self)._new_conn()
+        host = self.host
+        origin_connect = conn.connect
+
+        def _connect(*args, **kwargs):
+            start_time = time.time()
+            try:
+                return origin_connect(*args, **kwargs)
+            finally:
+                _record(host, new_connections=1, handshake_time=time.time() - start_time)
+
+        conn.connect = _connect
+        return conn
+
+
+class _InstrumentedHTTPConnectionPool(_InstrumentedPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _InstrumentedHTTPSConnectionPool(_InstrumentedPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class InstrumentedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super(InstrumentedHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _InstrumentedHTTPConnectionPool,
+            "https": _InstrumentedHTTPSConnectionPool,
+        }
+
+    def send(self, request, *args, **kwargs):
+        _record(urlparse(request.url).hostname or "", requests=1)
+        return super(InstrumentedHTTPAdapter, self).send(request, *args, **kwargs)
+
+
+def _load_host_config(host: str) -> dict:
+    config = dict(settings.REQUEST_TRANSPORT)
+    host_overrides = config.pop("hosts", None) or {}
+    config.update(host_overrides.get(host) or {})
+    return config
+
+
+def new_session(base_url: str) -> Session:
+    """
+    Create a session whose connection pool is configured by settings.REQUEST_TRANSPORT
+    :param base_url: the url decides which per-host overrides will be applied
+    :return: Session
+    """
+    config = _load_host_config(urlparse(base_url).hostname or "")
+
+    session = Session()
+    session.headers.update(DEFAULT_HEADERS)
+    if not config.get("keep_alive", True):
+        session.headers["Connection"] = "close"
+
+    adapter = InstrumentedHTTPAdapter(
+        pool_connections=config.get("pool_connections", 10),
+        pool_maxsize=config.get("pool_maxsize", 10),
+        pool_block=config.get("pool_block", False),
+        max_retries=config.get("max_retries", 0),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSIONS: Dict[str, Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def get_shared_session(base_url: str) -> Session:
+    """
+    Get the session shared by all the requests toward the same host, so that connections are kept alive and reused
+    :param base_url: target url
+    :return: Session
+    """
+    parsed = urlparse(base_url)
+    key = f"{parsed.scheme}://{parsed.netloc}".lower()
+
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = _SESSIONS[key] = new_session(base_url)
+
+    return session
+
+
+def close_shared_sessions():
+    with _SESSIONS_LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+
+    for session in sessions:
+        session.close()
+
+
+def get_stats(host: Optional[str] = None) -> Dict[str, TransportStats]:
+    """
+    Get the connection statistics, for profiling
+    :param host: specific host, optional
+    :return: mapping of host to TransportStats
+    """
+    with _STATS_LOCK:
+        return {k: v.clone() for k, v in _STATS.items() if host is None or k == host}
+
+
+def reset_stats():
+    with _STATS_LOCK:
+        _STATS.clear()
@@ -1,10 +1,11 @@
 import logging
 
-from electrum_gui.common.basic.ticker import signals, ticker
+from electrum_gui.common.basic.ticker import scheduler, signals, ticker
 
 logger = logging.getLogger("app.ticker")
 
 _ticker = None
+_scheduler = None
 
 
 def start_default_ticker(seconds: int):
@@ -21,3 +22,27 @@ def cancel_default_ticker():
     global _ticker
     _ticker.cancel()
     _ticker = None
+
+
+def start_default_scheduler(max_workers: int, background_factor: float) -> scheduler.Scheduler:
+    global _scheduler
+    if _scheduler is not None:
+        logger.warning("start scheduler already")
+        return _scheduler
+
+    _scheduler = scheduler.Scheduler(max_workers=max_workers, background_factor=background_factor)
+    _scheduler.start()
+    return _scheduler
+
+
+def get_default_scheduler() -> scheduler.Scheduler:
+    return _scheduler
+
+
+def cancel_default_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        return
+
+    _scheduler.cancel()
+    _scheduler = None
@@ -0,0 +1,192 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from electrum_gui.common.basic.dataclass.dataclass import DataClassMixin
+
+logger = logging.getLogger("app.ticker")
+
+
+@dataclass
+class JobMetrics(DataClassMixin):
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0  # skipped as the last run is still running
+    last_time_used: float = 0
+    max_time_used: float = 0
+    last_lag: float = 0  # seconds between the scheduled time and the started time
+    max_lag: float = 0
+
+
+class _Job(object):
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], None],
+        interval: float,
+        background_interval: Optional[float],
+        jitter: float,
+    ):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.background_interval = background_interval
+        self.jitter = jitter
+        self.is_running = False
+        self.last_run_time: Optional[float] = None
+        self.next_run_time: float = 0
+        self.metrics = JobMetrics()
+
+
+class Scheduler(threading.Thread):
+    """
+    Run the registered jobs on a worker pool, each job by its own interval with jitter,
+    and never overlaps with itself, the run is skipped if the last one is still running.
+    The intervals are stretched in background, to save battery and bandwidth
+    """
+
+    def __init__(self, max_workers: int = 4, background_factor: float = 5, executor: Executor = None):
+        """
+        :param max_workers: max number of jobs running at the same time
+        :param background_factor: stretch the intervals by N times in background,
+        unless background_interval is specified by job
+        :param executor: executor to run jobs, a thread pool of max_workers by default
+        """
+        super(Scheduler, self).__init__(name="scheduler", daemon=True)
+        self.background_factor = background_factor
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scheduler")
+        self._jobs: Dict[str, _Job] = {}
+        self._is_foreground = True
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._finished = threading.Event()
+
+    def register(
+        self,
+        name: str,
+        func: Callable[[], None],
+        interval: float,
+        background_interval: float = None,
+        jitter: float = 0.1,
+        delay: float = 0,
+    ):
+        """
+        Register job, the one with the same name is replaced
+        :param name: name of job
+        :param func: function to run
+        :param interval: interval in seconds
+        :param background_interval: interval in seconds in background
+        :param jitter: ratio of interval to randomize, so that jobs do not fire together
+        :param delay: seconds to wait before the first run
+        """
+        job = _Job(name, func, interval, background_interval, jitter)
+        job.next_run_time = time.time() + delay
+
+        with self._lock:
+            self._jobs[name] = job
+
+        self._wakeup.set()
+
+    def unregister(self, name: str):
+        with self._lock:
+            self._jobs.pop(name, None)
+
+    def set_foreground(self, is_foreground: bool):
+        with self._lock:
+            if self._is_foreground == is_foreground:
+                return
+
+            self._is_foreground = is_foreground
+            now = time.time()
+            for job in self._jobs.values():
+                if not job.is_running:  # a shorter interval may make the job due at once
+                    job.next_run_time = (job.last_run_time or now) + self._next_interval(job)
+
+        logger.info(f"Switch scheduler to {'foreground' if is_foreground else 'background'}")
+        self._wakeup.set()
+
+    @property
+    def is_foreground(self) -> bool:
+        return self._is_foreground
+
+    def get_metrics(self) -> Dict[str, JobMetrics]:
+        with self._lock:
+            return {name: job.metrics.clone() for name, job in self._jobs.items()}
+
+    def _next_interval(self, job: _Job) -> float:
+        if self._is_foreground:
+            interval = job.interval
+        else:
+            interval = job.background_interval or job.interval * self.background_factor
+
+        return interval * (1 + random.uniform(-job.jitter, job.jitter))
+
+    def run_pending(self, now: float = None) -> float:
+        """
+        Submit the due jobs
+        :param now: current timestamp
+        :return: seconds until the next due job
+        """
+        now = now or time.time()
+
+        with self._lock:
+            for job in self._jobs.values():
+                if job.next_run_time > now:
+                    continue
+
+                lag = now - job.next_run_time
+                job.next_run_time = now + self._next_interval(job)
+
+                if job.is_running:
+                    job.metrics.skipped += 1
+                    logger.warning(f"Skip job as the last run is still running. job: {job.name}")
+                    continue
+
+                job.is_running = True
+                job.last_run_time = now
+                job.metrics.last_lag = lag
+                job.metrics.max_lag = max(job.metrics.max_lag, lag)
+                self._executor.submit(self._run_job, job)
+
+            next_run_time = min((job.next_run_time for job in self._jobs.values()), default=now + 60)
+
+        return max(next_run_time - now, 0)
+
+    def _run_job(self, job: _Job):
+        start_time = time.time()
+        is_failed = False
+
+        try:
+            job.func()
+        except Exception:
+            is_failed = True
+            logger.exception(f"Error in running job. job: {job.name}")
+        finally:
+            time_used = time.time() - start_time
+
+            with self._lock:
+                job.is_running = False
+                job.metrics.runs += 1
+                job.metrics.failures += int(is_failed)
+                job.metrics.last_time_used = time_used
+                job.metrics.max_time_used = max(job.metrics.max_time_used, time_used)
+
+    def run(self):
+        while not self._finished.is_set():
+            try:
+                timeout = self.run_pending()
+            except Exception:
+                logger.exception("Error in scheduling jobs")
+                timeout = 1
+
+            self._wakeup.wait(min(timeout, 60))
+            self._wakeup.clear()
+
+    def cancel(self):
+        self._finished.set()
+        self._wakeup.set()
+        self._executor.shutdown(wait=False)
@@ -1,5 +1,6 @@
 from typing import List, Optional, Tuple
 
+from electrum_gui.common.basic.functional.wraps import cache_it
 from electrum_gui.common.coin import daos, data, exceptions, loader
 from electrum_gui.common.provider import manager as provider_manager
 
@@ -37,7 +38,7 @@ def get_coin_info(coin_code: str, nullable: bool = False) -> Optional[data.CoinI
     :return: data.CoinInfo
     :raise CoinNotFound: raise if coin not found and no-nullable
     """
-    coin = loader.COINS_DICT.get(coin_code) or daos.get_coin_info(coin_code)
+    coin = loader.COINS_DICT.get(coin_code) or _load_coin_info(coin_code)
     if not coin and not nullable:
         raise exceptions.CoinNotFound(coin_code)
 
@@ -95,6 +96,11 @@ def get_coins_by_chain(chain_code: str) -> List[data.CoinInfo]:
     return coins
 
 
+@cache_it(timeout=10 * 60, cacheable=lambda coin: coin is not None)  # the coin may be added by migrations later
+def _load_coin_info(coin_code: str) -> Optional[data.CoinInfo]:
+    return daos.get_coin_info(coin_code)
+
+
 def get_related_coins(coin_code: str) -> Tuple[data.CoinInfo, data.CoinInfo, data.CoinInfo]:
     """
     Get tuple of (coin info of chain_code, coin info of coin_code, coin info of fee_coin) at the same time
@@ -142,6 +148,7 @@ def add_coin(
     else:
         daos.update_coin_info(coin_code, name=name, icon=icon)
 
+    _load_coin_info.invalidate(coin_code)
     return coin_code
 
 
@@ -222,6 +222,9 @@ CHAINS = {
     #         {
     #             "class": "Geth",
     #             "url": "https://eth1.onekey.so/rpc",
+    #             # optional, batch balance lookups go through its tryAggregate if provided,
+    #             # filled with MULTICALL3_ADDRESS by default for the chains in MULTICALL3_CHAIN_IDS
+    #             "multicall_address": "0xca11bde05977b3631167028862be2a173976ca11",
     #         },
     #     ],
     #     "prices": {
@@ -298,6 +301,22 @@ CHAINS = {
 }
 TOKENS = {}
 
+# Multicall3 is deployed at the same address on these evm chains, see https://github.com/mds1/multicall
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_CHAIN_IDS = {
+    "1",  # eth
+    "3",  # teth, ropsten
+    "4",  # rinkeby
+    "5",  # goerli
+    "42",  # kovan
+    "56",  # bsc
+    "97",  # tbsc
+    "66",  # okt
+    "65",  # tokt
+    "128",  # heco
+    "256",  # theco
+}
+
 _CONF_FILENAME = "chain_configs.dat"
 _LOCAL_FILE = os.path.join(os.path.dirname(__file__), "data", _CONF_FILENAME)
 _DATA_FILE = os.path.join(settings.DATA_DIR, "app_configs", _CONF_FILENAME)
@@ -382,6 +401,7 @@ def _load_data(refresh=False):
                 chain_settings.setdefault("qr_code_prefix", chain)
                 chain_settings.setdefault("testnet_of", None)
                 chain_settings.setdefault("explorers", [])
+                _fill_multicall_address(chain_settings)
 
                 CHAINS[chain] = chain_settings
                 # Extract price configs
@@ -396,6 +416,15 @@ def _load_data(refresh=False):
     TOKENS = {chain: tokens for chain, tokens in TOKENS.items() if chain in CHAINS}
 
 
+def _fill_multicall_address(chain_settings: dict):
+    if chain_settings["impl"] != "evm" or str(chain_settings["chain_id"]) not in MULTICALL3_CHAIN_IDS:
+        return
+
+    for client_config in chain_settings.get("clients") or ():
+        if client_config.get("class") == "Geth":
+            client_config.setdefault("multicall_address", MULTICALL3_ADDRESS)
+
+
 def list_chain_settings(refresh: bool = False) -> List[Dict]:
     _load_data(refresh=refresh)
     return list(CHAINS.values())
@@ -501,3 +530,8 @@ try:
         _FILE_MD5SUM = "Don't read config file."  # For local testing
 except AttributeError:
     pass
+
+
+def get_coingecko_id_by_coin_code(coin_code: str) -> Optional[str]:
+    _load_data()
+    return next((cgk_id for cgk_id, codes in PRICE["coingecko_mappings"].items() if coin_code in codes), None)
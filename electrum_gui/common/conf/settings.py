@@ -40,6 +40,18 @@ LOGGING = {
 DATABASE = {
     "default": {
         "name": f"{DATA_DIR}/database.sqlite",
+        "timeout": 5,  # seconds to wait for the lock held by other connections
+        "pragmas": {  # applied each time a connection is opened, in order
+            "auto_vacuum": 2,  # INCREMENTAL, must go before journal_mode, see basic.orm.database
+            "journal_mode": "wal",  # readers never block the writer, and vice versa
+            "synchronous": 1,  # NORMAL, safe enough in WAL mode
+            "cache_size": -16 * 1024,  # in KiB, 16 MiB
+            "mmap_size": 64 * 1024 * 1024,
+            "temp_store": 2,  # MEMORY
+        },
+        "vacuum_pages": 1000,  # max free pages released by each periodic optimizing, 0 means all
+        # the existing database larger than it stays non-incremental, as switching takes a full vacuum at startup
+        "vacuum_max_size": 64 * 1024 * 1024,
     },
 }
 
@@ -51,6 +63,83 @@ DB_MODULES = [
     "electrum_gui.common.wallet",
 ]
 
+REQUEST_TRANSPORT = {
+    "pool_connections": 10,  # number of per-host pools to cache in one session
+    "pool_maxsize": 10,  # max connections kept alive in each pool
+    "pool_block": False,  # block and wait when pool_maxsize is reached, instead of creating a throwaway connection
+    "max_retries": 0,
+    "keep_alive": True,
+    "hosts": {},  # overrides per host, i.e. {"api.coingecko.com": {"pool_maxsize": 4, "pool_block": True}}
+}
+
+PROVIDER_ASYNC = {
+    "max_workers": 16,  # worker threads for sending the blocking requests of clients
+    "concurrency": 8,  # default number of requests in flight in one fan-out
+}
+
+PROVIDER_HEDGING = {
+    "enabled": True,
+    # send the duplicate request after max(p95 latency of the best client, min_delay) seconds
+    "min_delay": 1,
+    "max_workers": 16,  # max requests in flight of all the hedged calls, the queued ones would wait
+}
+
+PROVIDER_CLIENT_GUARD = {
+    # by client class name, can be overridden by the "rate_limit" field of client config in conf.chains
+    "rate_limits": {
+        "Etherscan": {"qps": 5, "burst": 5},
+    },
+    "max_wait": 5,  # max seconds waiting for the rate limiter before giving up
+    "retry_after": 10,  # default seconds to pause if got 429 without Retry-After
+    "failure_threshold": 5,  # open the circuit after N consecutive failures
+    "cooldown": 60,  # half-open the circuit after N seconds
+}
+
+PROVIDER_CACHE = {
+    "enabled": True,
+    "max_size": 2048,  # max entries of the in-memory LRU cache
+    "disk_path": f"{DATA_DIR}/provider_cache.sqlite",  # on-disk tier for the immutable data, None to disable
+    "disk_ttl": 30 * 24 * 60 * 60,  # in seconds, the on-disk entries are purged by the database job once expired
+    "disk_max_rows": 100000,  # the least recently written entries beyond it are purged by the database job
+    "min_confirmations": 12,  # only cache the txs with enough confirmations
+    "ttl": {  # in seconds, for the mutable data
+        "get_best_block_number": 3,
+        "get_balance": 5,
+        "get_prices_per_unit_of_fee": 15,
+    },
+}
+
+TX_TRACKING = {
+    "block_watcher_enabled": True,  # re-check the pending txs on new blocks, instead of every minute
+    "block_watcher_interval": 5,  # seconds between polling the best block number of the chains with pending txs
+    "block_watcher_background_interval": 60,  # seconds between polling in background
+    "max_backoff_blocks": 32,  # re-check the long-pending txs after 1, 2, 4 ... up to N new blocks
+    "fallback_check_interval": 600,  # re-check the pending txs of chains without new blocks reported for N seconds
+}
+
+TOKEN_TRANSFER_INDEXER = {
+    "enabled": True,
+    "interval": 60,  # seconds between indexing
+    # scan from this block if no checkpoint of the address, None means from its first known action,
+    # or from the tip if none, e.g. the accounts just created, instead of scanning from the genesis on every device
+    "start_block": None,
+    "confirmations": 12,  # only scan the blocks with enough confirmations, to avoid reorg
+    "initial_block_range": 5000,  # blocks per eth_getLogs, halved if the node refuses, doubled if not
+    "max_block_range": 100000,
+    "max_requests": 50,  # max eth_getLogs requests of each chain per indexing, continue from checkpoint next time
+}
+
+ASSET_REFRESH = {
+    "interval": 10,  # seconds between refreshing the dirty assets
+    "batch_size": 50,  # max number of assets refreshed in one batch
+    "max_age": 10 * 60,  # seconds, the assets not refreshed for a long time are marked dirty as well
+}
+
+SCHEDULER = {
+    "max_workers": 4,  # max number of jobs running at the same time
+    "background_factor": 5,  # stretch the intervals of jobs by N times in background
+}
+
 # loading local_settings.py on project root
 try:
     from local_settings import *  # noqa
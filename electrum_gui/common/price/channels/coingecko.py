@@ -1,8 +1,10 @@
 import logging
-from typing import Iterable, List
+from typing import Iterable, List, Tuple
 
 import peewee
 
+from electrum_gui.common.basic.functional.throttle import TokenBucket
+from electrum_gui.common.basic.request.exceptions import RequestException, ResponseException
 from electrum_gui.common.basic.request.restful import RestfulRequest
 from electrum_gui.common.coin import codes
 from electrum_gui.common.coin.data import CoinInfo
@@ -14,13 +16,28 @@ logger = logging.getLogger("app.price")
 
 API_HOST = "https://api.coingecko.com"
 
+# shared by all the instances, as a new channel is created for every pricing or backfilling
+_LIMITER = TokenBucket(rate=0.5, capacity=5)  # the free plan allows about 50 calls per minute
+
 
 class Coingecko(PriceChannelInterface):
     def __init__(self):
         self.restful = RestfulRequest(API_HOST)
+        self.limiter = _LIMITER
+
+    def _get(self, path: str, **kwargs):
+        if not self.limiter.acquire(timeout=30):
+            raise RequestException("Rate limited by coingecko")
+
+        try:
+            return self.restful.get(path, **kwargs)
+        except ResponseException as e:
+            if e.is_rate_limited:
+                self.limiter.pause(e.retry_after or 60)
+            raise e
 
     def fetch_btc_to_fiats(self) -> Iterable[YieldedPrice]:
-        resp = self.restful.get("/api/v3/exchange_rates")
+        resp = self._get("/api/v3/exchange_rates")
         rates = resp.get("rates") or {}
 
         rates = ((unit, rate) for unit, rate in rates.items() if rate and rate.get("type") == "fiat")
@@ -32,7 +49,7 @@ class Coingecko(PriceChannelInterface):
             return
 
         resp = (
-            self.restful.get(
+            self._get(
                 "/api/v3/coins/markets",
                 params={
                     "ids": ",".join(cgk_ids),
@@ -56,7 +73,7 @@ class Coingecko(PriceChannelInterface):
         mapping = {i.token_address.lower(): i for i in erc20_coins}
 
         for batch_addresses in peewee.chunked(mapping.keys(), 100):
-            resp = self.restful.get(
+            resp = self._get(
                 "/api/v3/simple/token_price/ethereum",
                 params={
                     "contract_addresses": ",".join(batch_addresses),
@@ -74,6 +91,27 @@ class Coingecko(PriceChannelInterface):
             )
             yield from rates
 
+    def fetch_price_history(
+        self, coin: CoinInfo, currency: str, start_time: int, end_time: int
+    ) -> Iterable[Tuple[int, float]]:
+        """
+        Fetch the price history of coin by the range endpoint,
+        which is hourly within 90 days, and daily beyond that
+        :return: list of (timestamp in seconds, price)
+        """
+        cgk_id = chains_conf.get_coingecko_id_by_coin_code(coin.code)
+        if cgk_id:
+            path = f"/api/v3/coins/{cgk_id}/market_chart/range"
+        elif coin.token_address and coin.chain_code == codes.ETH:
+            path = f"/api/v3/coins/ethereum/contract/{coin.token_address.lower()}/market_chart/range"
+        else:
+            return
+
+        resp = self._get(path, params={"vs_currency": currency, "from": start_time, "to": end_time}) or {}
+        for timestamp_ms, price in resp.get("prices") or ():
+            if price:
+                yield int(timestamp_ms // 1000), price
+
     def pricing(self, coins: Iterable[CoinInfo]) -> Iterable[YieldedPrice]:
         try:
             yield from self.fetch_btc_to_fiats()
@@ -1,30 +1,43 @@
 import datetime
-import functools
 from decimal import Decimal
-from typing import Dict, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-from electrum_gui.common.price.data import Channel
-from electrum_gui.common.price.models import Price
+import peewee
+from peewee import EXCLUDED
 
+from electrum_gui.common.basic.orm.database import db
+from electrum_gui.common.price.data import Channel
+from electrum_gui.common.price.models import Price, PriceHistory
 
-def create_or_update(
-    coin_code: str,
-    unit: str,
-    channel: Channel,
-    price: Decimal,
-):
-    model, is_newborn = Price.get_or_create(
-        coin_code=coin_code,
-        unit=unit,
-        channel=channel,
-        defaults=dict(price=price),
-    )
 
-    if not is_newborn:
-        Price.update(
+def bulk_upsert(prices: Iterable[Tuple[str, str, Channel, Decimal]], batch_size: int = 100) -> int:
+    """
+    Create or update prices by (coin_code, unit, channel) in one transaction
+    :param prices: list of (coin_code, unit, channel, price), the last one wins if duplicated
+    :param batch_size: rows per statement
+    :return: count of rows
+    """
+    now = datetime.datetime.now()
+    rows = {
+        (coin_code, unit, channel): dict(
+            coin_code=coin_code,
+            unit=unit,
+            channel=channel,
             price=price,
-            modified_time=datetime.datetime.now(),
-        ).where(Price.id == model.id).execute()
+            created_time=now,
+            modified_time=now,
+        )
+        for coin_code, unit, channel, price in prices
+    }
+
+    with db.atomic():
+        for batch in peewee.chunked(rows.values(), batch_size):
+            Price.insert_many(batch).on_conflict(
+                conflict_target=[Price.coin_code, Price.unit, Price.channel],
+                update={Price.price: EXCLUDED.price, Price.modified_time: EXCLUDED.modified_time},
+            ).execute()
+
+    return len(rows)
 
 
 def get_last_price(
@@ -41,14 +54,49 @@ def get_last_price(
     return model.price if model else default
 
 
-def load_price_by_pairs(pairs: Set[Tuple[str, str]]) -> Dict[Tuple[str, str], Decimal]:
-    expression = [(Price.coin_code == pair[0]) & (Price.unit == pair[1]) for pair in pairs]
-    expression = functools.reduce(lambda a, b: a | b, expression)
-
+def load_all_pair_prices() -> Dict[Tuple[str, str], Decimal]:
     pair_prices = {}
-    models = Price.select().where(expression).order_by(Price.modified_time.asc())
+    models = Price.select().order_by(Price.modified_time.asc(), Price.channel.asc())
 
     for i in models:
-        pair_prices[(i.coin_code, i.unit)] = i.price
+        pair_prices[(i.coin_code, i.unit)] = i.price  # the latest one of all channels, the later channel if tie
 
     return pair_prices
+
+
+def bulk_insert_price_history(rows: Iterable[dict], batch_size: int = 100) -> int:
+    """
+    Insert the daily OHLC of prices, the existing days are kept as they were
+    :param rows: list of dict(coin_code, unit, day, open, high, low, close)
+    :param batch_size: rows per statement
+    :return: count of rows
+    """
+    rows = list(rows)
+
+    with db.atomic():
+        for batch in peewee.chunked(rows, batch_size):
+            PriceHistory.insert_many(batch).on_conflict_ignore().execute()
+
+    return len(rows)
+
+
+def get_last_day_of_price_history(coin_code: str, unit: str) -> Optional[int]:
+    return (
+        PriceHistory.select(peewee.fn.MAX(PriceHistory.day))
+        .where(PriceHistory.coin_code == coin_code, PriceHistory.unit == unit)
+        .scalar()
+    )
+
+
+def load_price_history(coin_code: str, unit: str) -> List[PriceHistory]:
+    models = (
+        PriceHistory.select()
+        .where(PriceHistory.coin_code == coin_code, PriceHistory.unit == unit)
+        .order_by(PriceHistory.day.asc())
+    )
+    return list(models)
+
+
+def query_series_of_price_history() -> Set[Tuple[str, str]]:
+    items = PriceHistory.select(PriceHistory.coin_code, PriceHistory.unit).distinct().tuples()
+    return {(coin_code, unit) for coin_code, unit in items}
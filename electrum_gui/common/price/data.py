@@ -13,3 +13,4 @@ class Channel(IntEnum):
 
 
 YieldedPrice = namedtuple("YieldedPrice", ["coin_code", "price", "unit"])
+ChannelMetrics = namedtuple("ChannelMetrics", ["time_used", "count", "error"])  # of the last pricing
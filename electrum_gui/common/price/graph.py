@@ -0,0 +1,77 @@
+import threading
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Optional, Set, Tuple
+
+from electrum_gui.common.coin import codes
+
+
+class PriceGraph(object):
+    """
+    Conversion graph of the latest prices, each price of (coin_code, unit) is an edge of both directions.
+    The best path of coin -> unit is the one with the fewest hops, via btc first if tie,
+    and only the coins priced by channels can be the intermediates, never the fiat.
+    Prices are resolved per unit by a backward BFS at the first time, then looked up from dict
+    """
+
+    MAX_HOPS = 3
+
+    def __init__(self, pair_prices: Dict[Tuple[str, str], Decimal]):
+        self._rates: Dict[str, Dict[str, Decimal]] = defaultdict(dict)  # output -> {input: rate of input/output}
+        self._coins: Set[str] = set()
+        self._prices_by_unit: Dict[str, Dict[str, Decimal]] = {}
+        self._lock = threading.Lock()
+
+        for (coin_code, unit), price in pair_prices.items():
+            coin_code, unit = coin_code.lower(), unit.lower()
+            if coin_code == unit or price <= 0:
+                continue
+
+            self._coins.add(coin_code)
+            self._rates[unit][coin_code] = Decimal(price)
+
+        for (coin_code, unit), price in pair_prices.items():
+            coin_code, unit = coin_code.lower(), unit.lower()
+            if coin_code == unit or price <= 0 or unit in self._rates[coin_code]:
+                continue  # prefer the direct price to the reversed one
+
+            self._rates[coin_code][unit] = 1 / Decimal(price)
+
+    def get_price(self, coin_code: str, unit: str) -> Optional[Decimal]:
+        coin_code, unit = coin_code.lower(), unit.lower()
+        if coin_code == unit:
+            return Decimal(1)
+
+        prices = self._prices_by_unit.get(unit)
+        if prices is None:
+            with self._lock:
+                prices = self._prices_by_unit.get(unit)
+                if prices is None:
+                    prices = self._prices_by_unit[unit] = self._resolve_prices_of_unit(unit)
+
+        return prices.get(coin_code)
+
+    def _resolve_prices_of_unit(self, unit: str) -> Dict[str, Decimal]:
+        prices = {unit: Decimal(1)}
+        frontier = [unit]
+
+        for _ in range(self.MAX_HOPS):
+            reached = {}
+
+            for output_code in sorted(frontier, key=_sort_key_of_intermediate):
+                for input_code, rate in self._rates.get(output_code, {}).items():
+                    if input_code not in prices and input_code not in reached:
+                        reached[input_code] = rate * prices[output_code]
+
+            prices.update(reached)
+            frontier = [i for i in reached if i in self._coins]  # only the coins can be the intermediates
+
+            if not frontier:
+                break
+
+        prices.pop(unit)
+        return prices
+
+
+def _sort_key_of_intermediate(code: str) -> Tuple[bool, str]:
+    return code != codes.BTC, code
@@ -1,15 +1,18 @@
+import bisect
 import logging
+import threading
+import time
+from concurrent import futures
 from decimal import Decimal
-from typing import Callable, Dict, Iterable, List, Sequence, Set, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from electrum_gui.common.basic.functional.timing import timing_logger
-from electrum_gui.common.basic.functional.wraps import cache_it
-from electrum_gui.common.basic.ticker.utils import on_interval
-from electrum_gui.common.coin import codes
 from electrum_gui.common.coin import manager as coin_manager
-from electrum_gui.common.price import daos
+from electrum_gui.common.coin.data import CoinInfo
+from electrum_gui.common.price import daos, signals
 from electrum_gui.common.price.channels import coingecko, uniswap
-from electrum_gui.common.price.data import Channel
+from electrum_gui.common.price.data import Channel, ChannelMetrics, YieldedPrice
+from electrum_gui.common.price.graph import PriceGraph
 from electrum_gui.common.price.interfaces import PriceChannelInterface
 
 logger = logging.getLogger("app.price")
@@ -29,85 +32,188 @@ def pricing(coin_codes: List[str] = None):
     if not coins:
         return
 
-    for channel_type, channel_creator in _registry.items():
-        try:
+    channels = list(_registry.items())
+    with futures.ThreadPoolExecutor(max_workers=max(len(channels), 1), thread_name_prefix="price-channel") as executor:
+        prices_of_channels = list(executor.map(lambda i: _run_channel(*i, coins), channels))
+
+    try:
+        daos.bulk_upsert(
+            [
+                (price.coin_code, price.unit, channel_type, price.price)
+                for (channel_type, _), prices in zip(channels, prices_of_channels)
+                for price in prices
+            ]
+        )
+    except Exception as e:
+        logger.exception(f"Error in saving prices. error: {e}")
+
+    _rebuild_price_graph()
+
+    try:
+        signals.prices_changed_signal.send()
+    except Exception:
+        logger.exception("Error in sending prices changed signal")
+
+
+_CHANNEL_METRICS: Dict[Channel, ChannelMetrics] = {}
+
+
+def _run_channel(
+    channel_type: Channel, channel_creator: Callable[[], PriceChannelInterface], coins: List[CoinInfo]
+) -> List[YieldedPrice]:
+    prices, error = [], None
+    start_time = time.time()
+
+    try:
+        with timing_logger(f"price_manager.pricing by {channel_type.name}"):
             channel = channel_creator()
+            prices.extend(channel.pricing(coins))  # keep the prices yielded before failure
+    except Exception as e:
+        error = repr(e)
+        logger.exception(f"Error in running channel. channel_type: {channel_type}, error: {e}")
 
-            for price in channel.pricing(coins):
-                daos.create_or_update(
-                    coin_code=price.coin_code,
-                    unit=price.unit,
-                    channel=channel_type,
-                    price=price.price,
-                )
-        except Exception as e:
-            logger.exception(f"Error in running channel. channel_type: {channel_type}, error: {e}")
+    _CHANNEL_METRICS[channel_type] = ChannelMetrics(
+        time_used=round(time.time() - start_time, 4), count=len(prices), error=error
+    )
+    return prices
 
 
-@cache_it(timeout=5 * 60)
-def get_last_price(coin_code: str, unit: str, default: Decimal = 0) -> Decimal:
-    paths = list(_generate_searching_paths(coin_code, unit))
-    pairs = _split_paths_to_pairs(paths)
-    pair_prices = daos.load_price_by_pairs(pairs)
+def get_channel_metrics() -> Dict[Channel, ChannelMetrics]:
+    return dict(_CHANNEL_METRICS)
 
-    price = 0
-    for path in paths:
-        if len(path) < 2:
-            continue
 
-        price = 1
-        for i in range(len(path) - 1):
-            input_code, output_code = path[i].lower(), path[i + 1].lower()
-            if input_code != output_code:
-                rate = pair_prices.get((input_code, output_code)) or 0
-                if rate <= 0:
-                    reversed_rate = pair_prices.get((output_code, input_code)) or 0
-                    rate = 1 / reversed_rate if reversed_rate > 0 else rate
-            else:
-                rate = 1
+_PRICE_GRAPH: Optional[PriceGraph] = None
+_PRICE_GRAPH_LOCK = threading.Lock()
 
-            price *= rate
-            if price <= 0:  # got invalid path
-                break
 
-        if price > 0:  # got price already
-            break
+def _rebuild_price_graph() -> PriceGraph:
+    global _PRICE_GRAPH
 
-    price = price if price > 0 else default
-    return Decimal(price)
+    with _PRICE_GRAPH_LOCK:
+        _PRICE_GRAPH = PriceGraph(daos.load_all_pair_prices())
+        return _PRICE_GRAPH
 
 
-def _generate_searching_paths(coin_code: str, unit: str) -> Iterable[Sequence[str]]:
-    yield coin_code, unit
+def _get_price_graph() -> PriceGraph:
+    graph = _PRICE_GRAPH
+    return graph if graph is not None else _rebuild_price_graph()
 
-    if coin_code == codes.BTC or unit == codes.BTC:
-        return
 
-    yield coin_code, codes.BTC, unit
+def get_last_price(coin_code: str, unit: str, default: Decimal = 0) -> Decimal:
+    price = _get_price_graph().get_price(coin_code, unit)
+    return price if price is not None else Decimal(default)
 
-    coin = coin_manager.get_coin_info(coin_code, nullable=True)
-    if coin and coin.chain_code not in (coin_code, unit, codes.BTC):
-        yield coin_code, coin.chain_code, unit
-        yield coin_code, coin.chain_code, codes.BTC, unit
 
+def get_last_prices(coin_codes: Iterable[str], unit: str, default: Decimal = 0) -> Dict[str, Decimal]:
+    graph = _get_price_graph()
+    prices = {}
 
-def _split_paths_to_pairs(paths: List[Sequence[str]]) -> Set[Tuple[str, str]]:
-    pairs = set()
+    for coin_code in coin_codes:
+        price = graph.get_price(coin_code, unit)
+        prices[coin_code] = price if price is not None else Decimal(default)
+
+    return prices
+
+
+_DAY_SECONDS = 24 * 60 * 60
+_TRACKED_PRICE_HISTORIES: Set[Tuple[str, str]] = set()
 
-    for path in paths:
-        if len(path) < 2:
-            continue
 
-        for i in range(len(path) - 1):
-            input_code, output_code = path[i].lower(), path[i + 1].lower()
-            if input_code != output_code:
-                pairs.add((input_code, output_code))
-                pairs.add((output_code, input_code))
+def backfill_price_history(coin_code: str, unit: str, days: int = 365, channel: coingecko.Coingecko = None) -> int:
+    """
+    Backfill the daily OHLC of the coin in unit since the last stored day, up to yesterday.
+    The stored days are never changed, today is valued by the last price instead
+    :param coin_code: coin code
+    :param unit: unit
+    :param days: how far to backfill at most
+    :param channel: coingecko channel, the only one with the range endpoint
+    :return: count of the days backfilled
+    """
+    coin_code, unit = coin_code.lower(), unit.lower()
+    today = int(time.time()) // _DAY_SECONDS * _DAY_SECONDS
 
-    return pairs
+    last_day = daos.get_last_day_of_price_history(coin_code, unit)
+    start_day = max(last_day + _DAY_SECONDS if last_day is not None else 0, today - days * _DAY_SECONDS)
+    if start_day >= today:
+        return 0
+
+    coin = coin_manager.get_coin_info(coin_code, nullable=True)
+    if coin is None:
+        return 0
+
+    channel = channel or coingecko.Coingecko()
+    ohlc = {}
+    for timestamp, price in channel.fetch_price_history(coin, unit, start_day, today - 1):
+        day, price = timestamp // _DAY_SECONDS * _DAY_SECONDS, Decimal(str(price))
+        if not start_day <= day < today:
+            continue
+
+        if day not in ohlc:
+            ohlc[day] = dict(coin_code=coin_code, unit=unit, day=day, open=price, high=price, low=price, close=price)
+        else:
+            item = ohlc[day]
+            item["high"], item["low"], item["close"] = max(item["high"], price), min(item["low"], price), price
+
+    return daos.bulk_insert_price_history(ohlc[day] for day in sorted(ohlc))
+
+
+def get_prices_at(coin_code: str, unit: str, timestamps: List[int], default: Decimal = 0) -> List[Decimal]:
+    """
+    Get the prices at timestamps, interpolated linearly by the daily close prices and the last price.
+    The series of coin in unit is tracked and backfilled by the ticker since then,
+    and the last price is used until the series is ready
+    :param coin_code: coin code
+    :param unit: unit
+    :param timestamps: list of timestamp in seconds
+    :param default: default price if not found
+    :return: list of price in the order of timestamps
+    """
+    coin_code, unit = coin_code.lower(), unit.lower()
+    _TRACKED_PRICE_HISTORIES.add((coin_code, unit))
+
+    if not timestamps:
+        return []
+
+    histories = daos.load_price_history(coin_code, unit)
+    last_price = get_last_price(coin_code, unit, default=default)
+    if not histories:
+        return [last_price for _ in timestamps]
+
+    points = [(histories[0].day, histories[0].open)]
+    points.extend((i.day + _DAY_SECONDS, i.close) for i in histories)
+    if last_price > 0:
+        points.append((max(int(time.time()), points[-1][0] + 1), last_price))
+
+    xs = [x for x, _ in points]
+    prices = []
+    for timestamp in timestamps:
+        index = bisect.bisect_right(xs, timestamp)
+        if index == 0:
+            prices.append(points[0][1])
+        elif index == len(points):
+            prices.append(points[-1][1])
+        else:
+            (x0, y0), (x1, y1) = points[index - 1], points[index]
+            prices.append(y0 + (y1 - y0) * Decimal(timestamp - x0) / Decimal(x1 - x0))
+
+    return prices
+
+
+def get_price_at(coin_code: str, unit: str, timestamp: int, default: Decimal = 0) -> Decimal:
+    return get_prices_at(coin_code, unit, [timestamp], default=default)[0]
+
+
+def _backfill_tracked_price_histories():
+    channel = coingecko.Coingecko()
+
+    for coin_code, unit in sorted(_TRACKED_PRICE_HISTORIES | daos.query_series_of_price_history()):
+        try:
+            backfill_price_history(coin_code, unit, channel=channel)
+        except Exception as e:
+            logger.exception(f"Error in backfilling price history. coin_code: {coin_code}, unit: {unit}, error: {e}")
 
 
-@on_interval(15 * 60)
 @timing_logger("price_manager.on_ticker_signal")
 def on_ticker_signal():
     pricing()
+    _backfill_tracked_price_histories()
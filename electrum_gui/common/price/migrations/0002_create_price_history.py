@@ -0,0 +1,21 @@
+import peewee
+
+from electrum_gui.common.basic.orm.models import AutoDateTimeField, BaseModel
+
+
+def update(db: peewee.Database, migrator, migrate):
+    class PriceHistory(BaseModel):
+        id = peewee.AutoField(primary_key=True)
+        coin_code = peewee.CharField()
+        unit = peewee.CharField()
+        day = peewee.IntegerField()
+        open = peewee.DecimalField()
+        high = peewee.DecimalField()
+        low = peewee.DecimalField()
+        close = peewee.DecimalField()
+        created_time = AutoDateTimeField()
+
+        class Meta:
+            indexes = ((("coin_code", "unit", "day"), True),)
+
+    db.create_tables((PriceHistory,))
@@ -21,3 +21,24 @@ class Price(BaseModel):
             f"id: {self.id}, coin_code: {self.coin_code}, "
             f"price: {self.price}, unit: {self.unit}, channel: {self.channel}"
         )
+
+
+class PriceHistory(BaseModel):
+    id = peewee.AutoField(primary_key=True)
+    coin_code = peewee.CharField()
+    unit = peewee.CharField()
+    day = peewee.IntegerField(help_text="timestamp of the start of the day in UTC")
+    open = peewee.DecimalField()
+    high = peewee.DecimalField()
+    low = peewee.DecimalField()
+    close = peewee.DecimalField()
+    created_time = AutoDateTimeField()
+
+    class Meta:
+        indexes = ((("coin_code", "unit", "day"), True),)
+
+    def __str__(self):
+        return (
+            f"id: {self.id}, coin_code: {self.coin_code}, unit: {self.unit}, day: {self.day}, "
+            f"open: {self.open}, high: {self.high}, low: {self.low}, close: {self.close}"
+        )
@@ -0,0 +1,3 @@
+from electrum_gui.common.basic.functional.signal import Signal
+
+prices_changed_signal = Signal("prices_changed")  # send() once the prices of a pricing run are saved
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+from electrum_gui.common.conf import settings
+from electrum_gui.common.provider import data
+from electrum_gui.common.provider.interfaces import (
+    AsyncClientInterface,
+    BatchGetAddressMixin,
+    ClientInterface,
+    SearchTransactionMixin,
+)
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=settings.PROVIDER_ASYNC["max_workers"],
+                    thread_name_prefix="provider-async",
+                )
+
+    return _EXECUTOR
+
+
+async def run_in_executor(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run the blocking func in the shared worker threads of provider
+    :param func: blocking callable
+    :return: result of func
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), partial(func, *args, **kwargs))
+
+
+async def gather_with_concurrency(
+    coroutines: Iterable[Awaitable],
+    concurrency: Optional[int] = None,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    Like asyncio.gather, but at most {concurrency} coroutines are running at the same time
+    :param coroutines: coroutines
+    :param concurrency: default to settings.PROVIDER_ASYNC["concurrency"]
+    :param return_exceptions: same as the one of asyncio.gather
+    :return: results in the order of coroutines
+    """
+    semaphore = asyncio.Semaphore(concurrency or settings.PROVIDER_ASYNC["concurrency"])
+
+    async def _run(coroutine: Awaitable):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(_run(i) for i in coroutines), return_exceptions=return_exceptions)
+
+
+class AsyncClientAdapter(AsyncClientInterface):
+    """
+    Adapting the blocking ClientInterface to AsyncClientInterface,
+    requests are sent by the shared worker threads, so that the event loop won't be blocked
+    """
+
+    def __init__(self, client: ClientInterface):
+        self.client = client
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} of {self.client!r}>"
+
+    async def get_info(self) -> data.ClientInfo:
+        return await run_in_executor(self.client.get_info)
+
+    async def get_address(self, address: str) -> data.Address:
+        return await run_in_executor(self.client.get_address, address)
+
+    async def get_balance(self, address: str, token_address: Optional[str] = None) -> int:
+        return await run_in_executor(self.client.get_balance, address, token_address=token_address)
+
+    async def batch_get_address(self, addresses: List[str]) -> List[data.Address]:
+        if isinstance(self.client, BatchGetAddressMixin):
+            return await run_in_executor(self.client.batch_get_address, addresses)
+        else:
+            return await super(AsyncClientAdapter, self).batch_get_address(addresses)
+
+    async def get_transaction_by_txid(self, txid: str) -> data.Transaction:
+        return await run_in_executor(self.client.get_transaction_by_txid, txid)
+
+    async def get_transaction_status(self, txid: str) -> data.TransactionStatus:
+        return await run_in_executor(self.client.get_transaction_status, txid)
+
+    async def search_txs_by_address(
+        self,
+        address: str,
+        paginate: Optional[data.TxPaginate] = None,
+    ) -> List[data.Transaction]:
+        if isinstance(self.client, SearchTransactionMixin):
+            return await run_in_executor(self.client.search_txs_by_address, address, paginate=paginate)
+        else:
+            return []
+
+    async def broadcast_transaction(self, raw_tx: str) -> data.TxBroadcastReceipt:
+        return await run_in_executor(self.client.broadcast_transaction, raw_tx)
+
+    async def get_prices_per_unit_of_fee(self) -> data.PricesPerUnit:
+        return await run_in_executor(self.client.get_prices_per_unit_of_fee)
@@ -0,0 +1,95 @@
+import logging
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from electrum_gui.common.basic.functional.signal import Signal
+from electrum_gui.common.basic.ticker.scheduler import Scheduler
+from electrum_gui.common.provider import provider_manager
+
+logger = logging.getLogger("app.chain")
+
+new_block_signal = Signal("new_block")  # send(chain_code=..., block_number=...) once the tip of chain advanced
+
+
+class BlockWatcher(object):
+    """
+    Watch the tip of the chains returned by get_chain_codes, and send new_block_signal once it advanced.
+    None of the current clients is able to subscribe to the new heads,
+    so the best block number is polled instead, which is cheap and cached for a few seconds by the provider manager
+    """
+
+    def __init__(self, get_chain_codes: Callable[[], Iterable[str]], signal: Signal = new_block_signal):
+        self._get_chain_codes = get_chain_codes
+        self._signal = signal
+        self._best_block_numbers: Dict[str, int] = {}
+        self.last_new_block_times: Dict[str, float] = {}  # chain_code -> the time the tip advanced last
+
+    def poll(self):
+        try:
+            chain_codes = set(self._get_chain_codes())
+        except Exception:
+            logger.exception("Error in getting the chain codes to watch")
+            return
+
+        for chain_code in set(self._best_block_numbers) - chain_codes:
+            self._best_block_numbers.pop(chain_code)
+            self.last_new_block_times.pop(chain_code, None)
+
+        for chain_code in sorted(chain_codes):
+            try:
+                block_number = provider_manager.get_best_block_number(chain_code)
+            except Exception as e:
+                logger.warning(f"Error in getting best block number. chain_code: {chain_code}, error: {repr(e)}")
+                continue
+
+            if block_number <= self._best_block_numbers.get(chain_code, -1):
+                continue
+
+            self._best_block_numbers[chain_code] = block_number
+            self.last_new_block_times[chain_code] = time.time()
+
+            try:
+                self._signal.send(chain_code=chain_code, block_number=block_number)
+            except Exception:
+                logger.exception(f"Error in sending signal. chain_code: {chain_code}, block_number: {block_number}")
+
+
+_JOB_NAME = "block_watcher"
+_scheduler: Optional[Scheduler] = None
+_watcher: Optional[BlockWatcher] = None
+
+
+def start_block_watcher(
+    scheduler: Scheduler, interval: float, background_interval: float, get_chain_codes: Callable[[], Iterable[str]]
+):
+    global _scheduler, _watcher
+    if _scheduler is not None:
+        logger.warning("start block watcher already")
+        return
+
+    _scheduler = scheduler
+    _watcher = BlockWatcher(get_chain_codes)
+    _scheduler.register(_JOB_NAME, _watcher.poll, interval, background_interval=background_interval)
+
+
+def cancel_block_watcher():
+    global _scheduler, _watcher
+    if _scheduler is None:
+        return
+
+    _scheduler.unregister(_JOB_NAME)
+    _scheduler = None
+    _watcher = None
+
+
+def is_watching() -> bool:
+    return _scheduler is not None
+
+
+def get_last_new_block_time(chain_code: str) -> Optional[float]:
+    """
+    Get the time the tip of chain advanced last
+    :return: None if not watching, or no new block of the chain reported yet
+    """
+    watcher = _watcher
+    return watcher.last_new_block_times.get(chain_code) if watcher is not None else None
@@ -0,0 +1,158 @@
+import functools
+import inspect
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional
+
+from electrum_gui.common.basic.cache.interfaces import MISSING
+from electrum_gui.common.basic.cache.memory import CacheStats, MemoryCache
+from electrum_gui.common.basic.cache.sqlite import SqliteCache
+from electrum_gui.common.conf import settings
+
+logger = logging.getLogger("app.chain")
+
+
+class ResponseCache(object):
+    """
+    Two tiers cache of the responses of provider, the in-memory LRU one and the optional on-disk one
+    """
+
+    def __init__(self, memory: MemoryCache, disk: Optional[SqliteCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self._stats = defaultdict(CacheStats)
+        self._lock = threading.Lock()
+
+    def _record(self, method: str, is_hit: bool):
+        with self._lock:
+            stats = self._stats[method]
+            if is_hit:
+                stats.hits += 1
+            else:
+                stats.misses += 1
+
+    def get(self, key: tuple, persist: bool = False) -> Any:
+        value = self.memory.get(key)
+
+        if value is MISSING and persist and self.disk is not None:
+            try:
+                value = self.disk.get(key)
+            except Exception as e:
+                logger.warning(f"Error in reading disk cache. key: {key}, error: {e}")
+                value = MISSING
+
+            if value is not MISSING:
+                self.memory.set(key, value)
+
+        self._record(key[1], value is not MISSING)
+        return value
+
+    def set(self, key: tuple, value: Any, ttl: Optional[float] = None, persist: bool = False):
+        self.memory.set(key, value, ttl=ttl)
+
+        if persist and self.disk is not None:
+            try:
+                self.disk.set(key, value, ttl=ttl)
+            except Exception as e:
+                logger.warning(f"Error in writing disk cache. key: {key}, error: {e}")
+
+    def delete(self, key: tuple):
+        self.memory.delete(key)
+
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self):
+        self.memory.clear()
+
+        if self.disk is not None:
+            self.disk.clear()
+
+        with self._lock:
+            self._stats.clear()
+
+    def purge(self):
+        self.memory.purge_expired()
+
+        if self.disk is not None:
+            self.disk.purge_expired()
+            self.disk.trim()
+
+    def get_stats(self) -> Dict[str, CacheStats]:
+        with self._lock:
+            return {method: stats.clone() for method, stats in self._stats.items()}
+
+
+_RESPONSE_CACHE = None
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _RESPONSE_CACHE
+
+    if _RESPONSE_CACHE is None:
+        with _RESPONSE_CACHE_LOCK:
+            if _RESPONSE_CACHE is None:
+                config = settings.PROVIDER_CACHE
+                disk = None
+                if config.get("disk_path"):
+                    disk = SqliteCache(
+                        config["disk_path"], ttl=config.get("disk_ttl"), max_rows=config.get("disk_max_rows")
+                    )
+
+                _RESPONSE_CACHE = ResponseCache(MemoryCache(max_size=config["max_size"]), disk)
+
+    return _RESPONSE_CACHE
+
+
+def on_ticker_signal():
+    if _RESPONSE_CACHE is None:  # nothing to purge if never used
+        return
+
+    try:
+        _RESPONSE_CACHE.purge()
+    except Exception as e:
+        logger.exception(f"Error in purging response cache. error: {e}")
+
+
+def make_key(chain_code: str, method: str, args: tuple = (), kwargs: dict = None) -> tuple:
+    return chain_code, method, tuple(args), tuple(sorted((kwargs or {}).items()))
+
+
+def cached(persist: bool = False, cacheable: Callable[[str, Any], bool] = None):
+    """
+    Cache the result of provider manager function by (chain_code, method, args),
+    the ttl of each method is configured by settings.PROVIDER_CACHE["ttl"], never expired if not configured
+    :param persist: cache it on disk as well, only for the immutable data
+    :param cacheable: decide whether the result can be cached by (chain_code, result), i.e. only the confirmed txs
+    """
+
+    def wrapper(fn):
+        method = fn.__name__
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def inner(chain_code: str, *args, **kwargs):
+            config = settings.PROVIDER_CACHE
+            if not config["enabled"]:
+                return fn(chain_code, *args, **kwargs)
+
+            # the same call gets the same key, whether the arguments are passed by position, keyword or default
+            bound = signature.bind(chain_code, *args, **kwargs)
+            bound.apply_defaults()
+
+            response_cache = get_response_cache()
+            key = make_key(chain_code, method, bound.args[1:], bound.kwargs)
+            value = response_cache.get(key, persist=persist)
+
+            if value is MISSING:
+                value = fn(chain_code, *args, **kwargs)
+                if cacheable is None or cacheable(chain_code, value):
+                    response_cache.set(key, value, ttl=config["ttl"].get(method), persist=persist)
+
+            return value
+
+        return inner
+
+    return wrapper
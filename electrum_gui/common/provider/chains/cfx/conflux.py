@@ -38,8 +38,8 @@ from electrum_gui.common.provider.interfaces import BatchGetAddressMixin, Client
 class CFXClient(ClientInterface, BatchGetAddressMixin):
     EpochTag = consts.LATEST_STATE
 
-    def __init__(self, url: str):
-        self.rpc = JsonRPCRequest(url)
+    def __init__(self, url: str, coalesce_window: float = 0.005):
+        self.rpc = JsonRPCRequest(url, coalesce_window=coalesce_window)
 
     def get_info(self) -> ClientInfo:
         the_latest_block = self.rpc.call("cfx_getBlockByEpochNumber", params=[self.EpochTag, False])
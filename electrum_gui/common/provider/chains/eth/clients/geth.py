@@ -1,12 +1,17 @@
 import functools
+import itertools
 import time
 from typing import Any, List, Optional, Tuple, Union
 
+import eth_abi
 import eth_utils
 
+from electrum_gui.common.basic.cache.interfaces import MISSING
 from electrum_gui.common.basic.functional.require import require
 from electrum_gui.common.basic.request.exceptions import JsonRPCException
 from electrum_gui.common.basic.request.json_rpc import JsonRPCRequest
+from electrum_gui.common.conf import settings
+from electrum_gui.common.provider.cache import get_response_cache
 from electrum_gui.common.provider.chains.eth.clients import utils
 from electrum_gui.common.provider.data import (
     Address,
@@ -14,6 +19,7 @@ from electrum_gui.common.provider.data import (
     ClientInfo,
     EstimatedTimeOnPrice,
     PricesPerUnit,
+    TokenTransferLog,
     Transaction,
     TransactionFee,
     TransactionInput,
@@ -22,8 +28,14 @@ from electrum_gui.common.provider.data import (
     TxBroadcastReceipt,
     TxBroadcastReceiptCode,
 )
-from electrum_gui.common.provider.exceptions import FailedToGetGasPrices, TransactionNotFound
-from electrum_gui.common.provider.interfaces import BatchGetAddressMixin, ClientInterface
+from electrum_gui.common.provider.exceptions import FailedToGetGasPrices, TooManyTransferLogs, TransactionNotFound
+from electrum_gui.common.provider.interfaces import (
+    BatchGetAddressMixin,
+    BatchGetBalanceMixin,
+    BatchGetTransactionMixin,
+    ClientInterface,
+    SearchTokenTransferLogMixin,
+)
 
 _hex2int = functools.partial(int, base=16)
 
@@ -42,11 +54,25 @@ class InvalidContractAddress(ValueError):
         super(InvalidContractAddress, self).__init__(f"Invalid contract address {address}.")
 
 
-class Geth(ClientInterface, BatchGetAddressMixin):
+class Geth(
+    ClientInterface,
+    BatchGetAddressMixin,
+    BatchGetBalanceMixin,
+    BatchGetTransactionMixin,
+    SearchTokenTransferLogMixin,
+):
     __LAST_BLOCK__ = "latest"
-
-    def __init__(self, url: str):
-        self.rpc = JsonRPCRequest(url)
+    __BATCH_BALANCE_CHUNK_SIZE__ = 100
+    __BATCH_TX_CHUNK_SIZE__ = 50
+    # >>> eth_utils.keccak("Transfer(address,address,uint256)".encode()).hex()
+    __TRANSFER_TOPIC__ = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+    # Only the known rejections of the wide ranges, not to take the rate limit or the quota errors as them
+    __TOO_MANY_LOGS_HINTS__ = ("query returned more than", "block range is too wide", "log response size exceeded")
+    __TOO_MANY_LOGS_ERROR_CODE__ = -32005
+
+    def __init__(self, url: str, coalesce_window: float = 0.005, multicall_address: Optional[str] = None):
+        self.rpc = JsonRPCRequest(url, coalesce_window=coalesce_window)
+        self.multicall_address = multicall_address
 
     def get_info(self) -> ClientInfo:
         the_latest_block = self.rpc.call("eth_getBlockByNumber", params=["latest", False])
@@ -103,6 +129,77 @@ class Geth(ClientInterface, BatchGetAddressMixin):
             except ValueError:
                 return 0
 
+    def batch_get_balance(self, pairs: List[Tuple[str, Optional[str]]]) -> List[Optional[int]]:
+        chunk_size = self.__BATCH_BALANCE_CHUNK_SIZE__
+        balances = []
+
+        for index in range(0, len(pairs), chunk_size):
+            chunk = pairs[index : index + chunk_size]
+
+            chunk_balances = None
+            if self.multicall_address:
+                try:
+                    chunk_balances = self._batch_get_balance_by_multicall(chunk)
+                except (JsonRPCException, ValueError, TypeError):
+                    chunk_balances = None  # Fallback to json rpc batch calls
+
+            if chunk_balances is None:
+                chunk_balances = self._batch_get_balance_by_rpc_batch(chunk)
+
+            balances.extend(chunk_balances)
+
+        return balances
+
+    def _batch_get_balance_by_multicall(self, pairs: List[Tuple[str, Optional[str]]]) -> List[Optional[int]]:
+        # >>> eth_utils.keccak("getEthBalance(address)".encode())[:4].hex()
+        # '4d2301cc'
+        # >>> eth_utils.keccak("balanceOf(address)".encode())[:4].hex()
+        # '70a08231'
+        # >>> eth_utils.keccak("tryAggregate(bool,(address,bytes)[])".encode())[:4].hex()
+        # 'bce38bd7'
+        multicall_address = eth_utils.to_canonical_address(self.multicall_address)
+        calls = [
+            (
+                eth_utils.to_canonical_address(token_address) if token_address else multicall_address,
+                (bytes.fromhex("70a08231") if token_address else bytes.fromhex("4d2301cc"))
+                + eth_abi.encode_single("address", eth_utils.to_canonical_address(address)),
+            )
+            for address, token_address in pairs
+        ]
+        call_data = "0xbce38bd7" + eth_abi.encode_abi(["bool", "(address,bytes)[]"], [False, calls]).hex()
+        resp = self.eth_call({"to": self.multicall_address, "data": call_data})
+        results = eth_abi.decode_single("(bool,bytes)[]", bytes.fromhex(eth_utils.remove_0x_prefix(resp)))
+        require(len(results) == len(pairs), ValueError(f"Expect {len(pairs)} results, but got {len(results)}"))
+
+        return [int.from_bytes(data[:32], "big") if is_success else None for is_success, data in results]
+
+    def _batch_get_balance_by_rpc_batch(self, pairs: List[Tuple[str, Optional[str]]]) -> List[Optional[int]]:
+        calls = [
+            (
+                (
+                    "eth_call",
+                    [{"to": token_address, "data": "0x70a08231" + address[2:].rjust(64, "0")}, self.__LAST_BLOCK__],
+                )
+                if token_address
+                else ("eth_getBalance", [address, self.__LAST_BLOCK__])
+            )
+            for address, token_address in pairs
+        ]
+
+        try:
+            results = self.rpc.batch_call(calls, ignore_errors=True, timeout=10)
+        except JsonRPCException:
+            return [None] * len(pairs)
+
+        balances = []
+        for result in results:
+            try:
+                balances.append(_hex2int(result[:66]) if result is not None else None)
+            except ValueError:
+                balances.append(0)  # Same as get_balance
+
+        return balances
+
     def eth_call(self, call_data: dict) -> Any:
         return self.rpc.call("eth_call", [call_data, self.__LAST_BLOCK__])
 
@@ -118,8 +215,86 @@ class Geth(ClientInterface, BatchGetAddressMixin):
         else:
             require(txid == tx.get("hash"))
 
+        block_info = self.rpc.call("eth_getBlockByNumber", [receipt["blockNumber"], False]) if receipt else None
+        return self._build_transaction(txid, tx, receipt, block_info)
+
+    def batch_get_transaction_by_txid(self, txids: List[str]) -> List[Optional[Transaction]]:
+        txs_and_receipts = []
+        for i in range(0, len(txids), self.__BATCH_TX_CHUNK_SIZE__):
+            _call_body = []
+            for txid in txids[i : i + self.__BATCH_TX_CHUNK_SIZE__]:
+                _call_body.extend(
+                    [
+                        ("eth_getTransactionByHash", [txid]),
+                        ("eth_getTransactionReceipt", [txid]),
+                    ]
+                )
+
+            resp = self.rpc.batch_call(_call_body, ignore_errors=True)
+            txs_and_receipts.extend(zip(resp[::2], resp[1::2]))
+
+        block_numbers = sorted({receipt["blockNumber"] for _, receipt in txs_and_receipts if receipt})
+        blocks = {}
+        for i in range(0, len(block_numbers), self.__BATCH_TX_CHUNK_SIZE__):
+            chunk = block_numbers[i : i + self.__BATCH_TX_CHUNK_SIZE__]
+            resp = self.rpc.batch_call([("eth_getBlockByNumber", [j, False]) for j in chunk], ignore_errors=True)
+            blocks.update(zip(chunk, resp))
+
+        transactions = []
+        for txid, (tx, receipt) in zip(txids, txs_and_receipts):
+            block_info = blocks.get(receipt["blockNumber"]) if receipt else None
+            if not tx or txid != tx.get("hash") or (receipt and not block_info):
+                transactions.append(None)
+            else:
+                transactions.append(self._build_transaction(txid, tx, receipt, block_info))
+
+        return transactions
+
+    def search_token_transfer_logs(
+        self, addresses: List[str], from_block: int, to_block: int
+    ) -> List[TokenTransferLog]:
+        topic_of_addresses = ["0x" + "0" * 24 + i[2:].lower() for i in addresses]
+        log_filter = {"fromBlock": hex(from_block), "toBlock": hex(to_block)}
+
+        try:
+            logs_of_sender, logs_of_receiver = self.rpc.batch_call(
+                [
+                    ("eth_getLogs", [{**log_filter, "topics": [self.__TRANSFER_TOPIC__, topic_of_addresses]}]),
+                    ("eth_getLogs", [{**log_filter, "topics": [self.__TRANSFER_TOPIC__, None, topic_of_addresses]}]),
+                ],
+                timeout=30,
+            )
+        except JsonRPCException as e:
+            error = e.json_response.get("error") if isinstance(e.json_response, dict) else None
+            if (isinstance(error, dict) and error.get("code") == self.__TOO_MANY_LOGS_ERROR_CODE__) or any(
+                i in e.message.lower() for i in self.__TOO_MANY_LOGS_HINTS__
+            ):
+                raise TooManyTransferLogs(from_block, to_block)
+
+            raise e
+
+        logs = {}
+        for log in itertools.chain(logs_of_sender or (), logs_of_receiver or ()):
+            topics = log.get("topics") or ()
+            if len(topics) != 3 or log.get("removed") or not log.get("data"):  # ERC721 has 4 topics
+                continue
+
+            block_number, log_index = _hex2int(log["blockNumber"]), _hex2int(log["logIndex"])
+            logs[(block_number, log_index)] = TokenTransferLog(
+                txid=log["transactionHash"],
+                block_number=block_number,
+                log_index=log_index,
+                token_address=log["address"].lower(),
+                from_address="0x" + topics[1][-40:].lower(),
+                to_address="0x" + topics[2][-40:].lower(),
+                value=_hex2int(log["data"][:66]),
+            )
+
+        return [logs[i] for i in sorted(logs)]
+
+    @staticmethod
+    def _build_transaction(txid: str, tx: dict, receipt: Optional[dict], block_info: Optional[dict]) -> Transaction:
         if receipt:
-            block_info = self.rpc.call("eth_getBlockByNumber", [receipt["blockNumber"], False])
             block_header = BlockHeader(
                 block_hash=block_info["hash"],
                 block_number=_hex2int(block_info["number"]),
@@ -199,8 +374,18 @@ class Geth(ClientInterface, BatchGetAddressMixin):
         return _hex2int(resp)
 
     def get_contract_code(self, address: str) -> str:
-        resp = self.rpc.call("eth_getCode", params=[address, self.__LAST_BLOCK__])
-        return eth_utils.remove_0x_prefix(resp)
+        # The code of a deployed contract never changes, but an empty one may be deployed later
+        key = (self.rpc.inner.base_url, "get_contract_code", (address,), ())
+        response_cache = get_response_cache() if settings.PROVIDER_CACHE["enabled"] else None
+        code = response_cache.get(key, persist=True) if response_cache is not None else MISSING
+
+        if code is MISSING:
+            resp = self.rpc.call("eth_getCode", params=[address, self.__LAST_BLOCK__])
+            code = eth_utils.remove_0x_prefix(resp)
+            if code and response_cache is not None:
+                response_cache.set(key, code, persist=True)
+
+        return code
 
     @functools.lru_cache
     def is_contract(self, address: str) -> bool:
@@ -35,6 +35,19 @@ class ClientInfo(DataClassMixin):
     desc: str = ""
 
 
+@dataclass
+class ClientStats(DataClassMixin):
+    name: str
+    is_ready: bool = False
+    calls: int = 0
+    errors: int = 0
+    error_rate: float = 0  # EWMA of errors
+    latency: float = 0  # EWMA of latency in seconds
+    p95_latency: float = 0  # p95 of the recent latencies in seconds
+    circuit_state: str = "closed"
+    is_throttled: bool = False
+
+
 @dataclass
 class BlockHeader(DataClassMixin):
     block_hash: str
@@ -127,6 +140,17 @@ class Transaction(DataClassMixin):
             return 0
 
 
+@dataclass
+class TokenTransferLog(DataClassMixin):
+    txid: str
+    block_number: int
+    log_index: int
+    token_address: str
+    from_address: str
+    to_address: str
+    value: int
+
+
 @dataclass
 class TxPaginate(DataClassMixin):
     start_block_number: int = None
@@ -16,6 +16,21 @@ class NoAvailableClient(Exception):
         )
 
 
+class ClientRateLimited(IOError):
+    def __init__(self, client_name: str):
+        super(ClientRateLimited, self).__init__(f"client: {client_name}")
+
+
+class ClientCircuitOpen(IOError):
+    def __init__(self, client_name: str):
+        super(ClientCircuitOpen, self).__init__(f"client: {client_name}")
+
+
+class TooManyTransferLogs(IOError):
+    def __init__(self, from_block: int, to_block: int):
+        super(TooManyTransferLogs, self).__init__(f"from_block: {from_block}, to_block: {to_block}")
+
+
 class ProviderClassNotFound(Exception):
     def __init__(self, chain_code: str, path: str):
         super(ProviderClassNotFound, self).__init__(f"chain_code: {repr(chain_code)}, path: {path}")
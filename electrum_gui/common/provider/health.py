@@ -0,0 +1,175 @@
+import functools
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+from electrum_gui.common.basic.functional.throttle import CircuitBreaker, TokenBucket
+from electrum_gui.common.basic.request.exceptions import JsonRPCException, RequestException, ResponseException
+from electrum_gui.common.conf import settings
+from electrum_gui.common.provider import data, exceptions, interfaces
+
+_INSTRUMENTED_INTERFACES = (
+    interfaces.ClientInterface,
+    interfaces.BatchGetAddressMixin,
+    interfaces.BatchGetBalanceMixin,
+    interfaces.BatchGetTransactionMixin,
+    interfaces.SearchTransactionMixin,
+    interfaces.SearchUTXOMixin,
+)
+_LOCAL = threading.local()
+
+
+class ClientHealth(object):
+    """
+    Rolling statistics of the calls to a client
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limiter: Optional[TokenBucket] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        alpha: float = 0.2,
+        window_size: int = 100,
+    ):
+        self.name = name
+        self.limiter = limiter or TokenBucket()
+        self.breaker = breaker or CircuitBreaker(
+            failure_threshold=settings.PROVIDER_CLIENT_GUARD["failure_threshold"],
+            cooldown=settings.PROVIDER_CLIENT_GUARD["cooldown"],
+        )
+        self.alpha = alpha
+        self.calls = 0
+        self.errors = 0
+        self.error_rate = 0.0
+        self.latency = None
+        self.latencies = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def record(self, time_used: float, is_success: bool, is_throttled: bool = False):
+        if is_success:
+            self.breaker.record_success()
+        elif is_throttled:  # the server is alive if it asks us to slow down
+            self.breaker.release()
+        else:
+            self.breaker.record_failure()
+
+        with self._lock:
+            self.calls += 1
+            self.errors += 0 if is_success else 1
+            self.error_rate = self.alpha * (0 if is_success else 1) + (1 - self.alpha) * self.error_rate
+
+            if is_success:
+                self.latency = (
+                    time_used if self.latency is None else self.alpha * time_used + (1 - self.alpha) * self.latency
+                )
+                self.latencies.append(time_used)
+
+    @property
+    def p95_latency(self) -> float:
+        with self._lock:
+            latencies = sorted(self.latencies)
+
+        return latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] if latencies else 0
+
+    @property
+    def is_available(self) -> bool:
+        return self.breaker.allow_request()
+
+    @property
+    def score(self) -> float:
+        """
+        The lower the better, an error is considered as a 10x slower call
+        """
+        return (self.latency or 0) * (1 + 9 * self.error_rate) + self.error_rate
+
+    def to_stats(self, is_ready: bool = False) -> data.ClientStats:
+        return data.ClientStats(
+            name=self.name,
+            is_ready=is_ready,
+            calls=self.calls,
+            errors=self.errors,
+            error_rate=self.error_rate,
+            latency=self.latency or 0,
+            p95_latency=self.p95_latency,
+            circuit_state=self.breaker.state.value,
+            is_throttled=self.limiter.is_paused,
+        )
+
+
+def _is_server_failure(error: IOError) -> bool:
+    """
+    Only the transport errors and the 5xx responses mean the server is unhealthy,
+    but not the errors of application, i.e. the reverted call or the nonce too low
+    """
+    if isinstance(error, ResponseException):
+        status_code = getattr(error.response, "status_code", None)
+        return status_code is None or status_code >= 500 or 200 <= status_code < 300  # 2xx means a broken body
+    elif isinstance(error, RequestException):
+        return True
+    elif isinstance(error, JsonRPCException):
+        cause = error.__cause__ or error.__context__  # the transport error is wrapped by the json rpc request
+        return isinstance(cause, IOError) and _is_server_failure(cause)
+    else:
+        return False
+
+
+def _get_rate_limited_error(error: IOError) -> Optional[ResponseException]:
+    if isinstance(error, ResponseException):
+        return error if error.is_rate_limited else None
+    elif isinstance(error, JsonRPCException):
+        cause = error.__cause__ or error.__context__  # the 429 response is wrapped by the json rpc request
+        return _get_rate_limited_error(cause) if isinstance(cause, IOError) else None
+    else:
+        return None
+
+
+def _measure(health: ClientHealth, func: Callable) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        if getattr(_LOCAL, "measuring", False):  # only the outermost call is measured
+            return func(*args, **kwargs)
+
+        if not health.breaker.acquire():
+            raise exceptions.ClientCircuitOpen(health.name)
+        if not health.limiter.acquire(timeout=settings.PROVIDER_CLIENT_GUARD["max_wait"]):
+            health.breaker.release()
+            raise exceptions.ClientRateLimited(health.name)
+
+        _LOCAL.measuring = True
+        start_time = time.time()
+        is_success, is_throttled = True, False
+        try:
+            return func(*args, **kwargs)
+        except IOError as e:
+            rate_limited_error = _get_rate_limited_error(e)
+            if rate_limited_error is not None:
+                is_success, is_throttled = False, True
+                health.limiter.pause(rate_limited_error.retry_after or settings.PROVIDER_CLIENT_GUARD["retry_after"])
+            elif _is_server_failure(e):
+                is_success = False
+            raise
+        finally:
+            _LOCAL.measuring = False
+            health.record(time.time() - start_time, is_success, is_throttled=is_throttled)
+
+    return wrapper
+
+
+def instrument_client(client: Any, health: ClientHealth):
+    """
+    Replace the interface methods of the client instance with the measured ones
+    :param client: instance of ClientInterface
+    :param health: where the statistics are recorded
+    """
+    names = {
+        name
+        for interface in _INSTRUMENTED_INTERFACES
+        if isinstance(client, interface)
+        for name, attr in vars(interface).items()
+        if not name.startswith("_") and callable(attr)
+    }
+
+    for name in names:
+        setattr(client, name, _measure(health, getattr(client, name)))
@@ -1,4 +1,5 @@
 import abc
+import asyncio
 from typing import Callable, Dict, List, Optional, Tuple
 
 from electrum_gui.common.basic import bip44
@@ -95,6 +96,26 @@ class BatchGetAddressMixin(abc.ABC):
         """
 
 
+class BatchGetBalanceMixin(abc.ABC):
+    @abc.abstractmethod
+    def batch_get_balance(self, pairs: List[Tuple[str, Optional[str]]]) -> List[Optional[int]]:
+        """
+        Batch to get balances
+        :param pairs: List[(address, token_address)], token_address is None for the main coin
+        :return: balances in the order of pairs, None if failed to get the balance of the pair
+        """
+
+
+class BatchGetTransactionMixin(abc.ABC):
+    @abc.abstractmethod
+    def batch_get_transaction_by_txid(self, txids: List[str]) -> List[Optional[data.Transaction]]:
+        """
+        Batch to get transactions by txids
+        :param txids: List[txid]
+        :return: transactions in the order of txids, None if not found
+        """
+
+
 class SearchTransactionMixin(abc.ABC):
     def search_txs_by_address(
         self,
@@ -127,6 +148,21 @@ class SearchTransactionMixin(abc.ABC):
         return txids
 
 
+class SearchTokenTransferLogMixin(abc.ABC):
+    @abc.abstractmethod
+    def search_token_transfer_logs(
+        self, addresses: List[str], from_block: int, to_block: int
+    ) -> List[data.TokenTransferLog]:
+        """
+        Search the token transfer logs from or to the addresses within the block range
+        :param addresses: List[address]
+        :param from_block: from block number, inclusive
+        :param to_block: to block number, inclusive
+        :return: logs in the order of (block_number, log_index)
+        :raise TooManyTransferLogs: if the range is too wide for the node to respond
+        """
+
+
 class SearchUTXOMixin(abc.ABC):
     @abc.abstractmethod
     def search_utxos_by_address(self, address: str) -> List[data.UTXO]:
@@ -138,6 +174,99 @@ class SearchUTXOMixin(abc.ABC):
         """
 
 
+class AsyncClientInterface(abc.ABC):
+    """
+    Asyncio counterpart of ClientInterface
+    """
+
+    @abc.abstractmethod
+    async def get_info(self) -> data.ClientInfo:
+        """
+        Get information of client
+        :return: ClientInfo
+        """
+
+    async def is_ready(self) -> bool:
+        """
+        Is client ready?
+        :return: ready or not
+        """
+        return (await self.get_info()).is_ready
+
+    @abc.abstractmethod
+    async def get_address(self, address: str) -> data.Address:
+        """
+        Get address information by address str
+        :param address: address
+        :return: Address
+        """
+
+    async def get_balance(self, address: str, token_address: Optional[str] = None) -> int:
+        """
+        get address balance
+        :param token_address:
+        :param address: address
+        :return: balance
+        """
+        return (await self.get_address(address)).balance
+
+    async def batch_get_address(self, addresses: List[str]) -> List[data.Address]:
+        """
+        Batch to get address information by address str list
+        :param addresses: List[address]
+        :return: List[Address]
+        """
+        return list(await asyncio.gather(*(self.get_address(i) for i in addresses)))
+
+    @abc.abstractmethod
+    async def get_transaction_by_txid(self, txid: str) -> data.Transaction:
+        """
+        Get transaction by txid
+        :param txid: transaction hash
+        :return: Transaction
+        :raise: raise TransactionNotFound if target tx not found
+        """
+
+    async def get_transaction_status(self, txid: str) -> data.TransactionStatus:
+        """
+        Get transaction status by txid
+        :param txid: transaction hash
+        :return: TransactionStatus
+        """
+        try:
+            return (await self.get_transaction_by_txid(txid)).status
+        except exceptions.TransactionNotFound:
+            return data.TransactionStatus.UNKNOWN
+
+    async def search_txs_by_address(
+        self,
+        address: str,
+        paginate: Optional[data.TxPaginate] = None,
+    ) -> List[data.Transaction]:
+        """
+        Search transactions by address
+        :param address: address
+        :param paginate: paginate supports, optional
+        :return: list of Transaction
+        """
+        return []
+
+    @abc.abstractmethod
+    async def broadcast_transaction(self, raw_tx: str) -> data.TxBroadcastReceipt:
+        """
+        push transaction to chain
+        :param raw_tx: transaction in str
+        :return: txid, optional
+        """
+
+    @abc.abstractmethod
+    async def get_prices_per_unit_of_fee(self) -> data.PricesPerUnit:
+        """
+        get the price per unit of the fee, likes the gas_price on eth
+        :return: price per unit
+        """
+
+
 class ProviderInterface(abc.ABC):
     def __init__(
         self,
@@ -1,19 +1,30 @@
 import logging
+import threading
 import time
+import weakref
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from functools import partial
-from typing import Any, Iterable
+from typing import Any, Iterable, List, Optional
 
+from electrum_gui.common.basic.functional.throttle import TokenBucket
 from electrum_gui.common.coin import manager as coin_manager
 from electrum_gui.common.conf import chains as chains_conf
-from electrum_gui.common.provider import chains, exceptions
-from electrum_gui.common.provider.interfaces import ClientInterface, ProviderInterface
+from electrum_gui.common.conf import settings
+from electrum_gui.common.provider import adapters, chains, data, exceptions
+from electrum_gui.common.provider.health import ClientHealth, instrument_client
+from electrum_gui.common.provider.interfaces import AsyncClientInterface, ClientInterface, ProviderInterface
 
 logger = logging.getLogger("app.chain")
 
 
 _CLIENTS = {}
 _CANDIDATE_CLIENTS_CACHE = {}
+_CLIENT_HEALTHS = weakref.WeakKeyDictionary()  # client -> ClientHealth, dropped along with the client
 _PROVIDERS = {}
+_EXECUTORS = {}
+_EXECUTOR_LOCK = threading.Lock()
+_PROBING_MAX_WORKERS = 4
+_LOCK = threading.Lock()
 
 
 def _load_clients_by_chain(chain_code: str) -> Iterable[ClientInterface]:
@@ -43,9 +54,11 @@ def _load_clients_by_chain(chain_code: str) -> Iterable[ClientInterface]:
 
         instantiate_params = dict(config)
         instantiate_params.pop("class")
+        rate_limit = instantiate_params.pop("rate_limit", None)
 
         try:
             instance = client_classes[class_name](**instantiate_params)
+            _init_client_health(chain_code, instance, rate_limit=rate_limit)
             clients.append(instance)
         except Exception:
             logger.exception(
@@ -57,54 +70,178 @@ def _load_clients_by_chain(chain_code: str) -> Iterable[ClientInterface]:
     return clients
 
 
-def get_client_by_chain(
-    chain_code: str,
-    force_update: bool = False,
-    instance_required: Any = None,
-) -> Any:
+def _init_client_health(chain_code: str, client: ClientInterface, rate_limit: Optional[dict] = None) -> ClientHealth:
+    health = _CLIENT_HEALTHS.get(client)
+    if health is not None:
+        return health
+
+    class_name = client.__class__.__name__
+    rate_limit = rate_limit or settings.PROVIDER_CLIENT_GUARD["rate_limits"].get(class_name) or {}
+    health = _CLIENT_HEALTHS[client] = ClientHealth(
+        f"{chain_code}:{class_name}",
+        limiter=TokenBucket(rate=rate_limit.get("qps"), capacity=rate_limit.get("burst")),
+    )
+    instrument_client(client, health)
+    return health
+
+
+def _load_candidates(chain_code: str, instance_required: Any = None) -> List[dict]:
     candidates = _CANDIDATE_CLIENTS_CACHE.get(chain_code)
 
     if not candidates:
-        candidates = [
-            {"client": client, "is_ready": False, "expired_at": None} for client in _load_clients_by_chain(chain_code)
-        ]
+        candidates = []
+        for client in _load_clients_by_chain(chain_code):
+            health = _init_client_health(chain_code, client)
+            candidates.append(
+                {"client": client, "is_ready": False, "expired_at": None, "probing": None, "health": health}
+            )
         _CANDIDATE_CLIENTS_CACHE[chain_code] = candidates
 
     if instance_required is not None:
         candidates = [i for i in candidates if isinstance(i.get("client"), instance_required)]
 
-    ready_candidate_indexes = [index for index, candidate in enumerate(candidates) if candidate.get("is_ready") is True]
-    last_ready_candidate_index = (
-        ready_candidate_indexes[0] if ready_candidate_indexes else 0
-    )  # There is at most one ready candidate
-    candidates_count = len(candidates)
-
-    for index in range(candidates_count):
-        candidate = candidates[(last_ready_candidate_index + index) % candidates_count]
-        client, is_ready, expired_at = (
-            candidate["client"],
-            candidate["is_ready"],
-            candidate["expired_at"],
-        )
-
-        if not force_update and expired_at and expired_at > time.time():
-            if not is_ready:
+    return candidates
+
+
+def _get_executor(name: str, max_workers: int) -> ThreadPoolExecutor:
+    executor = _EXECUTORS.get(name)
+
+    if executor is None:
+        with _EXECUTOR_LOCK:
+            executor = _EXECUTORS.get(name)
+            if executor is None:
+                executor = _EXECUTORS[name] = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix=f"provider-{name}"
+                )
+
+    return executor
+
+
+def _get_probing_executor() -> ThreadPoolExecutor:
+    return _get_executor("probing", _PROBING_MAX_WORKERS)
+
+
+def _get_hedging_executor() -> ThreadPoolExecutor:
+    return _get_executor("hedging", settings.PROVIDER_HEDGING["max_workers"])
+
+
+def _probe(candidate: dict):
+    client = candidate["client"]
+    try:
+        is_ready, skip_seconds = client.is_ready, 300
+    except Exception as e:
+        is_ready, skip_seconds = False, 30
+        logger.info(f"Error in check status of <{candidate}>. error: {e}", exc_info=True)
+
+    candidate.update({"expired_at": int(time.time() + skip_seconds), "is_ready": is_ready})
+
+
+def _get_ranked_candidates(
+    chain_code: str,
+    force_update: bool = False,
+    instance_required: Any = None,
+) -> List[dict]:
+    candidates = _load_candidates(chain_code, instance_required=instance_required)
+
+    with _LOCK:
+        now = time.time()
+        for candidate in candidates:
+            if candidate["probing"] is not None and candidate["probing"].done():
+                candidate["probing"] = None
+
+            expired_at = candidate["expired_at"]
+            if candidate["probing"] is None and (force_update or not expired_at or expired_at <= now):
+                candidate["probing"] = _get_probing_executor().submit(_probe, candidate)
+
+        probing_futures = [i["probing"] for i in candidates if i["probing"] is not None]
+
+    # Skip the ones circuit opened, and try the throttled ones at last
+    def _filter_ready_candidates():
+        return [i for i in candidates if i["is_ready"] and i["health"].is_available]
+
+    if force_update:
+        wait(probing_futures)
+    else:
+        # Wait until any candidate is ready, and keep probing the others in background
+        pending = set(probing_futures)
+        while pending and not _filter_ready_candidates():
+            _, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+    ready_candidates = _filter_ready_candidates()
+    if not ready_candidates:
+        raise exceptions.NoAvailableClient(chain_code, candidates, instance_required or "Any")
+
+    return sorted(ready_candidates, key=lambda i: (i["health"].limiter.is_paused, i["health"].score))
+
+
+def get_client_by_chain(
+    chain_code: str,
+    force_update: bool = False,
+    instance_required: Any = None,
+) -> Any:
+    return _get_ranked_candidates(chain_code, force_update=force_update, instance_required=instance_required)[0][
+        "client"
+    ]
+
+
+def call_with_hedging(chain_code: str, method: str, *args, instance_required: Any = None, **kwargs) -> Any:
+    """
+    Call the method on the best client, and send a duplicate request to the second-best client
+    if the best one doesn't respond within the latency budget, then take whichever finishes first.
+    Only used for idempotent queries.
+    :param chain_code: chain code
+    :param method: method name of client
+    :param instance_required: same as get_client_by_chain, optional
+    :return: result of the method
+    """
+    candidates = _get_ranked_candidates(chain_code, instance_required=instance_required)
+    primary = candidates[0]
+
+    if not settings.PROVIDER_HEDGING["enabled"] or len(candidates) < 2:
+        return getattr(primary["client"], method)(*args, **kwargs)
+
+    executor, started = _get_hedging_executor(), threading.Event()
+
+    def _call_primary():
+        started.set()
+        return getattr(primary["client"], method)(*args, **kwargs)
+
+    latency_budget = max(primary["health"].p95_latency, settings.PROVIDER_HEDGING["min_delay"])
+    futures = [executor.submit(_call_primary)]
+    started.wait()  # the time queued in the executor doesn't count towards the latency budget
+    done, _ = wait(futures, timeout=latency_budget)
+
+    if not done:
+        logger.debug(f"Hedging {method} of {chain_code}, primary client: {primary['health'].name}")
+        futures.append(executor.submit(getattr(candidates[1]["client"], method), *args, **kwargs))
+
+    error, pending = None, set(futures)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in futures:
+            if future not in done:
                 continue
+            elif future.exception() is None:
+                return future.result()
             else:
-                return client
+                error = error or future.exception()
+
+    raise error
 
-        try:
-            is_ready, skip_seconds = client.is_ready, 300
-        except Exception as e:
-            is_ready, skip_seconds = False, 0
-            logger.info(f"Error in check status of <{candidate}>. error: {e}", exc_info=True)
 
-        candidate.update({"expired_at": int(time.time() + skip_seconds), "is_ready": is_ready})
+def get_client_stats(chain_code: str) -> List[data.ClientStats]:
+    return [i["health"].to_stats(is_ready=i["is_ready"]) for i in _load_candidates(chain_code)]
 
-        if is_ready:
-            return client
 
-    raise exceptions.NoAvailableClient(chain_code, candidates, instance_required or "Any")
+async def get_async_client_by_chain(
+    chain_code: str,
+    force_update: bool = False,
+    instance_required: Any = None,
+) -> AsyncClientInterface:
+    client = await adapters.run_in_executor(
+        get_client_by_chain, chain_code, force_update=force_update, instance_required=instance_required
+    )
+    return client if isinstance(client, AsyncClientInterface) else adapters.AsyncClientAdapter(client)
 
 
 def _load_provider(chain_code: str) -> ProviderInterface:
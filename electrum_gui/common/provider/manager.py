@@ -1,21 +1,29 @@
+import logging
 from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 import requests
 
 from electrum_gui.common.basic import bip44
+from electrum_gui.common.basic.cache.interfaces import MISSING
+from electrum_gui.common.basic.cache.memory import CacheStats
 from electrum_gui.common.basic.functional.require import require
+from electrum_gui.common.conf import settings
 from electrum_gui.common.hardware import interfaces as hardware_interfaces
 from electrum_gui.common.hardware import manager as hardware_manager
-from electrum_gui.common.provider import data, exceptions, interfaces, loader
+from electrum_gui.common.provider import adapters, data, exceptions, interfaces, loader
+from electrum_gui.common.provider.cache import cached, get_response_cache, make_key
 from electrum_gui.common.secret import interfaces as secret_interfaces
 
+logger = logging.getLogger("app.chain")
 
+
+@cached()
 def get_best_block_number(chain_code: str) -> int:
     return loader.get_client_by_chain(chain_code).get_info().best_block_number
 
 
 def get_address(chain_code: str, address: str) -> data.Address:
-    return loader.get_client_by_chain(chain_code).get_address(address)
+    return loader.call_with_hedging(chain_code, "get_address", address)
 
 
 def batch_get_address(chain_code: str, addresses: List[str]) -> List[data.Address]:
@@ -27,18 +35,97 @@ def batch_get_address(chain_code: str, addresses: List[str]) -> List[data.Addres
         return [client.get_address(i) for i in addresses]
 
 
+@cached()
 def get_balance(chain_code: str, address: str, token_address: Optional[str] = None) -> int:
     # TODO: raise specific exceptions for callers to catch. This also applies
     # to the APIs in this module.
-    return loader.get_client_by_chain(chain_code).get_balance(address, token_address=token_address)
+    return loader.call_with_hedging(chain_code, "get_balance", address, token_address=token_address)
+
 
+def batch_get_balance(chain_code: str, pairs: List[Tuple[str, Optional[str]]]) -> List[Optional[int]]:
+    try:
+        client = loader.get_client_by_chain(chain_code, instance_required=interfaces.BatchGetBalanceMixin)
+        return client.batch_get_balance(pairs)
+    except exceptions.NoAvailableClient:
+        client = loader.get_client_by_chain(chain_code)
+
+    balances = []
+    for address, token_address in pairs:
+        try:
+            balances.append(client.get_balance(address, token_address=token_address))
+        except Exception as e:
+            balances.append(None)
+            logger.exception(
+                f"Error in get balance. chain_code: {chain_code}, address: {address}, "
+                f"token_address: {token_address}, error: {e}"
+            )
+
+    return balances
+
+
+def _is_tx_finalized(chain_code: str, transaction: data.Transaction) -> bool:
+    if (
+        transaction.status not in (data.TransactionStatus.CONFIRM_SUCCESS, data.TransactionStatus.CONFIRM_REVERTED)
+        or transaction.block_header is None
+    ):
+        return False
+
+    confirmations = transaction.block_header.confirmations
+    if not confirmations:
+        try:
+            confirmations = get_best_block_number(chain_code) - transaction.block_header.block_number + 1
+        except Exception as e:
+            logger.warning(f"Error in get best block number. chain_code: {chain_code}, error: {e}")
+            return False
 
+    return confirmations >= settings.PROVIDER_CACHE["min_confirmations"]
+
+
+@cached(persist=True, cacheable=_is_tx_finalized)
 def get_transaction_by_txid(chain_code: str, txid: str) -> data.Transaction:
-    return loader.get_client_by_chain(chain_code).get_transaction_by_txid(txid)
+    return loader.call_with_hedging(chain_code, "get_transaction_by_txid", txid)
+
+
+def get_transactions_by_txids(chain_code: str, txids: List[str]) -> List[Optional[data.Transaction]]:
+    """
+    Get transactions by txids in batch, the finalized ones are served by the cache of get_transaction_by_txid
+    :param chain_code: chain code
+    :param txids: List[txid]
+    :return: transactions in the order of txids, None if not found or failed to get
+    """
+    response_cache = get_response_cache() if settings.PROVIDER_CACHE["enabled"] else None
+    transactions = {}
+
+    if response_cache is not None:
+        for txid in txids:
+            tx = response_cache.get(make_key(chain_code, "get_transaction_by_txid", (txid,)), persist=True)
+            if tx is not MISSING:
+                transactions[txid] = tx
+
+    missing_txids = [i for i in dict.fromkeys(txids) if i not in transactions]
+    if missing_txids:
+        try:
+            client = loader.get_client_by_chain(chain_code, instance_required=interfaces.BatchGetTransactionMixin)
+            fetched = client.batch_get_transaction_by_txid(missing_txids)
+        except exceptions.NoAvailableClient:
+            fetched = []
+            for txid in missing_txids:
+                try:
+                    fetched.append(loader.call_with_hedging(chain_code, "get_transaction_by_txid", txid))
+                except Exception as e:
+                    fetched.append(None)
+                    logger.info(f"Error in get transaction. chain_code: {chain_code}, txid: {txid}, error: {e}")
+
+        for txid, tx in zip(missing_txids, fetched):
+            transactions[txid] = tx
+            if tx is not None and response_cache is not None and _is_tx_finalized(chain_code, tx):
+                response_cache.set(make_key(chain_code, "get_transaction_by_txid", (txid,)), tx, persist=True)
+
+    return [transactions.get(i) for i in txids]
 
 
 def get_transaction_status(chain_code: str, txid: str) -> data.TransactionStatus:
-    return loader.get_client_by_chain(chain_code).get_transaction_status(txid)
+    return loader.call_with_hedging(chain_code, "get_transaction_status", txid)
 
 
 def search_txs_by_address(
@@ -67,10 +154,19 @@ def search_txids_by_address(
         return []
 
 
+def search_token_transfer_logs(
+    chain_code: str, addresses: List[str], from_block: int, to_block: int
+) -> List[data.TokenTransferLog]:
+    return loader.get_client_by_chain(
+        chain_code, instance_required=interfaces.SearchTokenTransferLogMixin
+    ).search_token_transfer_logs(addresses, from_block, to_block)
+
+
 def broadcast_transaction(chain_code: str, raw_tx: str) -> data.TxBroadcastReceipt:
     return loader.get_client_by_chain(chain_code).broadcast_transaction(raw_tx)
 
 
+@cached()
 def get_prices_per_unit_of_fee(chain_code: str) -> data.PricesPerUnit:
     if chain_code == "eth":
         # Gasnow is now only for ETH, if this become common for different chains,
@@ -121,10 +217,115 @@ def search_utxos_by_address(chain_code: str, address: str) -> List[data.UTXO]:
     )
 
 
+@cached(persist=True)
 def get_token_info_by_address(chain_code: str, token_address: str) -> Tuple[str, str, int]:
     return loader.get_provider_by_chain(chain_code).get_token_info_by_address(token_address)
 
 
+async def async_get_address(chain_code: str, address: str) -> data.Address:
+    client = await loader.get_async_client_by_chain(chain_code)
+    return await client.get_address(address)
+
+
+async def async_get_balance(chain_code: str, address: str, token_address: Optional[str] = None) -> int:
+    client = await loader.get_async_client_by_chain(chain_code)
+    return await client.get_balance(address, token_address=token_address)
+
+
+async def async_get_transaction_by_txid(chain_code: str, txid: str) -> data.Transaction:
+    client = await loader.get_async_client_by_chain(chain_code)
+    return await client.get_transaction_by_txid(txid)
+
+
+async def async_search_txs_by_address(
+    chain_code: str,
+    address: str,
+    paginate: Optional[data.TxPaginate] = None,
+) -> List[data.Transaction]:
+    try:
+        client = await loader.get_async_client_by_chain(chain_code, instance_required=interfaces.SearchTransactionMixin)
+    except exceptions.NoAvailableClient:
+        return []
+
+    return await client.search_txs_by_address(address, paginate=paginate)
+
+
+async def async_batch_get_balance(
+    items: List[Tuple[str, str, Optional[str]]],
+    concurrency: int = None,
+    return_exceptions: bool = False,
+) -> List[Union[int, Exception]]:
+    """
+    Get balances concurrently, across chains
+    :param items: list of (chain_code, address, token_address)
+    :param concurrency: max requests in flight, optional
+    :param return_exceptions: return the exception as result instead of raising it
+    :return: balances in the order of items
+    """
+    return await adapters.gather_with_concurrency(
+        (async_get_balance(chain_code, address, token_address) for chain_code, address, token_address in items),
+        concurrency=concurrency,
+        return_exceptions=return_exceptions,
+    )
+
+
+async def async_batch_get_address(
+    items: List[Tuple[str, str]],
+    concurrency: int = None,
+    return_exceptions: bool = False,
+) -> List[Union[data.Address, Exception]]:
+    """
+    Get address information concurrently, across chains
+    :param items: list of (chain_code, address)
+    :param concurrency: max requests in flight, optional
+    :param return_exceptions: return the exception as result instead of raising it
+    :return: Address in the order of items
+    """
+    return await adapters.gather_with_concurrency(
+        (async_get_address(chain_code, address) for chain_code, address in items),
+        concurrency=concurrency,
+        return_exceptions=return_exceptions,
+    )
+
+
+async def async_batch_get_transaction_by_txid(
+    items: List[Tuple[str, str]],
+    concurrency: int = None,
+    return_exceptions: bool = False,
+) -> List[Union[data.Transaction, Exception]]:
+    """
+    Get transactions concurrently, across chains
+    :param items: list of (chain_code, txid)
+    :param concurrency: max requests in flight, optional
+    :param return_exceptions: return the exception as result instead of raising it
+    :return: Transaction in the order of items
+    """
+    return await adapters.gather_with_concurrency(
+        (async_get_transaction_by_txid(chain_code, txid) for chain_code, txid in items),
+        concurrency=concurrency,
+        return_exceptions=return_exceptions,
+    )
+
+
+async def async_batch_search_txs_by_address(
+    items: List[Tuple[str, str, Optional[data.TxPaginate]]],
+    concurrency: int = None,
+    return_exceptions: bool = False,
+) -> List[Union[List[data.Transaction], Exception]]:
+    """
+    Search transactions concurrently, across chains
+    :param items: list of (chain_code, address, paginate)
+    :param concurrency: max requests in flight, optional
+    :param return_exceptions: return the exception as result instead of raising it
+    :return: list of Transaction in the order of items
+    """
+    return await adapters.gather_with_concurrency(
+        (async_search_txs_by_address(chain_code, address, paginate) for chain_code, address, paginate in items),
+        concurrency=concurrency,
+        return_exceptions=return_exceptions,
+    )
+
+
 def get_client_by_chain(chain_code: str, instance_required: Any = None) -> interfaces.ClientInterface:
     return loader.get_client_by_chain(chain_code, instance_required=instance_required)
 
@@ -133,6 +334,14 @@ def get_provider_by_chain(chain_code: str) -> interfaces.ProviderInterface:
     return loader.get_provider_by_chain(chain_code)
 
 
+def get_client_stats(chain_code: str) -> List[data.ClientStats]:
+    return loader.get_client_stats(chain_code)
+
+
+def get_cache_stats() -> Dict[str, CacheStats]:
+    return get_response_cache().get_stats()
+
+
 def _require_special_provider(chain_code: str, require_type: Type) -> Any:
     provider = loader.get_provider_by_chain(chain_code)
     require(
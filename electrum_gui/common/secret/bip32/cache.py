@@ -0,0 +1,141 @@
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple, Type, Union
+
+from electrum_gui.common.basic.cache.interfaces import MISSING
+from electrum_gui.common.basic.cache.memory import MemoryCache
+from electrum_gui.common.secret import utils
+from electrum_gui.common.secret.interfaces import BIP32Interface
+
+_FINGERPRINT_KEY = os.urandom(32)  # master seeds are never kept, only the fingerprints by this process-wide key
+
+
+@dataclass
+class _CachedNode(object):
+    secret: bytearray  # prvkey + chain_code
+    pubkey: bytes
+    depth: int
+    parent_fingerprint: bytes
+    child_index: int
+
+    @classmethod
+    def from_node(cls, node: BIP32Interface) -> "_CachedNode":
+        secret = bytearray(64)  # filled in place, without any intermediate copy of the secrets
+        secret[:32] = node._prvkey
+        secret[32:] = node.chain_code
+        return cls(
+            secret=secret,
+            pubkey=node._pubkey,
+            depth=node.depth,
+            parent_fingerprint=node.parent_fingerprint,
+            child_index=node.child_index,
+        )
+
+    def to_node(self, bip32_class: Type[BIP32Interface]) -> BIP32Interface:
+        """
+        Restore the node, which is only used to derive the children during a call, and never kept
+        """
+        node = bip32_class(
+            pubkey=self.pubkey,  # avoid computing the pubkey again
+            chain_code=bytes(self.secret[32:]),
+            depth=self.depth,
+            parent_fingerprint=self.parent_fingerprint,
+            child_index=self.child_index,
+        )
+        node._prvkey = bytes(self.secret[:32])
+        return node
+
+    def zeroize(self):
+        for i in range(len(self.secret)):
+            self.secret[i] = 0
+
+
+def _zeroize_on_evict(key: tuple, cached_node: _CachedNode):
+    cached_node.zeroize()
+
+
+_TTL = 120
+_PURGE_INTERVAL = 30  # the expired nodes are zeroized within this interval, even if no more derivation happens
+_CACHE = MemoryCache(max_size=64, ttl=_TTL, on_evict=_zeroize_on_evict)
+_PURGE_TIMER = None
+_PURGE_TIMER_LOCK = threading.Lock()
+
+
+def _schedule_purge():
+    global _PURGE_TIMER
+
+    with _PURGE_TIMER_LOCK:
+        if _PURGE_TIMER is not None or not len(_CACHE):
+            return
+
+        _PURGE_TIMER = threading.Timer(_PURGE_INTERVAL, _purge_by_timer)
+        _PURGE_TIMER.daemon = True
+        _PURGE_TIMER.start()
+
+
+def _purge_by_timer():
+    global _PURGE_TIMER
+
+    with _PURGE_TIMER_LOCK:
+        _PURGE_TIMER = None
+
+    _CACHE.purge_expired()
+    _schedule_purge()
+
+
+def derive_many_by_master_seed(
+    bip32_class: Type[BIP32Interface], master_seed: bytes, paths: List[Union[str, Iterable[int]]]
+) -> List[BIP32Interface]:
+    """
+    Derive the nodes of paths from the master seed. The intermediate nodes (but never the master node) are cached
+    by the fingerprint of the master seed for a while, so they are shared by the sibling paths, even across calls.
+    The secrets of the cached nodes are zeroized once evicted or expired, the expired ones are purged
+    at the end of every call, and by a timer until the cache is empty
+    :param bip32_class: class of BIP32 on the specified curve
+    :param master_seed: master seed
+    :param paths: list of bip32 path
+    :return: list of node in the order of paths
+    """
+    try:
+        return _derive_many_by_master_seed(bip32_class, master_seed, paths)
+    finally:
+        _CACHE.purge_expired()
+        _schedule_purge()
+
+
+def _derive_many_by_master_seed(
+    bip32_class: Type[BIP32Interface], master_seed: bytes, paths: List[Union[str, Iterable[int]]]
+) -> List[BIP32Interface]:
+    seed_fingerprint = utils.hmac_oneshot(_FINGERPRINT_KEY, master_seed, hashlib.sha256)
+    nodes: Dict[Tuple[int, ...], BIP32Interface] = {}
+
+    def _get_node(path: Tuple[int, ...]) -> BIP32Interface:
+        if path in nodes:
+            return nodes[path]
+
+        if not path:  # the master node is never cached
+            nodes[path] = bip32_class.from_master_seed(master_seed)
+            return nodes[path]
+
+        cached_node = _CACHE.get((bip32_class, seed_fingerprint, path))
+        if cached_node is not MISSING:
+            node = cached_node.to_node(bip32_class)
+        else:
+            node = _get_node(path[:-1]).derive_path(path[-1:])
+            _CACHE.set((bip32_class, seed_fingerprint, path), _CachedNode.from_node(node))
+
+        nodes[path] = node
+        return node
+
+    result = []
+    for path in paths:
+        path = tuple(utils.decode_bip32_path(path) if isinstance(path, str) else path)
+        result.append(_get_node(path[:-1]).derive_path(path[-1:]) if path else _get_node(path))
+
+    return result
+
+
+def clear():
+    _CACHE.clear()
@@ -1,7 +1,7 @@
 import hashlib
 import struct
 from abc import ABC, abstractmethod
-from typing import Iterable, Tuple, Type, Union
+from typing import Iterable, List, Tuple, Type, Union
 
 from electrum_gui.common.basic.functional.require import require
 from electrum_gui.common.secret import utils
@@ -165,6 +165,14 @@ class BIP32Interface(ABC):
 
         return key
 
+    def derive_many(self, paths: Iterable[Union[str, Iterable[int]]]) -> List["BIP32Interface"]:
+        """
+        Derive the nodes of paths, the common prefixes are derived only once
+        :param paths: list of bip32 path
+        :return: list of node in the order of paths
+        """
+        return [self.derive_path(path) for path in paths]  # derived children are memoized by _lookup_cache
+
     @property
     def fingerprint(self) -> bytes:
         return utils.hash_160(self._pubkey)[:4]
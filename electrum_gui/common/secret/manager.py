@@ -5,6 +5,7 @@ from electrum_gui.common.basic import exceptions as basic_exceptions
 from electrum_gui.common.basic.functional.require import require
 from electrum_gui.common.basic.orm.database import db
 from electrum_gui.common.secret import daos, encrypt, exceptions, registry, utils
+from electrum_gui.common.secret.bip32 import cache as bip32_cache
 from electrum_gui.common.secret.data import CurveEnum, PubKeyType, SecretKeyType
 from electrum_gui.common.secret.interfaces import KeyInterface, SignerInterface, VerifierInterface
 from electrum_gui.common.secret.models import PubKeyModel, SecretKeyModel
@@ -342,13 +343,26 @@ def raw_create_key_by_master_seed(curve: CurveEnum, master_seed: bytes, path: st
     _verify_master_seed(master_seed)
     path or _verify_bip32_path(path)
 
-    node = registry.bip32_class_on_curve(curve).from_master_seed(master_seed)
-    if path:
-        node = node.derive_path(path)
-
+    (node,) = bip32_cache.derive_many_by_master_seed(registry.bip32_class_on_curve(curve), master_seed, [path or []])
     return node.prvkey_interface
 
 
+def raw_create_keys_by_master_seed(curve: CurveEnum, master_seed: bytes, paths: List[str]) -> List[KeyInterface]:
+    """
+    Create keys of the paths by master seed, the intermediate nodes shared by sibling paths are derived only once
+    :param curve: curve
+    :param master_seed: master seed
+    :param paths: list of bip32 path
+    :return: list of key in the order of paths
+    """
+    _verify_master_seed(master_seed)
+    for path in paths:
+        _verify_bip32_path(path)
+
+    nodes = bip32_cache.derive_many_by_master_seed(registry.bip32_class_on_curve(curve), master_seed, paths)
+    return [node.prvkey_interface for node in nodes]
+
+
 def export_prvkey(password: str, pubkey_id: int) -> str:
     return get_signer(password, pubkey_id).get_prvkey().hex()
 
@@ -0,0 +1,63 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from electrum_gui.common.basic.cache.interfaces import MISSING
+from electrum_gui.common.basic.cache.memory import MemoryCache
+
+
+class TestMemoryCache(TestCase):
+    @patch("electrum_gui.common.basic.cache.memory.time")
+    def test_get_and_set(self, fake_time):
+        fake_time.time.return_value = 1000
+        cache = MemoryCache(max_size=2)
+
+        with self.subTest("Missing"):
+            self.assertIs(MISSING, cache.get("a"))
+
+        with self.subTest("Cached"):
+            cache.set("a", None)
+            self.assertIsNone(cache.get("a"))
+
+        with self.subTest("Expired"):
+            cache.set("b", 2, ttl=10)
+            self.assertEqual(2, cache.get("b"))
+            fake_time.time.return_value = 1010
+            self.assertIs(MISSING, cache.get("b"))
+
+        with self.subTest("Evict the least recently used one"):
+            cache.set("b", 2)
+            cache.get("a")
+            cache.set("c", 3)
+            self.assertEqual(2, len(cache))
+            self.assertIs(MISSING, cache.get("b"))
+            self.assertIsNone(cache.get("a"))
+            self.assertEqual(3, cache.get("c"))
+
+        with self.subTest("Delete and clear"):
+            cache.delete("a")
+            self.assertIs(MISSING, cache.get("a"))
+            cache.clear()
+            self.assertEqual(0, len(cache))
+
+        stats = cache.get_stats()
+        self.assertEqual((5, 4, 1, 0), (stats.hits, stats.misses, stats.evictions, stats.size))
+        self.assertAlmostEqual(5 / 9, stats.hit_rate)
+
+    @patch("electrum_gui.common.basic.cache.memory.time")
+    def test_on_evict(self, fake_time):
+        fake_time.time.return_value = 1000
+        evicted = []
+        cache = MemoryCache(max_size=2, on_evict=lambda key, value: evicted.append(key))
+
+        cache.set("a", 1, ttl=10)
+        cache.set("b", 2)
+        cache.set("b", 3)
+        cache.set("c", 3)
+        self.assertEqual(["b", "a"], evicted)
+
+        cache.set("d", 4, ttl=10)
+        fake_time.time.return_value = 1010
+        cache.purge_expired()
+        cache.delete("c")
+        cache.clear()
+        self.assertEqual(["b", "a", "b", "d", "c"], evicted)
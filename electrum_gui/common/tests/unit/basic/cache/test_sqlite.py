@@ -0,0 +1,64 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from electrum_gui.common.basic.cache.interfaces import MISSING
+from electrum_gui.common.basic.cache.sqlite import SqliteCache
+
+
+class TestSqliteCache(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "cache.sqlite")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    @patch("electrum_gui.common.basic.cache.sqlite.time")
+    def test_get_and_set(self, fake_time):
+        fake_time.time.return_value = 1000
+        cache = SqliteCache(self.path)
+
+        with self.subTest("Missing"):
+            self.assertIs(MISSING, cache.get(("eth", "get_token_info_by_address", ("0xa",), ())))
+
+        with self.subTest("Persisted"):
+            cache.set(("eth", "get_token_info_by_address", ("0xa",), ()), ("USDT", "Tether USD", 6))
+            cache.set("b", {"value": 1}, ttl=10)
+            cache.db.close()
+
+            cache = SqliteCache(self.path)
+            self.assertEqual(
+                ("USDT", "Tether USD", 6), cache.get(("eth", "get_token_info_by_address", ("0xa",), ()))
+            )
+            self.assertEqual({"value": 1}, cache.get("b"))
+
+        with self.subTest("Expired"):
+            fake_time.time.return_value = 1010
+            self.assertIs(MISSING, cache.get("b"))
+
+            cache.set("c", 3, ttl=5)
+            fake_time.time.return_value = 1020
+            cache.purge_expired()
+            self.assertEqual(
+                [("('eth', 'get_token_info_by_address', ('0xa',), ())",)],
+                cache.db.execute_sql("SELECT key FROM cache").fetchall(),
+            )
+
+        with self.subTest("Delete and clear"):
+            cache.set("d", 4)
+            cache.delete("d")
+            self.assertIs(MISSING, cache.get("d"))
+            cache.clear()
+            self.assertIs(MISSING, cache.get(("eth", "get_token_info_by_address", ("0xa",), ())))
+
+    def test_trim(self):
+        cache = SqliteCache(self.path, max_rows=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+        cache.set("a", "a")  # written again
+
+        cache.trim()
+        self.assertIs(MISSING, cache.get("b"))
+        self.assertEqual(["c", "a"], [cache.get("c"), cache.get("a")])
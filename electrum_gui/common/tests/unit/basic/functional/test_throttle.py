@@ -0,0 +1,85 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from electrum_gui.common.basic.functional.throttle import CircuitBreaker, CircuitState, TokenBucket
+
+
+class TestThrottle(TestCase):
+    @patch("electrum_gui.common.basic.functional.throttle.time")
+    def test_token_bucket(self, fake_time):
+        now = [1000.0]
+        fake_time.monotonic.side_effect = lambda: now[0]
+
+        def _sleep(seconds):
+            now[0] += seconds
+
+        fake_time.sleep.side_effect = _sleep
+
+        bucket = TokenBucket(rate=2, capacity=2)
+
+        with self.subTest("Burst"):
+            self.assertTrue(bucket.acquire(timeout=0))
+            self.assertTrue(bucket.acquire(timeout=0))
+            self.assertFalse(bucket.acquire(timeout=0.1))
+            fake_time.sleep.assert_not_called()
+
+        with self.subTest("Wait for refilling"):
+            self.assertTrue(bucket.acquire())
+            fake_time.sleep.assert_called_once_with(0.5)
+            self.assertEqual(1000.5, now[0])
+            fake_time.sleep.reset_mock()
+
+        with self.subTest("Paused"):
+            now[0] += 10
+            bucket.pause(30)
+            self.assertTrue(bucket.is_paused)
+            self.assertFalse(bucket.acquire(timeout=5))
+            self.assertTrue(bucket.acquire())
+            fake_time.sleep.assert_called_once_with(30)
+            self.assertFalse(bucket.is_paused)
+
+        with self.subTest("Unlimited"):
+            bucket = TokenBucket()
+            self.assertTrue(all(bucket.acquire(timeout=0) for _ in range(100)))
+
+    @patch("electrum_gui.common.basic.functional.throttle.time")
+    def test_circuit_breaker(self, fake_time):
+        fake_time.monotonic.return_value = 1000
+        breaker = CircuitBreaker(failure_threshold=3, cooldown=60)
+
+        with self.subTest("Open after consecutive failures"):
+            breaker.record_failure()
+            breaker.record_failure()
+            breaker.record_success()
+            breaker.record_failure()
+            breaker.record_failure()
+            self.assertEqual(CircuitState.CLOSED, breaker.state)
+
+            breaker.record_failure()
+            self.assertEqual(CircuitState.OPEN, breaker.state)
+            self.assertFalse(breaker.allow_request())
+
+        with self.subTest("Half open after cooldown, and open again if failed"):
+            fake_time.monotonic.return_value = 1060
+            self.assertEqual(CircuitState.HALF_OPEN, breaker.state)
+            self.assertTrue(breaker.allow_request())
+
+            self.assertTrue(breaker.acquire())
+            self.assertFalse(breaker.acquire())  # only a single trial call
+            self.assertFalse(breaker.allow_request())
+
+            breaker.record_failure()
+            self.assertEqual(CircuitState.OPEN, breaker.state)
+
+        with self.subTest("Close if succeeded in half open"):
+            fake_time.monotonic.return_value = 1120
+            self.assertEqual(CircuitState.HALF_OPEN, breaker.state)
+
+            self.assertTrue(breaker.acquire())
+            breaker.release()  # throttled, without any result
+            self.assertTrue(breaker.acquire())
+
+            breaker.record_success()
+            self.assertEqual(CircuitState.CLOSED, breaker.state)
+            self.assertTrue(breaker.acquire())
+            self.assertTrue(breaker.acquire())
@@ -1,3 +1,6 @@
+import threading
+import time
+from concurrent import futures
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
@@ -5,56 +8,100 @@ from electrum_gui.common.basic.functional.wraps import cache_it
 
 
 class TestWraps(TestCase):
+    @patch("electrum_gui.common.basic.cache.memory.time")
     @patch("electrum_gui.common.basic.functional.wraps.time")
-    def test_cache_it(self, fake_time):
+    def test_cache_it(self, fake_time, fake_memory_time):
+        now = [1600000000]
+        fake_time.time.side_effect = fake_memory_time.time.side_effect = lambda: now[0]
         fake_callable = Mock(return_value="ping")
-        func = cache_it()(fake_callable)
-
-        timestamps = []
-        fake_time.time.side_effect = timestamps.pop
+        func = cache_it(max_size=2)(fake_callable)
 
         with self.subTest("the first time"):
-            timestamps.append(1600000000)
+            self.assertEqual("ping", func())
+            fake_callable.assert_called_once()
+            fake_callable.reset_mock()
 
+        with self.subTest("cache value as expected"):
+            now[0] += 59
             self.assertEqual("ping", func())
+            fake_callable.assert_not_called()
 
-            self.assertEqual(1, fake_time.time.call_count)
-            self.assertEqual(0, len(timestamps))
+        with self.subTest("cache expired"):
+            now[0] += 1
+            self.assertEqual("ping", func())
             fake_callable.assert_called_once()
+            fake_callable.reset_mock()
 
-            fake_time.time.reset_mock()
+        with self.subTest("force update"):
+            self.assertEqual("ping", func(a=1, b=3, __force_update_cache_it__=True))
+            fake_callable.assert_called_once_with(a=1, b=3)
             fake_callable.reset_mock()
 
-        with self.subTest("cache value as expected"):
-            timestamps.append(1600000060)
+        with self.subTest("evict the least recently used one"):
+            func([1])  # unhashable arguments
+            self.assertEqual(1, func.get_stats().evictions)
+            func(a=1, b=3)
+            fake_callable.assert_called_once_with([1])
+            fake_callable.reset_mock()
 
-            self.assertEqual("ping", func())
+            func()
+            fake_callable.assert_called_once_with()
+            fake_callable.reset_mock()
 
-            self.assertEqual(1, fake_time.time.call_count)
-            self.assertEqual(0, len(timestamps))
-            fake_callable.assert_not_called()
+        with self.subTest("invalidate"):
+            func.invalidate([1])
+            func([1])
+            func(a=1, b=3)
+            self.assertEqual(2, fake_callable.call_count)
+            fake_callable.reset_mock()
 
-            fake_time.time.reset_mock()
+            func.clear()
+            func([1])
+            fake_callable.assert_called_once_with([1])
 
-        with self.subTest("cache expired"):
-            timestamps.extend((1600000061, 1600000061))
+    def test_cache_it__cacheable(self):
+        fake_callable = Mock(side_effect=[None, None, "ping"])
+        func = cache_it(cacheable=lambda i: i is not None)(fake_callable)
 
-            self.assertEqual("ping", func())
+        self.assertIsNone(func("a"))
+        self.assertIsNone(func("a"))
+        self.assertEqual("ping", func("a"))
+        self.assertEqual("ping", func("a"))
+        self.assertEqual(3, fake_callable.call_count)
 
-            self.assertEqual(2, fake_time.time.call_count)
-            self.assertEqual(0, len(timestamps))
-            fake_callable.assert_called_once()
+    def test_cache_it__single_flight(self):
+        started, release = threading.Event(), threading.Event()
 
-            fake_callable.reset_mock()
-            fake_time.time.reset_mock()
+        def _slow(x):
+            started.set()
+            release.wait(1)
+            return x * 2
 
-        with self.subTest("force update"):
-            timestamps.append(1600000062)
+        fake_callable = Mock(side_effect=_slow)
+        func = cache_it()(fake_callable)
 
-            self.assertEqual("ping", func(a=1, b=3, __force_update_cache_it__=True))
+        with futures.ThreadPoolExecutor(max_workers=4) as executor:
+            leader = executor.submit(func, 1)
+            started.wait(1)
+            followers = [executor.submit(func, 1) for _ in range(3)]
+            time.sleep(0.05)
+            release.set()
 
-            self.assertEqual(1, fake_time.time.call_count)
-            self.assertEqual(0, len(timestamps))
-            fake_callable.assert_called_once_with(a=1, b=3)
+            self.assertEqual([2, 2, 2, 2], [i.result() for i in [leader, *followers]])
+
+        fake_callable.assert_called_once_with(1)
+
+    def test_cache_it__stale_while_revalidate(self):
+        fake_callable = Mock(side_effect=["first", "second"])
+        func = cache_it(timeout=0.05, stale_while_revalidate=60)(fake_callable)
+        self.assertEqual("first", func())
+        time.sleep(0.06)
+
+        self.assertEqual("first", func())  # return the stale one, and refresh it in background
+        for _ in range(100):
+            if func() == "second":
+                break
+            time.sleep(0.01)
 
-            fake_time.time.reset_mock()
+        self.assertEqual("second", func())
+        self.assertEqual(2, fake_callable.call_count)
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import threading
+from unittest import TestCase
+
+from electrum_gui.common.basic.orm import database
+
+
+class TestDatabase(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config = dict(
+            name=os.path.join(self.temp_dir.name, "database.sqlite"),
+            pragmas={"auto_vacuum": 2, "journal_mode": "wal", "synchronous": 1, "temp_store": 2},
+        )
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_create_database(self):
+        db = database._create_database(self.config)
+        self.assertEqual("wal", db.pragma("journal_mode"))
+        self.assertEqual(1, db.pragma("synchronous"))
+        self.assertEqual(2, db.pragma("temp_store"))
+        self.assertEqual(2, db.pragma("auto_vacuum"))
+
+        connections = []
+
+        def _connect():
+            connections.append(db.connection())
+            db.close()
+
+        thread = threading.Thread(target=_connect)
+        thread.start()
+        thread.join()
+        self.assertIsNot(db.connection(), connections[0])
+        db.close()
+
+    def test_optimize(self):
+        db = database._create_database(dict(self.config, pragmas={"journal_mode": "wal"}))
+        db.execute_sql("CREATE TABLE t (v TEXT);")
+        db.execute_sql("INSERT INTO t VALUES (?);", ("x" * 1024 * 1024,))
+        db.execute_sql("DELETE FROM t;")
+        self.assertEqual(0, db.pragma("auto_vacuum"))
+        self.assertGreater(db.pragma("freelist_count"), 0)
+
+        with self.subTest("Never switch to incremental vacuum by the periodic optimizing"):
+            database.optimize(db)
+            self.assertEqual(0, db.pragma("auto_vacuum"))
+
+        with self.subTest("Skip switching to incremental vacuum if too large"):
+            self.assertFalse(database.enable_incremental_vacuum(db, max_size=1024))
+            self.assertEqual(0, db.pragma("auto_vacuum"))
+
+        with self.subTest("Switch to incremental vacuum"):
+            self.assertTrue(database.enable_incremental_vacuum(db, max_size=1024 * 1024 * 1024))
+            self.assertEqual(2, db.pragma("auto_vacuum"))
+            self.assertEqual(0, db.pragma("freelist_count"))
+            self.assertTrue(database.enable_incremental_vacuum(db, max_size=1024))
+
+        with self.subTest("Release the free pages incrementally"):
+            db.execute_sql("INSERT INTO t VALUES (?);", ("x" * 1024 * 1024,))
+            db.execute_sql("DELETE FROM t;")
+            free_pages = db.pragma("freelist_count")
+            database.optimize(db, vacuum_pages=10)
+            self.assertEqual(free_pages - 10, db.pragma("freelist_count"))
+            database.optimize(db)
+            self.assertEqual(0, db.pragma("freelist_count"))
+
+        db.close()
@@ -1,3 +1,6 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
@@ -116,3 +119,110 @@ class TestJsonRPCRequest(TestCase):
 
             with self.assertRaisesRegex(exceptions.JsonRPCException, "Json RPC call failed."):
                 ins.batch_call([("ping_a", []), ("ping_b", []), ("ping_c", [])])
+
+    @patch("electrum_gui.common.basic.request.json_rpc.RestfulRequest")
+    def test_call__with_coalescing(self, fake_restful_request_creator):
+        fake_restful = Mock()
+        fake_restful_request_creator.return_value = fake_restful
+
+        is_posting = threading.Event()
+        is_released = threading.Event()
+
+        def _fake_post(path, json=None, timeout=None):
+            if isinstance(json, dict):
+                if json["params"][0] == "slow":
+                    is_posting.set()
+                    is_released.wait(1)
+                return {"id": json["id"], "result": f"pong_{json['params'][0]}"}
+            else:
+                return [
+                    (
+                        {"id": i["id"], "error": "Bad Param"}
+                        if i["params"][0] == "bad"
+                        else {"id": i["id"], "result": f"pong_{i['params'][0]}"}
+                    )
+                    for i in reversed(json)
+                ]
+
+        fake_restful.post.side_effect = _fake_post
+        ins = json_rpc.JsonRPCRequest("https://www.rpc_testing.com", coalesce_window=0.2, coalesce_max_size=3)
+
+        with self.subTest("Single call sent at once"):
+            start_time = time.time()
+            self.assertEqual("pong_a", ins.call("ping", params=["a"]))
+            self.assertLess(time.time() - start_time, 0.2)
+            fake_restful.post.assert_called_once_with(
+                "", json={"jsonrpc": "2.0", "id": 0, "method": "ping", "params": ["a"]}, timeout=None
+            )
+            fake_restful.post.reset_mock()
+
+        with self.subTest("Calls merged into batches while another one in flight"):
+            params = ["slow", "b", "bad", "c", "d"]
+            with ThreadPoolExecutor(max_workers=len(params)) as executor:
+                futures = [executor.submit(ins.call, "ping", params=["slow"])]
+                is_posting.wait(1)
+                futures.extend(executor.submit(ins.call, "ping", params=[i]) for i in params[1:])
+                time.sleep(0.05)
+                is_released.set()
+
+            results = {}
+            for param, future in zip(params, futures):
+                try:
+                    results[param] = future.result()
+                except exceptions.JsonRPCException as e:
+                    results[param] = e
+
+            self.assertEqual(
+                {"slow": "pong_slow", "b": "pong_b", "c": "pong_c", "d": "pong_d"},
+                {k: v for k, v in results.items() if k != "bad"},
+            )
+            self.assertRegex(str(results["bad"]), "Error at the .* response of batch. error: Bad Param")
+            self.assertEqual(3, fake_restful.post.call_count)  # the slow one, a full batch of 3, and the last one
+            fake_restful.post.reset_mock()
+
+        with self.subTest("Get error response"):
+            fake_restful.post.side_effect = exceptions.RequestException
+
+            with self.assertRaisesRegex(exceptions.JsonRPCException, "Json RPC call failed."):
+                ins.call("ping", params=["a"])
+
+        with self.subTest("Skip coalescing if special headers required"):
+            fake_restful.post.side_effect = None
+            fake_restful.post.return_value = {"result": "pong"}
+            fake_restful.post.reset_mock()
+
+            self.assertEqual("pong", ins.call("ping", headers={"Custom-Field": "cc"}))
+            fake_restful.post.assert_called_once_with(
+                "", json={"jsonrpc": "2.0", "id": 0, "method": "ping"}, timeout=None, headers={"Custom-Field": "cc"}
+            )
+
+    @patch("electrum_gui.common.basic.request.json_rpc.RestfulRequest")
+    def test_call__with_coalescing_timeout(self, fake_restful_request_creator):
+        fake_restful = Mock()
+        fake_restful_request_creator.return_value = fake_restful
+
+        is_posting = threading.Event()
+        is_released = threading.Event()
+
+        def _fake_post(path, json=None, timeout=None):
+            is_posting.set()
+            is_released.wait(2)  # stuck until released
+            return {"id": json["id"], "result": "pong"} if isinstance(json, dict) else []
+
+        fake_restful.post.side_effect = _fake_post
+        ins = json_rpc.JsonRPCRequest("https://www.rpc_testing.com", coalesce_window=0.1)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(ins.call, "ping", params=["slow"], timeout=0.1)]
+            is_posting.wait(1)
+            futures.append(executor.submit(ins.call, "ping", params=["leader"], timeout=0.1))
+            time.sleep(0.05)
+            futures.append(executor.submit(ins.call, "ping", params=["follower"], timeout=0.1))
+
+            start_time = time.time()
+            with self.assertRaisesRegex(exceptions.JsonRPCException, "Json RPC call timed out."):
+                futures[2].result()
+            self.assertLess(time.time() - start_time, 1)
+            is_released.set()
+
+        self.assertEqual("pong", futures[0].result())
@@ -5,7 +5,7 @@ from electrum_gui.common.basic.request import enums, exceptions, restful
 
 
 class TestRestfulRequest(TestCase):
-    @patch("electrum_gui.common.basic.request.restful.Session")
+    @patch("electrum_gui.common.basic.request.transport.Session")
     def test_request(self, fake_session_creator):
         fake_session = Mock()
         fake_session_creator.return_value = fake_session
@@ -18,6 +18,7 @@ class TestRestfulRequest(TestCase):
 
             fake_session.headers.update.assert_called_once_with({"User-Agent": "Electrum"})
             fake_session_initializer.assert_called_once_with(fake_session)
+            self.assertEqual(2, fake_session.mount.call_count)
 
         with self.subTest("Get error response"):
             fake_response = Mock(ok=False, status_code=504, text="Server Not Ready")
@@ -0,0 +1,75 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import TestCase
+from unittest.mock import patch
+
+from electrum_gui.common.basic.request import transport
+
+
+class _PingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"result": "pong"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTransport(TestCase):
+    def setUp(self) -> None:
+        self.server = HTTPServer(("127.0.0.1", 0), _PingHandler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        transport.close_shared_sessions()
+        transport.reset_stats()
+
+    def tearDown(self) -> None:
+        transport.close_shared_sessions()
+        transport.reset_stats()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_get_shared_session(self):
+        session = transport.get_shared_session(self.base_url + "/api")
+        self.assertIs(session, transport.get_shared_session(self.base_url + "/others"))
+        self.assertIsNot(session, transport.get_shared_session("http://127.0.0.2:8080"))
+        self.assertEqual("Electrum", session.headers["User-Agent"])
+
+        transport.close_shared_sessions()
+        self.assertIsNot(session, transport.get_shared_session(self.base_url))
+
+    def test_keep_alive(self):
+        session = transport.get_shared_session(self.base_url)
+        for _ in range(3):
+            self.assertEqual({"result": "pong"}, session.get(self.base_url + "/ping").json())
+
+        stats = transport.get_stats("127.0.0.1")["127.0.0.1"]
+        self.assertEqual(3, stats.requests)
+        self.assertEqual(1, stats.new_connections)
+        self.assertEqual(2, stats.reused_connections)
+        self.assertGreaterEqual(stats.handshake_time, 0)
+
+        transport.reset_stats()
+        self.assertEqual({}, transport.get_stats())
+
+    def test_new_session__with_host_config(self):
+        with patch.dict(
+            transport.settings.REQUEST_TRANSPORT,
+            {"hosts": {"127.0.0.1": {"keep_alive": False, "pool_maxsize": 2, "pool_block": True}}},
+        ):
+            session = transport.new_session(self.base_url)
+            self.assertEqual("close", session.headers["Connection"])
+
+            adapter = session.get_adapter(self.base_url)
+            self.assertEqual(2, adapter._pool_maxsize)
+            self.assertTrue(adapter._pool_block)
+
+            other_session = transport.new_session("https://127.0.0.2")
+            self.assertEqual("keep-alive", other_session.headers["Connection"])
+            self.assertEqual(10, other_session.get_adapter("https://127.0.0.2")._pool_maxsize)
@@ -0,0 +1,64 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from electrum_gui.common.basic.ticker.scheduler import Scheduler
+
+
+class TestScheduler(TestCase):
+    def setUp(self) -> None:
+        self.fake_executor = Mock()
+        self.scheduler = Scheduler(background_factor=5, executor=self.fake_executor)
+
+    @patch("electrum_gui.common.basic.ticker.scheduler.time.time", Mock(return_value=1000))
+    def test_run_pending(self):
+        func = Mock()
+        self.scheduler.register("job_a", func, interval=60, jitter=0.1)
+        self.scheduler.register("job_b", Mock(), interval=60, delay=30)
+
+        with self.subTest("Submit the due jobs only"):
+            self.assertEqual(30, self.scheduler.run_pending(now=1000))
+            self.fake_executor.submit.assert_called_once()
+            _, job = self.fake_executor.submit.call_args[0]
+            self.assertEqual("job_a", job.name)
+            self.assertTrue(1054 <= job.next_run_time <= 1066)
+
+        with self.subTest("Skip the job still running"):
+            self.fake_executor.submit.reset_mock()
+            self.scheduler.run_pending(now=1070)
+            self.fake_executor.submit.assert_called_once()
+            self.assertEqual("job_b", self.fake_executor.submit.call_args[0][1].name)
+            self.assertEqual(1, self.scheduler.get_metrics()["job_a"].skipped)
+
+        with self.subTest("Run the job and record the metrics"):
+            self.scheduler._run_job(job)
+            func.assert_called_once()
+            func.side_effect = ValueError("Boom")
+            self.scheduler._run_job(job)
+
+            metrics = self.scheduler.get_metrics()["job_a"]
+            self.assertEqual(2, metrics.runs)
+            self.assertEqual(1, metrics.failures)
+            self.assertFalse(job.is_running)
+
+        with self.subTest("Unregister the job"):
+            self.scheduler.unregister("job_a")
+            self.assertEqual(["job_b"], list(self.scheduler.get_metrics()))
+
+    @patch("electrum_gui.common.basic.ticker.scheduler.time.time", Mock(return_value=1000))
+    def test_set_foreground(self):
+        self.scheduler.register("job_a", Mock(), interval=60, jitter=0)
+        self.scheduler.register("job_b", Mock(), interval=60, background_interval=120, jitter=0)
+        self.scheduler.run_pending(now=1000)
+        for job in self.scheduler._jobs.values():
+            job.is_running = False
+
+        with self.subTest("Stretch the intervals in background"):
+            self.scheduler.set_foreground(False)
+            self.assertFalse(self.scheduler.is_foreground)
+            self.assertEqual(1300, self.scheduler._jobs["job_a"].next_run_time)
+            self.assertEqual(1120, self.scheduler._jobs["job_b"].next_run_time)
+
+        with self.subTest("Restore the intervals in foreground"):
+            self.scheduler.set_foreground(True)
+            self.assertEqual(1060, self.scheduler._jobs["job_a"].next_run_time)
+            self.assertEqual(1060, self.scheduler._jobs["job_b"].next_run_time)
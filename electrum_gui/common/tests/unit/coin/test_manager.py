@@ -46,6 +46,7 @@ class TestCoinManager(TestCase):
         )
 
     def setUp(self) -> None:
+        manager._load_coin_info.clear()
         self.coin_db_eth_usdc = data.CoinInfo(
             code="eth_usdc",
             chain_code="eth",
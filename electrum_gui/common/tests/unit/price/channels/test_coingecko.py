@@ -1,6 +1,7 @@
 from unittest import TestCase
 from unittest.mock import Mock, call, patch
 
+from electrum_gui.common.basic.functional.throttle import TokenBucket
 from electrum_gui.common.price import data
 from electrum_gui.common.price.channels.coingecko import Coingecko
 
@@ -9,6 +10,10 @@ class TestCoingecko(TestCase):
     def setUp(self) -> None:
         self.cgk = Coingecko()
         self.cgk.restful = Mock()
+        self.cgk.limiter = TokenBucket()
+
+    def test_share_limiter(self):
+        self.assertIs(Coingecko().limiter, Coingecko().limiter)
 
     @patch("electrum_gui.common.conf.chains.get_coingecko_ids")
     def test_pricing_btc(self, fake_get_cgkids):
@@ -120,3 +125,42 @@ class TestCoingecko(TestCase):
                 ),
             ]
         )
+
+    @patch("electrum_gui.common.conf.chains.get_coingecko_id_by_coin_code")
+    def test_fetch_price_history(self, fake_get_cgk_id):
+        fake_get_cgk_id.side_effect = lambda coin_code: {"eth": "ethereum"}.get(coin_code)
+        self.cgk.restful.get.return_value = {"prices": [[1620000000000, 3000.5], [1620003600000, None]]}
+
+        with self.subTest("By coingecko id"):
+            self.assertEqual(
+                [(1620000000, 3000.5)],
+                list(self.cgk.fetch_price_history(Mock(code="eth"), "usd", 1620000000, 1620086399)),
+            )
+            self.cgk.restful.get.assert_called_once_with(
+                "/api/v3/coins/ethereum/market_chart/range",
+                params={"vs_currency": "usd", "from": 1620000000, "to": 1620086399},
+            )
+            self.cgk.restful.get.reset_mock()
+
+        with self.subTest("By erc20 contract"):
+            list(
+                self.cgk.fetch_price_history(
+                    Mock(code="eth_ab", chain_code="eth", token_address="0xAb"), "usd", 1620000000, 1620086399
+                )
+            )
+            self.cgk.restful.get.assert_called_once_with(
+                "/api/v3/coins/ethereum/contract/0xab/market_chart/range",
+                params={"vs_currency": "usd", "from": 1620000000, "to": 1620086399},
+            )
+            self.cgk.restful.get.reset_mock()
+
+        with self.subTest("Not supported"):
+            self.assertEqual(
+                [],
+                list(
+                    self.cgk.fetch_price_history(
+                        Mock(code="bsc_ab", chain_code="bsc", token_address="0xab"), "usd", 1620000000, 1620086399
+                    )
+                ),
+            )
+            self.cgk.restful.get.assert_not_called()
@@ -0,0 +1,36 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from electrum_gui.common.price.graph import PriceGraph
+
+
+class TestPriceGraph(TestCase):
+    def test_get_price(self):
+        graph = PriceGraph(
+            {
+                ("btc", "usd"): Decimal(50000),
+                ("eth", "usd"): Decimal(4000),
+                ("eth", "btc"): Decimal("0.1"),
+                ("eth_token", "eth"): Decimal("0.5"),
+                ("bsc", "btc"): Decimal("0.01"),
+                ("bsc", "eth"): Decimal("0.1"),
+                ("bsc_token", "bsc"): Decimal(2),
+                ("eth", "cny"): Decimal(26000),
+                ("sol", "usd"): Decimal(100),
+                ("zero", "usd"): Decimal(0),
+            }
+        )
+
+        self.assertEqual(Decimal(1), graph.get_price("ETH", "eth"))
+        self.assertEqual(Decimal(4000), graph.get_price("eth", "usd"))
+        self.assertEqual(Decimal("0.00025"), graph.get_price("usd", "eth"))  # by the reversed price
+        self.assertEqual(Decimal(10), graph.get_price("btc", "eth"))
+        self.assertEqual(Decimal(2000), graph.get_price("eth_token", "usd"))
+        self.assertEqual(Decimal(500), graph.get_price("bsc", "usd"))  # via btc rather than eth
+        self.assertEqual(Decimal(1000), graph.get_price("bsc_token", "usd"))
+        self.assertEqual(Decimal(13000), graph.get_price("eth_token", "cny"))
+        self.assertEqual(Decimal(2600), graph.get_price("bsc", "cny"))  # via eth, as btc has no cny price
+        self.assertIsNone(graph.get_price("btc", "eur"))
+        self.assertIsNone(graph.get_price("zero", "usd"))
+        self.assertEqual(Decimal("6.5"), graph.get_price("usd", "cny"))
+        self.assertIsNone(graph.get_price("sol", "cny"))  # never via the fiat
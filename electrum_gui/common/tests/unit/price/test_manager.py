@@ -1,12 +1,12 @@
 import decimal
 from unittest import TestCase
-from unittest.mock import Mock, call, patch
+from unittest.mock import Mock, patch
 
 from electrum_gui.common.basic.orm import test_utils
 from electrum_gui.common.price import daos, data, manager, models
 
 
-@test_utils.cls_test_database(models.Price)
+@test_utils.cls_test_database(models.Price, models.PriceHistory)
 class TestPriceManager(TestCase):
     @patch("electrum_gui.common.price.manager._registry")
     @patch("electrum_gui.common.price.manager.coin_manager")
@@ -21,58 +21,86 @@ class TestPriceManager(TestCase):
                 data.YieldedPrice("btc", 123456, "usd"),
                 data.YieldedPrice("eth", 12345, "usd"),
             ]
-            fake_registry.items.return_value = [(data.Channel.CGK, lambda: fake_channel)]
+
+            def _fake_uniswap_pricing(coins):
+                yield data.YieldedPrice("eth_token", 0.5, "eth")
+                raise ValueError()
+
+            fake_uniswap_channel = Mock()
+            fake_uniswap_channel.pricing.side_effect = _fake_uniswap_pricing
+            fake_registry.items.return_value = [
+                (data.Channel.CGK, lambda: fake_channel),
+                (data.Channel.UNISWAP, lambda: fake_uniswap_channel),
+            ]
+            fake_daos.load_all_pair_prices.return_value = {("btc", "usd"): 123456, ("eth", "usd"): 12345}
 
             manager.pricing()
 
             fake_coin_manager.get_all_coins.assert_called_once()
             fake_coin_manager.query_coins_by_codes.assert_not_called()
-            fake_daos.create_or_update.assert_has_calls(
+            fake_daos.bulk_upsert.assert_called_once_with(
                 [
-                    call(
-                        coin_code="btc",
-                        unit="usd",
-                        channel=data.Channel.CGK,
-                        price=123456,
-                    ),
-                    call(
-                        coin_code="eth",
-                        unit="usd",
-                        channel=data.Channel.CGK,
-                        price=12345,
-                    ),
+                    ("btc", "usd", data.Channel.CGK, 123456),
+                    ("eth", "usd", data.Channel.CGK, 12345),
+                    ("eth_token", "eth", data.Channel.UNISWAP, 0.5),
                 ]
             )
+            self.assertEqual(2, manager.get_channel_metrics()[data.Channel.CGK].count)
+            self.assertIsNone(manager.get_channel_metrics()[data.Channel.CGK].error)
+            self.assertEqual(1, manager.get_channel_metrics()[data.Channel.UNISWAP].count)
+            self.assertEqual("ValueError()", manager.get_channel_metrics()[data.Channel.UNISWAP].error)
+            fake_daos.load_all_pair_prices.assert_called_once()
+            self.assertEqual(12345, manager.get_last_price("eth", "usd"))
             fake_coin_manager.get_all_coins.reset_mock()
-            fake_daos.create_or_update.reset_mock()
+            fake_daos.bulk_upsert.reset_mock()
+            fake_daos.load_all_pair_prices.reset_mock()
 
         with self.subTest("Price specific coins"):
             fake_coin_manager.query_coins_by_codes.return_value = []
             manager.pricing(["btc", "eth", "bsc"])
             fake_coin_manager.query_coins_by_codes.assert_called_once_with(["btc", "eth", "bsc"])
             fake_coin_manager.get_all_coins.assert_not_called()
-            fake_daos.create_or_update.assert_not_called()
+            fake_daos.bulk_upsert.assert_not_called()
+            fake_daos.load_all_pair_prices.assert_not_called()
 
-    @patch("electrum_gui.common.price.manager.coin_manager")
-    def test_get_last_price(self, fake_coin_manager):
+    def test_bulk_upsert(self):
+        daos.bulk_upsert([("btc", "usd", data.Channel.CGK, decimal.Decimal(100))])
+        last_modified_time = models.Price.get(coin_code="btc").modified_time
+
+        self.assertEqual(
+            3,
+            daos.bulk_upsert(
+                [
+                    ("btc", "usd", data.Channel.CGK, decimal.Decimal(110)),
+                    ("btc", "usd", data.Channel.UNISWAP, decimal.Decimal(120)),
+                    ("eth", "usd", data.Channel.CGK, decimal.Decimal(10)),
+                    ("eth", "usd", data.Channel.CGK, decimal.Decimal(11)),
+                ]
+            ),
+        )
+        self.assertEqual(3, models.Price.select().count())
+        self.assertEqual(110, daos.get_last_price("btc", "usd", channel=data.Channel.CGK))
+        self.assertEqual(11, daos.get_last_price("eth", "usd"))
+        self.assertLess(last_modified_time, models.Price.get(coin_code="btc", channel=data.Channel.CGK).modified_time)
+        self.assertEqual({("btc", "usd"): 120, ("eth", "usd"): 11}, daos.load_all_pair_prices())
+
+    def test_get_last_price(self):
         # create fake pricing table
         # btc: 120000 usd,
         # eth: 15000 usd, eth_cc: 15
         # bsc: 120 usd, bsc_cc: 12
-        daos.create_or_update("btc", "usd", data.Channel.CGK, decimal.Decimal(120000))
-        daos.create_or_update("btc", "cny", data.Channel.CGK, decimal.Decimal(780000))
-        daos.create_or_update("eth", "usd", data.Channel.CGK, decimal.Decimal(15000))
-        daos.create_or_update("eth_cc", "eth", data.Channel.CGK, decimal.Decimal(0.001))
-        daos.create_or_update("bsc", "btc", data.Channel.CGK, decimal.Decimal(0.001))
-        daos.create_or_update("bsc_cc", "bsc", data.Channel.CGK, decimal.Decimal(0.1))
-
-        fake_coin_manager.get_coin_info.side_effect = lambda code, nullable: {
-            "btc": Mock(code="btc", chain_code="btc"),
-            "eth": Mock(code="eth", chain_code="eth"),
-            "eth_cc": Mock(code="eth_cc", chain_code="eth"),
-            "bsc": Mock(code="bsc", chain_code="bsc"),
-            "bsc_cc": Mock(code="bsc_cc", chain_code="bsc"),
-        }.get(code)
+        daos.bulk_upsert(
+            [
+                ("btc", "usd", data.Channel.CGK, decimal.Decimal(120000)),
+                ("btc", "cny", data.Channel.CGK, decimal.Decimal(780000)),
+                ("eth", "usd", data.Channel.CGK, decimal.Decimal(15000)),
+                ("eth_cc", "eth", data.Channel.CGK, decimal.Decimal(0.001)),
+                ("bsc", "btc", data.Channel.CGK, decimal.Decimal(0.001)),
+                ("bsc_cc", "bsc", data.Channel.CGK, decimal.Decimal(0.1)),
+            ]
+        )
+
+        manager._rebuild_price_graph()
 
         self.assertEqual(120000, manager.get_last_price("btc", "usd"))
         self.assertEqual(15000, manager.get_last_price("eth", "usd"))
@@ -85,3 +113,82 @@ class TestPriceManager(TestCase):
         self.assertEqual(78, manager.get_last_price("bsc_cc", "cny"))
         self.assertEqual(0, manager.get_last_price("bsc_abc", "usd"))
         self.assertEqual(111, manager.get_last_price("bsc_abc", "usd", default=decimal.Decimal(111)))
+
+        with self.subTest("Rebuilt after pricing only"):
+            daos.bulk_upsert([("eth", "cny", data.Channel.CGK, decimal.Decimal(97500))])
+            self.assertEqual(0, manager.get_last_price("eth", "cny"))
+            manager._rebuild_price_graph()
+            self.assertEqual(97500, manager.get_last_price("eth", "cny"))
+
+        with self.subTest("Get prices in bulk"):
+            self.assertEqual(
+                {"btc": 780000, "eth": 97500, "bsc_cc": 78, "bsc_abc": 0},
+                manager.get_last_prices(["btc", "eth", "bsc_cc", "bsc_abc"], "cny"),
+            )
+
+    @patch("electrum_gui.common.price.manager.time")
+    @patch("electrum_gui.common.price.manager.coin_manager")
+    def test_backfill_price_history(self, fake_coin_manager, fake_time):
+        day = 24 * 60 * 60
+        today = 1620000000 // day * day
+        fake_time.time.return_value = today + 100
+        fake_coin = Mock(code="eth")
+        fake_coin_manager.get_coin_info.return_value = fake_coin
+        fake_channel = Mock()
+        fake_channel.fetch_price_history.return_value = [
+            (today - 2 * day, 10),
+            (today - 2 * day + 3600, 12),
+            (today - 2 * day + 7200, 9),
+            (today - 2 * day + 10800, 11),
+            (today - day + 3600, 20),
+            (today, 30),  # today is ignored
+        ]
+
+        with self.subTest("Backfill"):
+            self.assertEqual(2, manager.backfill_price_history("ETH", "USD", days=3, channel=fake_channel))
+            fake_coin_manager.get_coin_info.assert_called_once_with("eth", nullable=True)
+            fake_channel.fetch_price_history.assert_called_once_with(fake_coin, "usd", today - 3 * day, today - 1)
+            self.assertEqual(
+                [(today - 2 * day, 10, 12, 9, 11), (today - day, 20, 20, 20, 20)],
+                [(i.day, i.open, i.high, i.low, i.close) for i in daos.load_price_history("eth", "usd")],
+            )
+            self.assertEqual({("eth", "usd")}, daos.query_series_of_price_history())
+
+        with self.subTest("Nothing to backfill within the day"):
+            fake_channel.fetch_price_history.reset_mock()
+            self.assertEqual(0, manager.backfill_price_history("eth", "usd", days=3, channel=fake_channel))
+            fake_channel.fetch_price_history.assert_not_called()
+
+        with self.subTest("Backfill since the last day"):
+            fake_time.time.return_value = today + day + 100
+            fake_channel.fetch_price_history.return_value = [(today + 100, 30)]
+            self.assertEqual(1, manager.backfill_price_history("eth", "usd", days=3, channel=fake_channel))
+            fake_channel.fetch_price_history.assert_called_once_with(fake_coin, "usd", today, today + day - 1)
+
+    @patch("electrum_gui.common.price.manager.time")
+    def test_get_prices_at(self, fake_time):
+        day = 24 * 60 * 60
+        fake_time.time.return_value = 10 * day
+        daos.bulk_upsert([("eth", "usd", data.Channel.CGK, decimal.Decimal(40))])
+        manager._rebuild_price_graph()
+
+        with self.subTest("The last price before the history is ready"):
+            self.assertEqual([40, 40], manager.get_prices_at("eth", "usd", [day, 2 * day]))
+            self.assertEqual([], manager.get_prices_at("eth", "usd", []))
+            self.assertEqual(7, manager.get_price_at("btc", "usd", day, default=decimal.Decimal(7)))
+            self.assertIn(("btc", "usd"), manager._TRACKED_PRICE_HISTORIES)
+
+        daos.bulk_insert_price_history(
+            [
+                dict(coin_code="eth", unit="usd", day=7 * day, open=8, high=12, low=8, close=10),
+                dict(coin_code="eth", unit="usd", day=8 * day, open=10, high=20, low=10, close=20),
+            ]
+        )
+        self.assertEqual(
+            [8, 8, 9, 10, 15, 20, 30, 40, 40],
+            manager.get_prices_at(
+                "ETH",
+                "USD",
+                [0, 7 * day, int(7.5 * day), 8 * day, int(8.5 * day), 9 * day, int(9.5 * day), 10 * day, 11 * day],
+            ),
+        )
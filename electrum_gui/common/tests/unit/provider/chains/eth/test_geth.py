@@ -0,0 +1,191 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import eth_abi
+
+from electrum_gui.common.basic.request.exceptions import JsonRPCException
+from electrum_gui.common.provider.chains.eth.clients.geth import Geth
+from electrum_gui.common.provider.exceptions import TooManyTransferLogs
+
+
+class TestGeth(TestCase):
+    def setUp(self) -> None:
+        self.pairs = [
+            ("0x" + "11" * 20, None),
+            ("0x" + "11" * 20, "0x" + "aa" * 20),
+            ("0x" + "22" * 20, "0x" + "bb" * 20),
+        ]
+
+    @patch("electrum_gui.common.provider.chains.eth.clients.geth.JsonRPCRequest")
+    def test_batch_get_balance__by_multicall(self, fake_rpc_creator):
+        fake_rpc = Mock()
+        fake_rpc_creator.return_value = fake_rpc
+        fake_rpc.call.return_value = (
+            "0x"
+            + eth_abi.encode_single(
+                "(bool,bytes)[]", [(True, (10).to_bytes(32, "big")), (True, b""), (False, b"")]
+            ).hex()
+        )
+
+        geth = Geth("https://geth.com", multicall_address="0x" + "cc" * 20)
+        self.assertEqual([10, 0, None], geth.batch_get_balance(self.pairs))
+
+        fake_rpc.call.assert_called_once()
+        method, (call_data, block) = fake_rpc.call.call_args[0]
+        self.assertEqual(("eth_call", "latest"), (method, block))
+        self.assertEqual("0x" + "cc" * 20, call_data["to"])
+        self.assertTrue(call_data["data"].startswith("0xbce38bd7"))
+        fake_rpc.batch_call.assert_not_called()
+
+    @patch("electrum_gui.common.provider.chains.eth.clients.geth.JsonRPCRequest")
+    def test_batch_get_balance__by_rpc_batch(self, fake_rpc_creator):
+        fake_rpc = Mock()
+        fake_rpc_creator.return_value = fake_rpc
+        fake_rpc.call.side_effect = JsonRPCException("execution reverted")
+        fake_rpc.batch_call.return_value = ["0xa", "0x" + "0" * 63 + "b", None]
+
+        with self.subTest("Fallback if failed to call multicall"):
+            geth = Geth("https://geth.com", multicall_address="0x" + "cc" * 20)
+            self.assertEqual([10, 11, None], geth.batch_get_balance(self.pairs))
+            fake_rpc.batch_call.assert_called_once_with(
+                [
+                    ("eth_getBalance", ["0x" + "11" * 20, "latest"]),
+                    ("eth_call", [{"to": "0x" + "aa" * 20, "data": "0x70a08231" + "0" * 24 + "11" * 20}, "latest"]),
+                    ("eth_call", [{"to": "0x" + "bb" * 20, "data": "0x70a08231" + "0" * 24 + "22" * 20}, "latest"]),
+                ],
+                ignore_errors=True,
+                timeout=10,
+            )
+            fake_rpc.call.reset_mock()
+            fake_rpc.batch_call.reset_mock()
+
+        with self.subTest("No multicall configured"):
+            geth = Geth("https://geth.com")
+            self.assertEqual([10, 11, None], geth.batch_get_balance(self.pairs))
+            fake_rpc.call.assert_not_called()
+            fake_rpc.batch_call.assert_called_once()
+            fake_rpc.batch_call.reset_mock()
+
+        with self.subTest("Chunked"), patch.object(Geth, "__BATCH_BALANCE_CHUNK_SIZE__", 2):
+            geth = Geth("https://geth.com")
+            fake_rpc.batch_call.side_effect = [["0x1", "0x2"], ["0x3"]]
+            self.assertEqual([1, 2, 3], geth.batch_get_balance(self.pairs))
+            self.assertEqual(2, fake_rpc.batch_call.call_count)
+
+    @patch("electrum_gui.common.provider.chains.eth.clients.geth.JsonRPCRequest")
+    def test_batch_get_transaction_by_txid(self, fake_rpc_creator):
+        fake_rpc = Mock()
+        fake_rpc_creator.return_value = fake_rpc
+
+        def _tx(txid: str) -> dict:
+            return {
+                "hash": txid,
+                "from": "0x" + "AA" * 20,
+                "to": "0x" + "bb" * 20,
+                "value": "0xa",
+                "gas": "0x5208",
+                "gasPrice": "0x1",
+                "nonce": "0x3",
+            }
+
+        fake_rpc.batch_call.side_effect = [
+            [
+                _tx("0x01"),
+                {"blockNumber": "0x10", "status": "0x1", "gasUsed": "0x5000"},
+                _tx("0x02"),
+                None,
+                None,
+                None,
+                _tx("0x04"),
+                {"blockNumber": "0x10", "status": "0x0", "gasUsed": "0x5208"},
+            ],
+            [{"hash": "0xb10", "number": "0x10", "timestamp": "0x5f5e1000"}],
+        ]
+
+        txs = Geth("https://geth.com").batch_get_transaction_by_txid(["0x01", "0x02", "0x03", "0x04"])
+        self.assertEqual(
+            [("0x01", "CONFIRM_SUCCESS", 0x5000, 16), ("0x02", "PENDING", 0x5208, None), None],
+            [
+                (i.txid, i.status.name, i.fee.used, i.block_header and i.block_header.block_number) if i else None
+                for i in txs[:3]
+            ],
+        )
+        self.assertEqual("CONFIRM_REVERTED", txs[3].status.name)
+        self.assertEqual("0x" + "aa" * 20, txs[0].inputs[0].address)
+        self.assertEqual(2, fake_rpc.batch_call.call_count)
+        self.assertEqual([("eth_getBlockByNumber", ["0x10", False])], fake_rpc.batch_call.call_args_list[1][0][0])
+
+    @patch("electrum_gui.common.provider.chains.eth.clients.geth.JsonRPCRequest")
+    def test_search_token_transfer_logs(self, fake_rpc_creator):
+        fake_rpc = Mock()
+        fake_rpc_creator.return_value = fake_rpc
+        address_a, address_b = "0x" + "aa" * 20, "0x" + "bb" * 20
+
+        def _log(block_number: int, log_index: int, from_address: str, to_address: str, **kwargs) -> dict:
+            return {
+                "transactionHash": f"0x{block_number:02x}",
+                "blockNumber": hex(block_number),
+                "logIndex": hex(log_index),
+                "address": "0x" + "CC" * 20,
+                "topics": [
+                    Geth.__TRANSFER_TOPIC__,
+                    "0x" + "0" * 24 + from_address[2:],
+                    "0x" + "0" * 24 + to_address[2:],
+                ],
+                "data": "0x" + (10).to_bytes(32, "big").hex(),
+                **kwargs,
+            }
+
+        self_transfer = _log(3, 1, address_a, address_a)
+        erc721_transfer = _log(3, 2, address_a, address_b)
+        erc721_transfer["topics"].append("0x01")
+        fake_rpc.batch_call.return_value = [
+            [
+                _log(2, 0, address_a, address_b),
+                self_transfer,
+                erc721_transfer,
+                _log(4, 0, address_a, address_b, removed=True),
+            ],
+            [self_transfer, _log(1, 5, address_b, address_a)],
+        ]
+
+        logs = Geth("https://geth.com").search_token_transfer_logs([address_a], 1, 10)
+        self.assertEqual([(1, 5), (2, 0), (3, 1)], [(i.block_number, i.log_index) for i in logs])
+        self.assertEqual(
+            ("0x01", "0x" + "cc" * 20, address_b, address_a, 10),
+            (logs[0].txid, logs[0].token_address, logs[0].from_address, logs[0].to_address, logs[0].value),
+        )
+        calls = fake_rpc.batch_call.call_args[0][0]
+        self.assertEqual(
+            {
+                "fromBlock": "0x1",
+                "toBlock": "0xa",
+                "topics": [Geth.__TRANSFER_TOPIC__, None, ["0x" + "0" * 24 + "aa" * 20]],
+            },
+            calls[1][1][0],
+        )
+
+        with self.subTest("Too many logs"):
+            fake_rpc.batch_call.side_effect = JsonRPCException(
+                "Error at the 0 response of batch. error: {'code': -32005, 'message': 'query returned more than 10000 results'}"
+            )
+            with self.assertRaises(TooManyTransferLogs):
+                Geth("https://geth.com").search_token_transfer_logs([address_a], 1, 10)
+
+        with self.subTest("Too many logs by error code"):
+            error = {"code": -32005, "message": "please limit the query to at most 1000 blocks"}
+            fake_rpc.batch_call.side_effect = JsonRPCException(
+                f"Error at the 0 response of batch. error: {error}", json_response={"error": error}
+            )
+            with self.assertRaises(TooManyTransferLogs):
+                Geth("https://geth.com").search_token_transfer_logs([address_a], 1, 10)
+
+        with self.subTest("Other errors"):
+            for message in (
+                "Json RPC call failed.",
+                "Error at the 0 response of batch. error: {'code': -32000, 'message': 'rate limit exceeded'}",
+                "Error at the 0 response of batch. error: {'code': -32000, 'message': 'daily request count exceeded'}",
+            ):
+                fake_rpc.batch_call.side_effect = JsonRPCException(message)
+                with self.assertRaises(JsonRPCException):
+                    Geth("https://geth.com").search_token_transfer_logs([address_a], 1, 10)
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import Mock
+
+from electrum_gui.common.provider import adapters, data, interfaces
+
+
+class _FakeClient(interfaces.ClientInterface, interfaces.SearchTransactionMixin):
+    get_info = Mock(return_value=data.ClientInfo(name="fake", best_block_number=1, is_ready=True))
+    get_transaction_by_txid = Mock()
+    broadcast_transaction = Mock()
+    get_prices_per_unit_of_fee = Mock()
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def get_address(self, address: str) -> data.Address:
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.running, self.max_running)
+
+        time.sleep(0.05)
+
+        with self.lock:
+            self.running -= 1
+
+        return data.Address(address=address, balance=len(address), existing=True)
+
+    def search_txs_by_address(self, address, paginate=None):
+        return [address]
+
+
+class TestAsyncClientAdapter(TestCase):
+    def test_adapter(self):
+        client = _FakeClient()
+        adapter = adapters.AsyncClientAdapter(client)
+
+        self.assertTrue(asyncio.run(adapter.is_ready()))
+        self.assertEqual(3, asyncio.run(adapter.get_balance("abc")))
+        self.assertEqual(["abc"], asyncio.run(adapter.search_txs_by_address("abc")))
+        self.assertEqual(
+            [data.Address(address=i, balance=len(i), existing=True) for i in ("a", "bb")],
+            asyncio.run(adapter.batch_get_address(["a", "bb"])),
+        )
+
+    def test_gather_with_concurrency(self):
+        client = _FakeClient()
+        adapter = adapters.AsyncClientAdapter(client)
+
+        balances = asyncio.run(
+            adapters.gather_with_concurrency((adapter.get_balance("a" * i) for i in range(1, 9)), concurrency=3)
+        )
+        self.assertEqual(list(range(1, 9)), balances)
+        self.assertEqual(3, client.max_running)
+
+    def test_gather_with_concurrency__return_exceptions(self):
+        async def _raise():
+            raise ValueError("oops")
+
+        async def _ok():
+            return 1
+
+        results = asyncio.run(adapters.gather_with_concurrency([_ok(), _raise()], return_exceptions=True))
+        self.assertEqual(1, results[0])
+        self.assertIsInstance(results[1], ValueError)
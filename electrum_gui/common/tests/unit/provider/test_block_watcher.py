@@ -0,0 +1,56 @@
+from unittest import TestCase
+from unittest.mock import Mock, call, patch
+
+from electrum_gui.common.basic.functional.signal import Signal
+from electrum_gui.common.provider.block_watcher import BlockWatcher
+
+
+class TestBlockWatcher(TestCase):
+    @patch("electrum_gui.common.provider.block_watcher.time.time", return_value=1000)
+    @patch("electrum_gui.common.provider.block_watcher.provider_manager")
+    def test_poll(self, fake_provider_manager, fake_time):
+        best_block_numbers = {"eth": 100, "bsc": 200}
+        fake_provider_manager.get_best_block_number.side_effect = lambda chain_code: best_block_numbers[chain_code]
+        chain_codes = ["eth", "bsc"]
+        receiver = Mock()
+        signal = Signal("test_new_block")
+        signal.connect(receiver)
+        watcher = BlockWatcher(lambda: chain_codes, signal=signal)
+
+        with self.subTest("Notify at the first time"):
+            watcher.poll()
+            receiver.assert_has_calls(
+                [call(chain_code="bsc", block_number=200), call(chain_code="eth", block_number=100)]
+            )
+            self.assertEqual(2, receiver.call_count)
+
+        with self.subTest("Only notify the advanced chain"):
+            receiver.reset_mock()
+            best_block_numbers["eth"] = 101
+            watcher.poll()
+            receiver.assert_called_once_with(chain_code="eth", block_number=101)
+            self.assertEqual({"eth": 1000, "bsc": 1000}, watcher.last_new_block_times)
+
+        with self.subTest("Record the time of the advanced chain only"):
+            receiver.reset_mock()
+            fake_time.return_value = 1005
+            best_block_numbers["eth"] = 102
+            watcher.poll()
+            self.assertEqual({"eth": 1005, "bsc": 1000}, watcher.last_new_block_times)
+
+        with self.subTest("Keep watching other chains if failed"):
+            receiver.reset_mock()
+            best_block_numbers.pop("bsc")
+            best_block_numbers["eth"] = 103
+            watcher.poll()
+            receiver.assert_called_once_with(chain_code="eth", block_number=103)
+
+        with self.subTest("Stop watching"):
+            receiver.reset_mock()
+            chain_codes.clear()
+            watcher.poll()
+            receiver.assert_not_called()
+            self.assertEqual({}, watcher.last_new_block_times)
+            fake_provider_manager.get_best_block_number.reset_mock()
+            watcher.poll()
+            fake_provider_manager.get_best_block_number.assert_not_called()
@@ -0,0 +1,131 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from electrum_gui.common.basic.cache.memory import MemoryCache
+from electrum_gui.common.basic.cache.sqlite import SqliteCache
+from electrum_gui.common.provider import data, manager
+from electrum_gui.common.provider.cache import ResponseCache
+
+
+class TestResponseCache(TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.response_cache = ResponseCache(
+            MemoryCache(max_size=16), SqliteCache(os.path.join(self.temp_dir.name, "cache.sqlite"))
+        )
+        self.patchers = [
+            patch("electrum_gui.common.provider.manager.get_response_cache", return_value=self.response_cache),
+            patch("electrum_gui.common.provider.cache.get_response_cache", return_value=self.response_cache),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self) -> None:
+        for patcher in self.patchers:
+            patcher.stop()
+        self.temp_dir.cleanup()
+
+    def test_tiers(self):
+        key = ("eth", "get_token_info_by_address", ("0xa",), ())
+        self.response_cache.set(key, ("USDT", "Tether USD", 6), persist=True)
+        self.response_cache.memory.clear()
+
+        self.assertEqual(("USDT", "Tether USD", 6), self.response_cache.get(key, persist=True))
+        self.assertEqual(1, len(self.response_cache.memory))
+        self.assertEqual(1, manager.get_cache_stats()["get_token_info_by_address"].hits)
+
+    @patch("electrum_gui.common.basic.cache.sqlite.time")
+    def test_purge(self, fake_time):
+        fake_time.time.return_value = 1000
+        self.response_cache.disk.ttl, self.response_cache.disk.max_rows = 10, 1
+        for key in ("a", "b", "c"):
+            self.response_cache.set(key, key, persist=True)
+        self.response_cache.set("d", "d", ttl=5, persist=True)
+
+        fake_time.time.return_value = 1008
+        self.response_cache.purge()
+        self.assertEqual([("'c'",)], self.response_cache.disk.db.execute_sql("SELECT key FROM cache").fetchall())
+
+    @patch("electrum_gui.common.provider.manager.loader")
+    def test_get_transaction_by_txid(self, fake_loader):
+        pending_tx = data.Transaction(txid="0x1", status=data.TransactionStatus.PENDING)
+        confirmed_tx = pending_tx.clone(
+            status=data.TransactionStatus.CONFIRM_SUCCESS,
+            block_header=data.BlockHeader(block_hash="0xb", block_number=100, block_time=1600000000),
+        )
+        fake_loader.get_client_by_chain.return_value.get_info.return_value = Mock(best_block_number=105)
+
+        with self.subTest("Pending tx is never cached"):
+            fake_loader.call_with_hedging.return_value = pending_tx
+            self.assertEqual(pending_tx, manager.get_transaction_by_txid("eth", "0x1"))
+            self.assertEqual(pending_tx, manager.get_transaction_by_txid("eth", "0x1"))
+            self.assertEqual(2, fake_loader.call_with_hedging.call_count)
+
+        with self.subTest("Not enough confirmations"):
+            fake_loader.call_with_hedging.reset_mock()
+            fake_loader.call_with_hedging.return_value = confirmed_tx
+            manager.get_transaction_by_txid("eth", "0x1")
+            manager.get_transaction_by_txid("eth", "0x1")
+            self.assertEqual(2, fake_loader.call_with_hedging.call_count)
+            fake_loader.get_client_by_chain.return_value.get_info.assert_called_once()
+
+        with self.subTest("Finalized tx is cached on disk"):
+            fake_loader.call_with_hedging.reset_mock()
+            fake_loader.get_client_by_chain.return_value.get_info.return_value = Mock(best_block_number=111)
+            self.response_cache.memory.clear()  # expire the cached best block number
+            manager.get_transaction_by_txid("eth", "0x1")
+            self.response_cache.memory.clear()
+            self.assertEqual(confirmed_tx, manager.get_transaction_by_txid("eth", "0x1"))
+            fake_loader.call_with_hedging.assert_called_once_with("eth", "get_transaction_by_txid", "0x1")
+
+        stats = manager.get_cache_stats()
+        self.assertEqual(1, stats["get_transaction_by_txid"].hits)
+        self.assertEqual(5, stats["get_transaction_by_txid"].misses)
+
+    @patch("electrum_gui.common.provider.manager.loader")
+    def test_get_balance(self, fake_loader):
+        fake_loader.call_with_hedging.return_value = 10
+
+        with patch("electrum_gui.common.basic.cache.memory.time") as fake_time:
+            fake_time.time.return_value = 1000
+            self.assertEqual(10, manager.get_balance("eth", "0xa"))
+            self.assertEqual(10, manager.get_balance("eth", "0xa"))
+            self.assertEqual(10, manager.get_balance("eth", "0xa", token_address=None))
+            self.assertEqual(10, manager.get_balance("eth", "0xa", token_address="0xb"))
+            self.assertEqual(10, manager.get_balance("eth", "0xa", "0xb"))
+            self.assertEqual(10, manager.get_balance("eth", address="0xa", token_address="0xb"))
+            self.assertEqual(2, fake_loader.call_with_hedging.call_count)
+
+            fake_time.time.return_value = 1005
+            fake_loader.call_with_hedging.return_value = 11
+            self.assertEqual(11, manager.get_balance("eth", "0xa"))
+            self.assertEqual(3, fake_loader.call_with_hedging.call_count)
+
+        with patch.dict("electrum_gui.common.conf.settings.PROVIDER_CACHE", {"enabled": False}):
+            manager.get_balance("eth", "0xa")
+            self.assertEqual(4, fake_loader.call_with_hedging.call_count)
+
+    @patch("electrum_gui.common.provider.manager.loader")
+    def test_get_transactions_by_txids(self, fake_loader):
+        finalized_tx = data.Transaction(
+            txid="0x1",
+            status=data.TransactionStatus.CONFIRM_SUCCESS,
+            block_header=data.BlockHeader(block_hash="0xb", block_number=100, block_time=1600000000, confirmations=12),
+        )
+        pending_tx = data.Transaction(txid="0x2", status=data.TransactionStatus.PENDING)
+        fake_client = fake_loader.get_client_by_chain.return_value
+        fake_client.batch_get_transaction_by_txid.return_value = [finalized_tx, pending_tx, None]
+
+        self.assertEqual(
+            [finalized_tx, pending_tx, None, finalized_tx],
+            manager.get_transactions_by_txids("eth", ["0x1", "0x2", "0x3", "0x1"]),
+        )
+        fake_client.batch_get_transaction_by_txid.assert_called_once_with(["0x1", "0x2", "0x3"])
+
+        fake_client.batch_get_transaction_by_txid.return_value = [pending_tx]
+        self.assertEqual([finalized_tx, pending_tx], manager.get_transactions_by_txids("eth", ["0x1", "0x2"]))
+        fake_client.batch_get_transaction_by_txid.assert_called_with(["0x2"])
+        self.assertEqual(finalized_tx, manager.get_transaction_by_txid("eth", "0x1"))
+        fake_loader.call_with_hedging.assert_not_called()
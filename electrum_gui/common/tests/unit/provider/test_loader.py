@@ -0,0 +1,168 @@
+import time
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from electrum_gui.common.basic.request.exceptions import JsonRPCException, RequestException, ResponseException
+from electrum_gui.common.provider import data, exceptions, interfaces, loader
+
+
+class _FakeClient(interfaces.ClientInterface):
+    def __init__(self, name: str, latency: float = 0, is_ready: bool = True):
+        self.name = name
+        self.latency = latency
+        self.ready = is_ready
+        self.calls = 0
+
+    def get_info(self) -> data.ClientInfo:
+        if not self.ready:
+            raise RequestException()
+
+        return data.ClientInfo(name=self.name, best_block_number=1, is_ready=True)
+
+    def get_address(self, address: str) -> data.Address:
+        self.calls += 1
+        time.sleep(self.latency)
+        return data.Address(address=address, balance=len(self.name), existing=True)
+
+    def get_transaction_by_txid(self, txid: str) -> data.Transaction:
+        raise RequestException()
+
+    def get_transaction_status(self, txid: str) -> data.TransactionStatus:
+        raise ResponseException("Too many requests", Mock(status_code=429, headers={"Retry-After": "60"}))
+
+    def broadcast_transaction(self, raw_tx: str) -> data.TxBroadcastReceipt:
+        raise JsonRPCException("Error at the RPC response. error: nonce too low")
+
+    def get_prices_per_unit_of_fee(self) -> data.PricesPerUnit:
+        try:
+            self.get_transaction_status("a")
+        except ResponseException as e:  # likes the json rpc request wrapping the 429 response of geth
+            raise JsonRPCException(f"Error at the RPC response. error: {e}")
+
+
+class TestLoader(TestCase):
+    def setUp(self) -> None:
+        loader._CANDIDATE_CLIENTS_CACHE.clear()
+        loader._CLIENT_HEALTHS.clear()
+
+    def tearDown(self) -> None:
+        loader._CANDIDATE_CLIENTS_CACHE.clear()
+        loader._CLIENT_HEALTHS.clear()
+
+    @patch("electrum_gui.common.provider.loader._load_clients_by_chain")
+    def test_get_client_by_chain(self, fake_load_clients):
+        slow, fast, dead = _FakeClient("slow", latency=0.05), _FakeClient("fast"), _FakeClient("dead", is_ready=False)
+        fake_load_clients.return_value = [dead, slow, fast]
+
+        with self.subTest("Skip the dead client"):
+            self.assertIn(loader.get_client_by_chain("eth"), (slow, fast))
+
+        with self.subTest("Prefer the faster client"):
+            for client in (slow, fast):
+                client.get_address("a")
+
+            self.assertIs(fast, loader.get_client_by_chain("eth"))
+
+        with self.subTest("Prefer the stable client"):
+            for _ in range(5):
+                with self.assertRaises(RequestException):
+                    fast.get_transaction_by_txid("a")
+
+            self.assertIs(slow, loader.get_client_by_chain("eth"))
+
+        with self.subTest("Get stats"):
+            stats = {i.name: i for i in loader.get_client_stats("eth")}
+            self.assertEqual({"eth:_FakeClient"}, set(stats.keys()))
+
+        with self.subTest("No available client"):
+            slow.ready = fast.ready = False
+            with self.assertRaises(exceptions.NoAvailableClient):
+                loader.get_client_by_chain("eth", force_update=True)
+
+    @patch("electrum_gui.common.provider.loader._load_clients_by_chain")
+    def test_get_client_by_chain__probing(self, fake_load_clients):
+        stuck, fast = _FakeClient("stuck"), _FakeClient("fast")
+        stuck.get_info = lambda: time.sleep(0.5) or _FakeClient.get_info(stuck)
+        fake_load_clients.return_value = [stuck, fast]
+
+        start_time = time.time()
+        self.assertIs(fast, loader.get_client_by_chain("eth"))
+        self.assertLess(time.time() - start_time, 0.4)  # not wait for the stuck one
+
+        loader.get_client_by_chain("eth", force_update=True)
+        self.assertEqual(2, len(loader._get_ranked_candidates("eth")))  # all probed if forced
+
+    @patch("electrum_gui.common.provider.loader._load_clients_by_chain")
+    def test_call_with_hedging(self, fake_load_clients):
+        stuck, backup = _FakeClient("stuck"), _FakeClient("backup")
+        fake_load_clients.return_value = [stuck, backup]
+        loader.get_client_by_chain("eth")
+        stuck.latency = 0.5
+
+        ranked_candidates = sorted(loader._CANDIDATE_CLIENTS_CACHE["eth"], key=lambda i: i["client"] is not stuck)
+        with patch.dict(loader.settings.PROVIDER_HEDGING, {"enabled": True, "min_delay": 0.05}), patch.object(
+            loader, "_get_ranked_candidates", return_value=ranked_candidates
+        ):
+            start_time = time.time()
+            self.assertEqual(len("backup"), loader.call_with_hedging("eth", "get_address", "a").balance)
+            self.assertLess(time.time() - start_time, 0.4)
+            self.assertEqual(1, stuck.calls)
+            self.assertEqual(1, backup.calls)
+
+        with patch.dict(loader.settings.PROVIDER_HEDGING, {"enabled": False}):
+            stuck.latency = backup.latency = 0
+            loader.call_with_hedging("eth", "get_address", "a")
+            self.assertEqual(3, stuck.calls + backup.calls)
+
+    @patch("electrum_gui.common.provider.loader._load_clients_by_chain")
+    def test_get_client_by_chain__with_guard(self, fake_load_clients):
+        fake_load_clients.return_value = [_FakeClient("a"), _FakeClient("b")]
+        client_a = loader.get_client_by_chain("eth")
+        client_b = next(i for i in fake_load_clients.return_value if i is not client_a)
+
+        with self.subTest("Skip the throttled client"):
+            with self.assertRaises(ResponseException):
+                client_a.get_transaction_status("a")
+
+            self.assertIs(client_b, loader.get_client_by_chain("eth"))
+            self.assertTrue(loader._CLIENT_HEALTHS[client_a].to_stats().is_throttled)
+            with patch.dict(loader.settings.PROVIDER_CLIENT_GUARD, {"max_wait": 0}):
+                with self.assertRaises(exceptions.ClientRateLimited):
+                    client_a.get_address("a")
+
+            loader._CLIENT_HEALTHS[client_a].limiter.paused_until = 0
+
+        with self.subTest("Skip the throttled client wrapped by json rpc"):
+            with self.assertRaises(JsonRPCException):
+                client_a.get_prices_per_unit_of_fee()
+
+            self.assertIs(client_b, loader.get_client_by_chain("eth"))
+            self.assertTrue(loader._CLIENT_HEALTHS[client_a].to_stats().is_throttled)
+            self.assertEqual(2, loader._CLIENT_HEALTHS[client_a].errors)
+            loader._CLIENT_HEALTHS[client_a].limiter.paused_until = 0
+
+        with self.subTest("Keep the circuit closed on the errors of application"):
+            for _ in range(5):
+                with self.assertRaises(JsonRPCException):
+                    client_b.broadcast_transaction("a")
+
+            self.assertEqual("closed", loader._CLIENT_HEALTHS[client_b].to_stats().circuit_state)
+
+        with self.subTest("Skip the client circuit opened"):
+            for _ in range(5):
+                with self.assertRaises(RequestException):
+                    client_b.get_transaction_by_txid("a")
+
+            self.assertEqual("open", loader._CLIENT_HEALTHS[client_b].to_stats().circuit_state)
+            with self.assertRaises(exceptions.ClientCircuitOpen):
+                client_b.get_address("a")
+
+            self.assertIs(client_a, loader.get_client_by_chain("eth"))
+
+        with self.subTest("No available client"):
+            for _ in range(5):
+                with self.assertRaises(RequestException):
+                    client_a.get_transaction_by_txid("a")
+
+            with self.assertRaises(exceptions.NoAvailableClient):
+                loader.get_client_by_chain("eth")
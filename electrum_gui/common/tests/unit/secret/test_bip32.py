@@ -1,7 +1,9 @@
 from typing import Dict, List, Tuple
 from unittest import TestCase
+from unittest.mock import patch
 
 from electrum_gui.common.secret import exceptions
+from electrum_gui.common.secret.bip32 import cache as bip32_cache
 from electrum_gui.common.secret.data import CurveEnum
 from electrum_gui.common.secret.registry import bip32_class_on_curve
 
@@ -143,6 +145,71 @@ class TestBIP32(TestCase):
                     self.assertEqual(result["prvkey"], sub_node._prvkey.hex())
                     self.assertEqual(result["pubkey"], sub_node._pubkey.hex())
 
+    def test_slip0010_vector1__derive_many(self):
+        for curve, cases in self.vector1_from_slip0010().items():
+            with self.subTest(curve.name):
+                master_seed = bytes.fromhex(self._master_seed)
+                paths = list(cases.keys())
+
+                nodes = bip32_class_on_curve(curve).from_master_seed(master_seed).derive_many(paths)
+                self.assertEqual([i["prvkey"] for i in cases.values()], [i._prvkey.hex() for i in nodes])
+
+                bip32_cache.clear()
+                for _ in range(2):  # the second time is on the cached intermediate nodes
+                    nodes = bip32_cache.derive_many_by_master_seed(bip32_class_on_curve(curve), master_seed, paths)
+                    self.assertEqual([i["chain_code"] for i in cases.values()], [i.chain_code.hex() for i in nodes])
+                    self.assertEqual([i["prvkey"] for i in cases.values()], [i._prvkey.hex() for i in nodes])
+                    self.assertEqual([i["pubkey"] for i in cases.values()], [i._pubkey.hex() for i in nodes])
+                    self.assertEqual(
+                        [i["parent_fingerprint"] for i in cases.values()],
+                        [i.parent_fingerprint.hex() for i in nodes],
+                    )
+
+    def test_derivation_cache__zeroize(self):
+        master_seed = bytes.fromhex(self._master_seed)
+        bip32_class = bip32_class_on_curve(CurveEnum.SECP256K1)
+        bip32_cache.clear()
+
+        with patch.object(bip32_class, "from_master_seed", wraps=bip32_class.from_master_seed) as fake_from_master_seed:
+            bip32_cache.derive_many_by_master_seed(bip32_class, master_seed, ["m/44'/60'/0'/0/0", "m/44'/60'/0'/0/1"])
+            bip32_cache.derive_many_by_master_seed(bip32_class, master_seed, ["m/44'/60'/0'/0/2"])
+            fake_from_master_seed.assert_called_once()
+
+        cached_nodes = [value for value, _ in bip32_cache._CACHE._data.values()]
+        self.assertEqual(4, len(cached_nodes))  # m/44', m/44'/60', m/44'/60'/0', m/44'/60'/0'/0, but never m
+        self.assertTrue(all(key[2] for key in bip32_cache._CACHE._data.keys()))
+        self.assertTrue(all(master_seed not in key for key in bip32_cache._CACHE._data.keys()))
+
+        bip32_cache.clear()
+        self.assertTrue(all(not any(i.secret) for i in cached_nodes))
+
+    @patch("electrum_gui.common.secret.bip32.cache.threading.Timer")
+    def test_derivation_cache__purge_expired(self, fake_timer_class):
+        master_seed = bytes.fromhex(self._master_seed)
+        bip32_class = bip32_class_on_curve(CurveEnum.SECP256K1)
+        bip32_cache.clear()
+        bip32_cache._PURGE_TIMER = None
+
+        with patch("electrum_gui.common.basic.cache.memory.time.time", return_value=1000):
+            bip32_cache.derive_many_by_master_seed(bip32_class, master_seed, ["m/44'/60'/0'/0/0"])
+        cached_nodes = [value for value, _ in bip32_cache._CACHE._data.values()]
+        fake_timer_class.assert_called_once_with(bip32_cache._PURGE_INTERVAL, bip32_cache._purge_by_timer)
+        fake_timer_class.return_value.start.assert_called_once()
+
+        with self.subTest("Keep the nodes not expired yet"):
+            with patch("electrum_gui.common.basic.cache.memory.time.time", return_value=1000 + 60):
+                bip32_cache._purge_by_timer()
+            self.assertEqual(4, len(bip32_cache._CACHE._data))
+            self.assertEqual(2, fake_timer_class.call_count)
+
+        with self.subTest("Zeroize the expired nodes and stop the timer"):
+            with patch("electrum_gui.common.basic.cache.memory.time.time", return_value=1000 + 121):
+                bip32_cache._purge_by_timer()
+            self.assertEqual(0, len(bip32_cache._CACHE._data))
+            self.assertTrue(all(not any(i.secret) for i in cached_nodes))
+            self.assertEqual(2, fake_timer_class.call_count)
+            self.assertIsNone(bip32_cache._PURGE_TIMER)
+
     def test_slip0010_ed25519_vector2(self):
         master_seed = "fffcf9f6f3f0edeae7e4e1dedbd8d5d2cfccc9c6c3c0bdbab7b4b1aeaba8a5a29f9c999693908d8a8784817e7b7875726f6c696663605d5a5754514e4b484542"
         cases = {
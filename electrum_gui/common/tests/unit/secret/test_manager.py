@@ -441,3 +441,20 @@ class TestSecretManager(TestCase):
         secret_manager.cascade_delete_related_models_by_pubkey_ids([pubkeys_from_b[0].id])
         self.assertEqual(0, len(PubKeyModel.select()))
         self.assertEqual(0, len(SecretKeyModel.select()))
+
+    def test_raw_create_keys_by_master_seed(self):
+        for curve, paths in (
+            (CurveEnum.SECP256K1, ["m/44'/60'/0'/0/0", "m/44'/60'/0'/0/1", "m/49'/0'/0'/0/0", "m/44'/60'/0'/1"]),
+            (CurveEnum.ED25519, ["m/44'/501'/0'", "m/44'/501'/1'", "m/44'/501'/0'/0'"]),
+        ):
+            with self.subTest(curve.name):
+                self.assertEqual(
+                    [
+                        secret_manager.raw_create_key_by_master_seed(curve, self.master_seed, path).get_pubkey()
+                        for path in paths
+                    ],
+                    [
+                        key.get_pubkey()
+                        for key in secret_manager.raw_create_keys_by_master_seed(curve, self.master_seed, paths)
+                    ],
+                )
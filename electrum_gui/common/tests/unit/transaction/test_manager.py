@@ -8,11 +8,11 @@ import peewee
 from electrum_gui.common.basic.orm import test_utils
 from electrum_gui.common.coin import data as coin_data
 from electrum_gui.common.provider import data as provider_data
-from electrum_gui.common.provider import exceptions as provider_exceptions
+from electrum_gui.common.provider.exceptions import TooManyTransferLogs
 from electrum_gui.common.transaction import daos, data, manager, models
 
 
-@test_utils.cls_test_database(models.TxAction)
+@test_utils.cls_test_database(models.TxAction, models.TransferLogCheckpoint)
 class TestTransactionManager(TestCase):
     @patch("electrum_gui.common.transaction.manager.coin_manager")
     @patch("electrum_gui.common.transaction.manager.provider_manager")
@@ -113,7 +113,7 @@ class TestTransactionManager(TestCase):
 
         def _fake_get_transaction_by_txid(chain_code, txid):
             if txid not in ("txid_a", "txid_b", "txid_c"):
-                raise provider_exceptions.TransactionNotFound(txid)
+                return None
             return {
                 "eth": provider_data.Transaction(
                     txid="txid_a",
@@ -137,7 +137,10 @@ class TestTransactionManager(TestCase):
                 ),
             }.get(chain_code)
 
-        fake_provider_manager.get_transaction_by_txid.side_effect = _fake_get_transaction_by_txid
+        def _fake_get_transactions_by_txids(chain_code, txids):
+            return [_fake_get_transaction_by_txid(chain_code, i) for i in txids]
+
+        fake_provider_manager.get_transactions_by_txids.side_effect = _fake_get_transactions_by_txids
 
         manager.update_pending_actions()
 
@@ -226,16 +229,101 @@ class TestTransactionManager(TestCase):
                 for i in txns
             ],
         )
-        fake_provider_manager.get_transaction_by_txid.assert_has_calls(
+        self.assertEqual(
+            [("bsc", ["txid_b"]), ("eth", ["txid_a", "txid_d", "txid_e"]), ("heco", ["txid_c"])],
+            sorted(
+                (chain_code, sorted(txids))
+                for (chain_code, txids), _ in fake_provider_manager.get_transactions_by_txids.call_args_list
+            ),
+        )
+
+    @patch("electrum_gui.common.transaction.manager._PENDING_CHECK_SCHEDULES", new_callable=dict)
+    @patch("electrum_gui.common.transaction.manager._update_pending_actions")
+    def test_on_new_block(self, fake_update_pending_actions, fake_schedules):
+        daos.bulk_create(
             [
-                call("bsc", "txid_b"),
-                call("eth", "txid_a"),
-                call("eth", "txid_d"),
-                call("eth", "txid_e"),
-                call("heco", "txid_c"),
-            ],
-            any_order=True,
+                daos.new_action(
+                    txid=txid,
+                    status=data.TxActionStatus.PENDING,
+                    chain_code="eth",
+                    coin_code="eth",
+                    value=decimal.Decimal(0),
+                    from_address="address_a",
+                    to_address="address_b",
+                    fee_limit=decimal.Decimal(1000),
+                    raw_tx="",
+                )
+                for txid in ("txid_a", "txid_b")
+            ]
         )
+        fake_update_pending_actions.return_value = set()
+        self.assertEqual({"eth"}, manager.get_pending_chain_codes())
+
+        def _checked_txids_on_block(block_number):
+            fake_update_pending_actions.reset_mock()
+            manager.on_new_block("eth", block_number)
+            if not fake_update_pending_actions.called:
+                return set()
+            return {i.txid for i in fake_update_pending_actions.call_args[0][0]}
+
+        with self.subTest("Check all the pending txs at the first time"):
+            self.assertEqual({"txid_a", "txid_b"}, _checked_txids_on_block(100))
+
+        with self.subTest("Back off exponentially"):
+            self.assertEqual({"txid_a", "txid_b"}, _checked_txids_on_block(101))
+            self.assertEqual(set(), _checked_txids_on_block(102))
+            self.assertEqual({"txid_a", "txid_b"}, _checked_txids_on_block(103))
+            self.assertEqual(set(), _checked_txids_on_block(106))
+            self.assertEqual({"txid_a", "txid_b"}, _checked_txids_on_block(107))
+            self.assertEqual((4, 115), fake_schedules[("eth", "txid_a")])
+
+        with self.subTest("Forget the confirmed txs"):
+            fake_update_pending_actions.return_value = {("eth", "txid_a")}
+            self.assertEqual({"txid_a", "txid_b"}, _checked_txids_on_block(115))
+            self.assertEqual({("eth", "txid_b")}, set(fake_schedules))
+
+            daos.update_actions_status("eth", "txid_a", data.TxActionStatus.CONFIRM_SUCCESS)
+            daos.update_actions_status("eth", "txid_b", data.TxActionStatus.CONFIRM_REVERTED)
+            self.assertEqual(set(), _checked_txids_on_block(200))
+            self.assertEqual({}, fake_schedules)
+            self.assertEqual(set(), manager.get_pending_chain_codes())
+
+    @patch("electrum_gui.common.transaction.manager._FALLBACK_CHECK_TIMES", new_callable=dict)
+    @patch("electrum_gui.common.transaction.manager.time.time")
+    @patch("electrum_gui.common.transaction.manager.get_pending_chain_codes")
+    @patch("electrum_gui.common.transaction.manager.update_pending_actions")
+    @patch("electrum_gui.common.transaction.manager.block_watcher")
+    def test_on_ticker_signal(
+        self, fake_block_watcher, fake_update_pending_actions, fake_get_pending_chain_codes, fake_time, _
+    ):
+        with self.subTest("Check all the pending actions if not watching"):
+            fake_block_watcher.is_watching.return_value = False
+            manager.on_ticker_signal()
+            fake_update_pending_actions.assert_called_once_with()
+
+        fake_block_watcher.is_watching.return_value = True
+        fake_get_pending_chain_codes.return_value = {"eth", "bsc"}
+        last_new_block_times = {"eth": 1000}
+        fake_block_watcher.get_last_new_block_time.side_effect = last_new_block_times.get
+
+        with self.subTest("Only check the chains without new blocks reported for a while"):
+            fake_update_pending_actions.reset_mock()
+            fake_time.return_value = 1000 + 60
+            manager.on_ticker_signal()
+            fake_update_pending_actions.assert_called_once_with(chain_code="bsc")
+
+        with self.subTest("Check slowly"):
+            fake_update_pending_actions.reset_mock()
+            fake_time.return_value = 1000 + 120
+            manager.on_ticker_signal()
+            fake_update_pending_actions.assert_not_called()
+
+        with self.subTest("Check the chain once its watcher becomes stale"):
+            fake_update_pending_actions.reset_mock()
+            last_new_block_times["bsc"] = 1000 + 600
+            fake_time.return_value = 1000 + 660
+            manager.on_ticker_signal()
+            fake_update_pending_actions.assert_called_once_with(chain_code="eth")
 
     def test_unique_indexes_of_tx_action(self):
         models.TxAction.create(
@@ -570,6 +658,103 @@ class TestTransactionManager(TestCase):
             ]
         )
 
+    def test_query_actions_by_address__cursor(self):
+        created_time = datetime.datetime(2021, 1, 1)
+        daos.bulk_create(
+            [
+                daos.new_action(
+                    txid=f"txid_{i}",
+                    status=data.TxActionStatus.CONFIRM_SUCCESS,
+                    chain_code="eth",
+                    coin_code="eth",
+                    value=decimal.Decimal(10),
+                    from_address="address_a" if i % 2 else f"address_{i}",
+                    to_address="address_a" if i % 3 else f"address_{i}",
+                    fee_limit=decimal.Decimal(1000),
+                    raw_tx="",
+                    created_time=created_time + datetime.timedelta(seconds=i // 4),  # with the same created_time
+                )
+                for i in range(100)
+            ]
+        )
+        models.TxAction.update(archived_id=1).where(
+            models.TxAction.txid.in_([f"txid_{i}" for i in range(0, 100, 5)])
+        ).execute()
+        models.TxAction.update(archived_id=2).where(models.TxAction.txid == "txid_1").execute()
+
+        for searching_address_as in ("sender", "receiver", "both"):
+            with self.subTest(searching_address_as=searching_address_as):
+                expected_txids = [
+                    i.txid
+                    for i in daos.query_actions_by_address(
+                        "eth",
+                        "address_a",
+                        page_number=None,
+                        archived_ids=[1, None],
+                        searching_address_as=searching_address_as,
+                    )
+                ]
+                self.assertEqual(len(expected_txids), len(set(expected_txids)))
+                self.assertNotIn("txid_1", expected_txids)
+                self.assertEqual(searching_address_as != "receiver", "txid_3" in expected_txids)
+
+                offset_txids, cursor_txids, cursor = [], [], None
+                for page_number in range(1, 20):
+                    offset_txids.extend(
+                        i.txid
+                        for i in daos.query_actions_by_address(
+                            "eth",
+                            "address_a",
+                            page_number=page_number,
+                            items_per_page=7,
+                            archived_ids=[1, None],
+                            searching_address_as=searching_address_as,
+                        )
+                    )
+                    actions = daos.query_actions_by_address(
+                        "eth",
+                        "address_a",
+                        items_per_page=7,
+                        archived_ids=[1, None],
+                        searching_address_as=searching_address_as,
+                        cursor=cursor,
+                    )
+                    cursor_txids.extend(i.txid for i in actions)
+                    cursor = (actions[-1].created_time, actions[-1].id) if actions else cursor
+
+                self.assertEqual(expected_txids, offset_txids)
+                self.assertEqual(expected_txids, cursor_txids)
+
+    def test_query_plan_of_tx_action_indexes(self):
+        def _query_plan(query) -> str:
+            sql, params = query.sql()
+            return str(models.TxAction._meta.database.execute_sql(f"EXPLAIN QUERY PLAN {sql}", params).fetchall())
+
+        self.assertIn(
+            "txaction_chain_code_to_address_created_time",
+            _query_plan(
+                daos.TxAction.select().where(daos.TxAction.chain_code == "eth", daos.TxAction.to_address == "a")
+            ),
+        )
+        self.assertIn(
+            "txaction_chain_code_txid_status",
+            _query_plan(
+                daos.TxAction.select().where(
+                    daos.TxAction.chain_code == "eth",
+                    daos.TxAction.txid == "txid",
+                    daos.TxAction.status == data.TxActionStatus.PENDING,
+                )
+            ),
+        )
+        self.assertIn(
+            "txaction_chain_code_from_address_nonce",
+            _query_plan(
+                daos.TxAction.select().where(
+                    daos.TxAction.chain_code == "eth", daos.TxAction.from_address == "a", daos.TxAction.nonce == 1
+                )
+            ),
+        )
+
     @patch("electrum_gui.common.transaction.manager.provider_manager")
     @patch("electrum_gui.common.transaction.manager.coin_manager")
     @patch("electrum_gui.common.transaction.manager.time")
@@ -606,3 +791,223 @@ class TestTransactionManager(TestCase):
                 call("eth", "address_a", paginate=provider_data.TxPaginate(end_block_number=1008, items_per_page=800)),
             ]
         )
+
+    @patch("electrum_gui.common.transaction.manager.signals")
+    def test_create_action__notify_actions_changed(self, fake_signals):
+        manager.create_action(
+            txid="txid_a",
+            status=data.TxActionStatus.PENDING,
+            chain_code="eth",
+            coin_code="eth",
+            value=decimal.Decimal(1),
+            from_address="address_b",
+            to_address="address_a",
+            fee_limit=decimal.Decimal(1000),
+            raw_tx="",
+        )
+        fake_signals.actions_changed_signal.send.assert_called_once_with(
+            chain_code="eth", addresses=["address_a", "address_b"]
+        )
+
+        with self.subTest("Ignore the error of receivers"):
+            fake_signals.actions_changed_signal.send.side_effect = ValueError("Boom")
+            manager.create_action(
+                txid="txid_b",
+                status=data.TxActionStatus.PENDING,
+                chain_code="eth",
+                coin_code="eth",
+                value=decimal.Decimal(1),
+                from_address="address_b",
+                to_address="address_a",
+                fee_limit=decimal.Decimal(1000),
+                raw_tx="",
+            )
+            self.assertTrue(manager.has_actions_by_txid("eth", "txid_b"))
+
+    @patch.dict(
+        "electrum_gui.common.conf.settings.TOKEN_TRANSFER_INDEXER",
+        start_block=0,
+        confirmations=0,
+        initial_block_range=4,
+        max_block_range=8,
+        max_requests=4,
+    )
+    @patch("electrum_gui.common.transaction.manager._TRANSFER_LOG_BLOCK_RANGES", {})
+    @patch("electrum_gui.common.transaction.manager.coin_manager")
+    @patch("electrum_gui.common.transaction.manager.provider_manager")
+    def test_index_token_transfers(self, fake_provider_manager, fake_coin_manager):
+        fake_coin_manager.get_coin_info.return_value = Mock(code="eth")
+        fake_coin_manager.query_coins_by_token_addresses.return_value = [Mock(code="eth_usdt", token_address="usdt")]
+        fake_provider_manager.get_best_block_number.return_value = 20
+        daos.save_transfer_log_checkpoints("eth", ["address_b"], 10)
+
+        def _search_token_transfer_logs(chain_code, addresses, from_block, to_block):
+            if to_block - from_block >= 7:
+                raise TooManyTransferLogs(from_block, to_block)
+
+            return [
+                provider_data.TokenTransferLog(
+                    txid="txid_a",
+                    block_number=2,
+                    log_index=0,
+                    token_address="usdt",
+                    from_address="address_c",
+                    to_address="address_a",
+                    value=10,
+                )
+            ][: int(from_block <= 2 <= to_block)]
+
+        fake_provider_manager.search_token_transfer_logs.side_effect = _search_token_transfer_logs
+        fake_provider_manager.get_transactions_by_txids.return_value = [
+            provider_data.Transaction(
+                txid="txid_a",
+                status=provider_data.TransactionStatus.CONFIRM_SUCCESS,
+                inputs=[provider_data.TransactionInput(address="address_c", value=0)],
+                outputs=[provider_data.TransactionOutput(address="usdt", value=0)],
+                fee=provider_data.TransactionFee(limit=1000, used=900, price_per_unit=20),
+                block_header=provider_data.BlockHeader(block_number=2, block_time=1600000000, block_hash="block_2"),
+                nonce=1,
+            )
+        ]
+
+        self.assertEqual(2, manager.index_token_transfers("eth", ["address_a", "address_b"]))
+        fake_provider_manager.search_token_transfer_logs.assert_has_calls(
+            [
+                call("eth", ["address_a"], 0, 3),
+                call("eth", ["address_a"], 4, 9),  # stop at the checkpoint of address_b
+                call("eth", ["address_a", "address_b"], 10, 17),  # too wide
+                call("eth", ["address_a", "address_b"], 10, 13),  # run out of requests
+            ]
+        )
+        self.assertEqual(
+            {"address_a": 14, "address_b": 14}, daos.query_transfer_log_checkpoints("eth", ["address_a", "address_b"])
+        )
+
+        actions = daos.query_actions_by_txid("eth", "txid_a")
+        self.assertEqual(
+            [("eth", "address_c", "usdt", 0, 0), ("eth_usdt", "address_c", "address_a", 10, 1)],
+            [(i.coin_code, i.from_address, i.to_address, i.value, i.index) for i in actions],
+        )
+        self.assertEqual([], fake_provider_manager.get_transactions_by_txids.return_value[0].inputs[1:])
+
+        with self.subTest("Continue from the checkpoints"):
+            fake_provider_manager.search_token_transfer_logs.reset_mock()
+            self.assertEqual(0, manager.index_token_transfers("eth", ["address_a", "address_b"]))
+            fake_provider_manager.search_token_transfer_logs.assert_called_once_with(
+                "eth", ["address_a", "address_b"], 14, 20
+            )
+
+    @patch.dict(
+        "electrum_gui.common.conf.settings.TOKEN_TRANSFER_INDEXER",
+        start_block=0,
+        confirmations=0,
+        initial_block_range=100,
+        max_requests=4,
+    )
+    @patch("electrum_gui.common.transaction.manager._TRANSFER_LOG_BLOCK_RANGES", {})
+    @patch("electrum_gui.common.transaction.manager.coin_manager")
+    @patch("electrum_gui.common.transaction.manager.provider_manager")
+    def test_index_token_transfers__failed_to_get_transactions(self, fake_provider_manager, fake_coin_manager):
+        fake_coin_manager.get_coin_info.return_value = Mock(code="eth")
+        fake_coin_manager.query_coins_by_token_addresses.return_value = [Mock(code="eth_usdt", token_address="usdt")]
+        fake_provider_manager.get_best_block_number.return_value = 20
+        fake_provider_manager.search_token_transfer_logs.return_value = [
+            provider_data.TokenTransferLog(
+                txid=txid,
+                block_number=block_number,
+                log_index=0,
+                token_address="usdt",
+                from_address="address_c",
+                to_address="address_a",
+                value=10,
+            )
+            for txid, block_number in (("txid_a", 2), ("txid_b", 5), ("txid_c", 8))
+        ]
+        transactions = {
+            txid: provider_data.Transaction(
+                txid=txid,
+                status=provider_data.TransactionStatus.CONFIRM_SUCCESS,
+                inputs=[provider_data.TransactionInput(address="address_c", value=0)],
+                outputs=[provider_data.TransactionOutput(address="usdt", value=0)],
+                fee=provider_data.TransactionFee(limit=1000, used=900, price_per_unit=20),
+                block_header=provider_data.BlockHeader(
+                    block_number=block_number, block_time=1600000000, block_hash=f"block_{block_number}"
+                ),
+                nonce=1,
+            )
+            for txid, block_number in (("txid_a", 2), ("txid_b", 5), ("txid_c", 8))
+        }
+        failed_txids = {"txid_b"}
+        fake_provider_manager.get_transactions_by_txids.side_effect = lambda chain_code, txids: [
+            None if i in failed_txids else transactions[i] for i in txids
+        ]
+
+        with self.subTest("Defer the indexing since the block of the failed tx"):
+            self.assertEqual(2, manager.index_token_transfers("eth", ["address_a"]))
+            fake_provider_manager.search_token_transfer_logs.assert_called_once_with("eth", ["address_a"], 0, 20)
+            self.assertEqual({"address_a": 5}, daos.query_transfer_log_checkpoints("eth", ["address_a"]))
+            self.assertTrue(manager.has_actions_by_txid("eth", "txid_a"))
+            self.assertFalse(manager.has_actions_by_txid("eth", "txid_c"))
+
+        with self.subTest("Continue from the block of the failed tx"):
+            failed_txids.clear()
+            fake_provider_manager.search_token_transfer_logs.reset_mock()
+            self.assertEqual(4, manager.index_token_transfers("eth", ["address_a"]))
+            fake_provider_manager.search_token_transfer_logs.assert_called_once_with("eth", ["address_a"], 5, 20)
+            fake_provider_manager.get_transactions_by_txids.assert_called_with("eth", ["txid_b", "txid_c"])
+            self.assertEqual({"address_a": 21}, daos.query_transfer_log_checkpoints("eth", ["address_a"]))
+
+    @patch.dict(
+        "electrum_gui.common.conf.settings.TOKEN_TRANSFER_INDEXER",
+        start_block=None,
+        confirmations=2,
+        initial_block_range=100,
+        max_requests=4,
+    )
+    @patch("electrum_gui.common.transaction.manager._TRANSFER_LOG_BLOCK_RANGES", {})
+    @patch("electrum_gui.common.transaction.manager.provider_manager")
+    def test_index_token_transfers__start_block(self, fake_provider_manager):
+        fake_provider_manager.get_best_block_number.return_value = 22
+        fake_provider_manager.search_token_transfer_logs.return_value = []
+        for txid, block_number, from_address, to_address in (
+            ("txid_a", 12, "address_c", "address_a"),
+            ("txid_b", 8, "address_a", "address_c"),
+            ("txid_c", None, "address_b", "address_c"),
+        ):
+            daos.bulk_create(
+                [
+                    daos.new_action(
+                        txid=txid,
+                        status=data.TxActionStatus.CONFIRM_SUCCESS,
+                        chain_code="eth",
+                        coin_code="eth",
+                        value=decimal.Decimal(0),
+                        from_address=from_address,
+                        to_address=to_address,
+                        fee_limit=decimal.Decimal(1000),
+                        raw_tx="",
+                        block_number=block_number,
+                    )
+                ]
+            )
+        self.assertEqual(
+            {"address_a": 8, "address_c": 8}, daos.query_first_block_numbers("eth", ["address_a", "address_c"])
+        )
+
+        with self.subTest("Start from the first known action, or from the tip if none"):
+            self.assertEqual(0, manager.index_token_transfers("eth", ["address_a", "address_b"]))
+            fake_provider_manager.search_token_transfer_logs.assert_called_once_with("eth", ["address_a"], 8, 20)
+            self.assertEqual(
+                {"address_a": 21, "address_b": 21},
+                daos.query_transfer_log_checkpoints("eth", ["address_a", "address_b"]),
+            )
+
+        with self.subTest("Keep the checkpoint of the new address even if the tip is not scanned"):
+            fake_provider_manager.search_token_transfer_logs.reset_mock()
+            self.assertEqual(0, manager.index_token_transfers("eth", ["address_d"]))
+            fake_provider_manager.search_token_transfer_logs.assert_not_called()
+            self.assertEqual({"address_d": 21}, daos.query_transfer_log_checkpoints("eth", ["address_d"]))
+
+            fake_provider_manager.get_best_block_number.return_value = 30
+            manager.index_token_transfers("eth", ["address_d"])
+            fake_provider_manager.search_token_transfer_logs.assert_called_once_with("eth", ["address_d"], 21, 28)
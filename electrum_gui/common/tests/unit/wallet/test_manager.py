@@ -28,6 +28,7 @@ from electrum_gui.common.wallet import models as wallet_models
     secret_models.PubKeyModel,
     secret_models.SecretKeyModel,
     transaction_models.TxAction,
+    transaction_models.TransferLogCheckpoint,
     coin_models.CoinModel,
 )
 class TestWalletManager(TestCase):
@@ -437,35 +438,99 @@ class TestWalletManager(TestCase):
             (self.mnemonic, self.passphrase), wallet_manager.export_mnemonic(wallet_info["wallet_id"], self.password)
         )
 
-    @patch("electrum_gui.common.wallet.manager.provider_manager.get_address")
-    def test_search_existing_wallets(self, fake_get_address):
-        fake_get_address.side_effect = (
-            lambda chain_code, address: provider_data.Address(address=address, balance=18888, existing=True)
-            if address == "0xa0331fcfa308e488833de1fe16370b529fa7c720"
-            else provider_data.Address(address=address, balance=0, existing=False)
-        )
+    @patch("electrum_gui.common.wallet.manager.provider_manager.batch_get_address")
+    def test_search_existing_wallets(self, fake_batch_get_address):
+        fake_batch_get_address.side_effect = lambda chain_code, addresses: [
+            (
+                provider_data.Address(address=address, balance=18888, existing=True)
+                if address == "0xa0331fcfa308e488833de1fe16370b529fa7c720"
+                else provider_data.Address(address=address, balance=0, existing=False)
+            )
+            for address in addresses
+        ]
 
-        self.assertEqual(
-            [
-                {
-                    'address': '3Nu7tDXHbqtuMfMi3DMVrnLFabTvaY2FyF',
-                    'address_encoding': 'P2WPKH-P2SH',
-                    'balance': 0,
-                    'bip44_path': "m/49'/0'/0'/0/0",
-                    'chain_code': 'btc',
-                    'name': 'BTC-1',
-                },
+        with self.subTest("Search all the addresses"):
+            self.assertEqual(
+                [
+                    {
+                        'address': '3Nu7tDXHbqtuMfMi3DMVrnLFabTvaY2FyF',
+                        'address_encoding': 'P2WPKH-P2SH',
+                        'balance': 0,
+                        'bip44_path': "m/49'/0'/0'/0/0",
+                        'chain_code': 'btc',
+                        'name': 'BTC-1',
+                    },
+                    {
+                        'address': '0xa0331fcfa308e488833de1fe16370b529fa7c720',
+                        'address_encoding': None,
+                        'balance': 18888,
+                        'bip44_path': "m/44'/60'/0'/0/11",
+                        'chain_code': 'eth',
+                        'name': 'ETH-1',
+                    },
+                ],
+                wallet_manager.search_existing_wallets(["btc", "eth"], self.mnemonic, passphrase=self.passphrase),
+            )
+            self.assertEqual(
+                {("eth", 20)},
                 {
-                    'address': '0xa0331fcfa308e488833de1fe16370b529fa7c720',
-                    'address_encoding': None,
-                    'balance': 18888,
-                    'bip44_path': "m/44'/60'/0'/0/11",
-                    'chain_code': 'eth',
-                    'name': 'ETH-1',
+                    (call.args[0], len(call.args[1]))
+                    for call in fake_batch_get_address.call_args_list
+                    if call.args[0] == "eth"
                 },
-            ],
-            wallet_manager.search_existing_wallets(["btc", "eth"], self.mnemonic, passphrase=self.passphrase),
-        )
+            )
+            fake_batch_get_address.reset_mock()
+
+        with self.subTest("Stop searching by gap limit"):
+            self.assertEqual(
+                [
+                    {
+                        'address': '0xa0331fcfa308e488833de1fe16370b529fa7c720',
+                        'address_encoding': None,
+                        'balance': 18888,
+                        'bip44_path': "m/44'/60'/0'/0/11",
+                        'chain_code': 'eth',
+                        'name': 'ETH-1',
+                    },
+                ],
+                wallet_manager.search_existing_wallets(
+                    ["eth"], self.mnemonic, passphrase=self.passphrase, bip44_gap_limit=12
+                ),
+            )
+            self.assertEqual([12, 8], [len(call.args[1]) for call in fake_batch_get_address.call_args_list])
+            fake_batch_get_address.reset_mock()
+
+            self.assertEqual(
+                "m/44'/60'/0'/0/0",
+                wallet_manager.search_existing_wallets(
+                    ["eth"], self.mnemonic, passphrase=self.passphrase, bip44_gap_limit=5
+                )[0]["bip44_path"],
+            )
+            self.assertEqual([5], [len(call.args[1]) for call in fake_batch_get_address.call_args_list])
+
+        with self.subTest("Retry the failed batch"):
+            fake_batch_get_address.reset_mock()
+            get_address_infos = fake_batch_get_address.side_effect
+            errors = [IOError("Boom")]
+
+            def _batch_get_address(chain_code, addresses):
+                if errors:
+                    raise errors.pop()
+                return get_address_infos(chain_code, addresses)
+
+            fake_batch_get_address.side_effect = _batch_get_address
+            self.assertEqual(
+                "m/44'/60'/0'/0/11",
+                wallet_manager.search_existing_wallets(["eth"], self.mnemonic, passphrase=self.passphrase)[0][
+                    "bip44_path"
+                ],
+            )
+            self.assertEqual([20, 20], [len(call.args[1]) for call in fake_batch_get_address.call_args_list])
+
+        with self.subTest("Raise instead of treating the failed batch as not existing"):
+            fake_batch_get_address.side_effect = IOError("Boom")
+            with self.assertRaises(IOError):
+                wallet_manager.search_existing_wallets(["eth"], self.mnemonic, passphrase=self.passphrase)
 
     def test_update_wallet_password(self):
         wallet_info = wallet_manager.import_standalone_wallet_by_mnemonic(
@@ -757,40 +822,61 @@ class TestWalletManager(TestCase):
             Mock(code="eth_usdt", token_address="contract_a"),
             Mock(code="eth_cc", token_address="contract_b"),
         ]
-        fake_provider_manager.get_balance.side_effect = lambda chain_code, address, token_address: {
-            "contract_a": 11,
-            "contract_b": 12,
-        }.get(token_address)
+        fake_provider_manager.batch_get_balance.side_effect = lambda chain_code, pairs: [
+            {"contract_a": 11, "contract_b": 12}.get(token_address) for _, token_address in pairs
+        ]
 
         with self.subTest("Refresh nothing"):
+            wallet_daos.asset.mark_assets_dirty([asset_a.id, asset_b.id], is_dirty=False)
+            asset_a, asset_b = wallet_daos.asset.query_assets_by_ids([asset_a.id, asset_b.id])
             self.assertEqual([asset_a, asset_b], wallet_manager.refresh_assets([asset_a, asset_b]))
             fake_coin_manager.query_coins_by_codes.assert_not_called()
-            fake_provider_manager.get_balance.assert_not_called()
+            fake_provider_manager.batch_get_balance.assert_not_called()
 
-        with self.subTest("Refresh asset_b"):
-            wallet_models.AssetModel.update(
-                modified_time=datetime.datetime.now() - datetime.timedelta(seconds=10)
-            ).where(wallet_models.AssetModel.id == asset_b.id).execute()
-            asset_b = wallet_models.AssetModel.get_by_id(asset_b.id)
+        with self.subTest("Refresh the dirty asset_b"):
+            self.assertEqual(2, wallet_manager.mark_assets_dirty_by_addresses("eth", ["fake_address", "other"]))
+            wallet_daos.asset.mark_assets_dirty([asset_a.id], is_dirty=False)
+            self.assertEqual([asset_b], wallet_daos.asset.query_dirty_assets())
 
-            asset_a, asset_b = wallet_manager.refresh_assets([asset_a, asset_b])
+            self.assertEqual(1, wallet_manager.refresh_dirty_assets())
+            asset_a, asset_b = wallet_daos.asset.query_assets_by_ids([asset_a.id, asset_b.id])
+            self.assertEqual(0, asset_a.balance)
             self.assertEqual(12, asset_b.balance)
+            self.assertFalse(asset_b.is_dirty)
             fake_coin_manager.query_coins_by_codes.assert_called_once_with(["eth_cc"])
-            fake_provider_manager.get_balance.assert_called_once_with("eth", "fake_address", "contract_b")
+            fake_provider_manager.batch_get_balance.assert_called_once_with("eth", [("fake_address", "contract_b")])
             fake_coin_manager.query_coins_by_codes.reset_mock()
-            fake_provider_manager.get_balance.reset_mock()
+            fake_provider_manager.batch_get_balance.reset_mock()
 
-        with self.subTest("Refresh all"):
+        with self.subTest("Refresh all"), patch.object(
+            wallet_manager.signals.assets_changed_signal, "send"
+        ) as fake_send:
             asset_a, asset_b = wallet_manager.refresh_assets([asset_a, asset_b], force_update=True)
+            fake_send.assert_called_once_with(wallet_ids=[11])
             self.assertEqual(11, asset_a.balance)
             self.assertEqual(12, asset_b.balance)
             fake_coin_manager.query_coins_by_codes.assert_called_once_with(["eth_usdt", "eth_cc"])
-            fake_provider_manager.get_balance.assert_has_calls(
-                [
-                    call("eth", "fake_address", "contract_a"),
-                    call("eth", "fake_address", "contract_b"),
-                ]
+            fake_provider_manager.batch_get_balance.assert_called_once_with(
+                "eth", [("fake_address", "contract_a"), ("fake_address", "contract_b")]
             )
+            fake_provider_manager.batch_get_balance.reset_mock()
+
+        with self.subTest("Keep the asset failed to get balance dirty"):
+            fake_provider_manager.batch_get_balance.side_effect = lambda chain_code, pairs: [13, None]
+            asset_a, asset_b = wallet_manager.refresh_assets([asset_a, asset_b], force_update=True)
+            self.assertEqual(13, asset_a.balance)
+            self.assertEqual(12, asset_b.balance)
+            self.assertEqual([asset_b], wallet_daos.asset.query_dirty_assets())
+
+        with self.subTest("Mark the stale assets dirty"):
+            wallet_daos.asset.mark_stale_assets_dirty(datetime.datetime.now() + datetime.timedelta(seconds=1))
+            self.assertEqual([asset_a, asset_b], wallet_daos.asset.query_dirty_assets())
+
+        with self.subTest("Clean the asset without coin"):
+            fake_coin_manager.query_coins_by_codes.return_value = [Mock(code="eth_usdt", token_address="contract_a")]
+            fake_provider_manager.batch_get_balance.side_effect = lambda chain_code, pairs: [13]
+            wallet_manager.refresh_dirty_assets()
+            self.assertEqual([], wallet_daos.asset.query_dirty_assets())
 
     def test_get_default_bip44_path(self):
         self.assertEqual("m/44'/0'/0'/0/0", wallet_manager.get_default_bip44_path("btc", "P2PKH").to_bip44_path())
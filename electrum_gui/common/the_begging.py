@@ -7,32 +7,74 @@ def initialize():
     logging.config.dictConfig(settings.LOGGING)
 
     # database migrating
-    from electrum_gui.common.basic.orm.database import db
+    from electrum_gui.common.basic.orm import database as orm_database
     from electrum_gui.common.basic.orm.migrate import manager as migrate_manager
 
-    migrate_manager.migrating(db)
+    migrate_manager.migrating(orm_database.db)
+    orm_database.on_startup()  # before the scheduler starts, as it may take a full vacuum
 
     from electrum_gui.common.conf import chains as chains_conf
 
     chains_conf._load_data()
 
-    # connect ticker signal here before start
-    # example ticker.signals.ticker_signal.connect(my_ticker_callback)
+    # register jobs to the scheduler here
+    # example scheduler.register("my_job", my_job_func, interval=60)
     from electrum_gui.common.basic import ticker
     from electrum_gui.common.price import manager as price_manager
     from electrum_gui.common.transaction import manager as transaction_manager
+    from electrum_gui.common.transaction import signals as transaction_signals
+    from electrum_gui.common.wallet import manager as wallet_manager
 
-    ticker.signals.ticker_signal.connect(price_manager.on_ticker_signal)
-    ticker.signals.ticker_signal.connect(transaction_manager.on_ticker_signal)
+    transaction_signals.actions_changed_signal.connect(wallet_manager.on_actions_changed)
 
-    # start ticker
-    ticker.start_default_ticker(seconds=60)  # every 1 min
+    scheduler = ticker.start_default_scheduler(**settings.SCHEDULER)
+    scheduler.register("ticker_signal", ticker.signals.ticker_signal.send, interval=60)  # for the signal receivers
+    scheduler.register("price", price_manager.on_ticker_signal, interval=15 * 60)
+    scheduler.register("transaction", transaction_manager.on_ticker_signal, interval=60)
+    scheduler.register("asset", wallet_manager.on_ticker_signal, interval=settings.ASSET_REFRESH["interval"])
+    scheduler.register("database", _on_database_ticker_signal, interval=6 * 60 * 60, delay=10 * 60)
+
+    if settings.TOKEN_TRANSFER_INDEXER["enabled"]:
+        scheduler.register(
+            "token_transfer_indexer",
+            wallet_manager.index_token_transfers,
+            interval=settings.TOKEN_TRANSFER_INDEXER["interval"],
+        )
+
+    if settings.TX_TRACKING["block_watcher_enabled"]:
+        from electrum_gui.common.provider import block_watcher
+
+        block_watcher.new_block_signal.connect(transaction_manager.on_new_block)
+        block_watcher.start_block_watcher(
+            scheduler,
+            settings.TX_TRACKING["block_watcher_interval"],
+            settings.TX_TRACKING["block_watcher_background_interval"],
+            transaction_manager.get_pending_chain_codes,
+        )
+
+
+def _on_database_ticker_signal():
+    from electrum_gui.common.basic.orm import database as orm_database
+    from electrum_gui.common.provider import cache as provider_cache
+
+    orm_database.on_ticker_signal()
+    provider_cache.on_ticker_signal()  # the on-disk tier of the responses is a standalone database
+
+
+def set_foreground(is_foreground: bool):
+    from electrum_gui.common.basic import ticker
+
+    scheduler = ticker.get_default_scheduler()
+    if scheduler is not None:
+        scheduler.set_foreground(is_foreground)
 
 
 def terminate():
     from electrum_gui.common.basic import ticker
+    from electrum_gui.common.provider import block_watcher
 
-    ticker.cancel_default_ticker()
+    block_watcher.cancel_block_watcher()
+    ticker.cancel_default_scheduler()
 
 
 def reset_runtime():
@@ -42,5 +84,8 @@ def reset_runtime():
 
     terminate()
     database.db.close()
-    os.remove(database.db.database)
+    for suffix in ("", "-wal", "-shm"):  # along with the files of WAL mode
+        if os.path.exists(database.db.database + suffix):
+            os.remove(database.db.database + suffix)
+
     initialize()
@@ -1,10 +1,12 @@
 import datetime
 import functools
 from decimal import Decimal
-from typing import Iterable, List, Literal, Optional, Set
+from typing import Dict, Iterable, List, Literal, Optional, Set, Tuple
+
+import peewee
 
 from electrum_gui.common.transaction.data import TxActionStatus
-from electrum_gui.common.transaction.models import TxAction
+from electrum_gui.common.transaction.models import TransferLogCheckpoint, TxAction
 
 
 def new_action(
@@ -86,6 +88,13 @@ def query_actions_by_txid(chain_code: str, txid: str, index: int = None) -> List
     return list(models)
 
 
+def query_actions_by_txids(chain_code: str, txids: List[str], index: int = None) -> List[TxAction]:
+    expressions = [TxAction.chain_code == chain_code, TxAction.txid.in_(txids)]
+    index is None or expressions.append(TxAction.index == index)
+    models = TxAction.select().where(*expressions)
+    return list(models)
+
+
 def query_actions_by_nonce(chain_code: str, from_address: str, nonce: int) -> List[TxAction]:
     models = TxAction.select().where(
         TxAction.chain_code == chain_code, TxAction.from_address == from_address, TxAction.nonce == nonce
@@ -108,6 +117,39 @@ def update_actions_status(
     )
 
 
+def query_pending_txids_by_nonces(chain_code: str, address_nonce_pairs: List[Tuple[str, int]]) -> Set[str]:
+    if not address_nonce_pairs:
+        return set()
+
+    items = (
+        TxAction.select(TxAction.txid.distinct())
+        .where(
+            TxAction.chain_code == chain_code,
+            TxAction.status == TxActionStatus.PENDING,
+            functools.reduce(
+                lambda a, b: a | b,
+                (
+                    (TxAction.from_address == address) & (TxAction.nonce == nonce)
+                    for address, nonce in address_nonce_pairs
+                ),
+            ),
+        )
+        .tuples()
+    )
+    return {i[0] for i in items}
+
+
+def update_actions_status_by_txids(chain_code: str, txids: List[str], status: TxActionStatus) -> int:
+    return (
+        TxAction.update(
+            status=status,
+            modified_time=datetime.datetime.now(),
+        )
+        .where(TxAction.chain_code == chain_code, TxAction.txid.in_(txids))
+        .execute()
+    )
+
+
 def query_actions_by_address(
     chain_code: str,
     address: str,
@@ -116,32 +158,52 @@ def query_actions_by_address(
     items_per_page: int = 20,
     archived_ids: List[int] = None,
     searching_address_as: Literal["sender", "receiver", "both"] = "both",
+    cursor: Tuple[datetime.datetime, int] = None,
 ) -> List[TxAction]:
-    address_query_expression_options = (
-        TxAction.from_address == address,
-        TxAction.to_address == address,
-    )
-
-    if searching_address_as == "sender":
-        address_query_expression = address_query_expression_options[0]
-    elif searching_address_as == "receiver":
-        address_query_expression = address_query_expression_options[1]
-    else:
-        address_query_expression = address_query_expression_options[0] | address_query_expression_options[1]
+    """
+    Query actions by address, the latest first
+    :param cursor: (created_time, id) of the last action of the previous page, take precedence over page_number
+    """
+    address_fields = {
+        "sender": (TxAction.from_address,),
+        "receiver": (TxAction.to_address,),
+    }.get(searching_address_as, (TxAction.from_address, TxAction.to_address))
 
-    expressions = [
-        TxAction.chain_code == chain_code,
-        address_query_expression,
-    ]
+    expressions = [TxAction.chain_code == chain_code]
 
     coin_code is None or expressions.append(TxAction.coin_code == coin_code)
-    not archived_ids or expressions.append(
-        functools.reduce(lambda a, b: a | b, (TxAction.archived_id == i for i in archived_ids))
-    )
+    if archived_ids:
+        archived_id_expression = TxAction.archived_id.in_([i for i in archived_ids if i is not None])
+        if None in archived_ids:
+            archived_id_expression |= TxAction.archived_id.is_null()
+
+        expressions.append(archived_id_expression)
+
+    if cursor is not None:
+        created_time, action_id = cursor
+        expressions.append(
+            (TxAction.created_time < created_time)
+            | ((TxAction.created_time == created_time) & (TxAction.id < action_id))
+        )
+        page_number = 1
 
-    actions = TxAction.select().where(*expressions).order_by(TxAction.created_time.desc())
-    if page_number is not None and items_per_page is not None:
-        actions = actions.paginate(page_number, items_per_page)
+    limit = page_number * items_per_page if page_number is not None and items_per_page is not None else None
+
+    queries = []
+    for address_field in address_fields:  # one query per address field, so that each of them hits its own index
+        query = (
+            TxAction.select()
+            .where(address_field == address, *expressions)
+            .order_by(TxAction.created_time.desc(), TxAction.id.desc())
+        )
+        queries.append(query.limit(limit) if limit is not None else query)
+
+    actions = functools.reduce(lambda a, b: a | b, queries)  # UNION
+    if len(queries) > 1:
+        actions = actions.order_by(actions.c.created_time.desc(), actions.c.id.desc())
+
+    if limit is not None:
+        actions = actions.limit(items_per_page).offset(limit - items_per_page)
 
     return list(actions)
 
@@ -227,6 +289,11 @@ def query_actions_by_status(
     return list(models)
 
 
+def query_chain_codes_by_status(status: TxActionStatus) -> Set[str]:
+    items = TxAction.select(TxAction.chain_code.distinct()).where(TxAction.status == status).tuples()
+    return {i[0] for i in items}
+
+
 def delete_actions_by_addresses(chain_code: str, addresses: List[str]) -> int:
     return (
         TxAction.delete()
@@ -240,3 +307,56 @@ def delete_actions_by_addresses(chain_code: str, addresses: List[str]) -> int:
 
 def has_actions_by_txid(chain_code: str, txid: str) -> bool:
     return TxAction.select().where(TxAction.chain_code == chain_code, TxAction.txid == txid).count() > 0
+
+
+def query_transfer_log_checkpoints(chain_code: str, addresses: List[str]) -> Dict[str, int]:
+    items = (
+        TransferLogCheckpoint.select(TransferLogCheckpoint.address, TransferLogCheckpoint.next_block)
+        .where(TransferLogCheckpoint.chain_code == chain_code, TransferLogCheckpoint.address.in_(addresses))
+        .tuples()
+    )
+    return dict(items)
+
+
+def query_first_block_numbers(chain_code: str, addresses: List[str]) -> Dict[str, int]:
+    """
+    Query the min block number of the confirmed actions of each address, as either the sender or the receiver
+    """
+    result = {}
+
+    for field in (TxAction.from_address, TxAction.to_address):
+        items = (
+            TxAction.select(field, peewee.fn.MIN(TxAction.block_number))
+            .where(TxAction.chain_code == chain_code, field.in_(addresses), TxAction.block_number.is_null(False))
+            .group_by(field)
+            .tuples()
+        )
+        for address, block_number in items:
+            result[address] = min(block_number, result.get(address, block_number))
+
+    return result
+
+
+def save_transfer_log_checkpoints(chain_code: str, addresses: List[str], next_block: int):
+    now = datetime.datetime.now()
+    rows = [
+        dict(chain_code=chain_code, address=i, next_block=next_block, created_time=now, modified_time=now)
+        for i in dict.fromkeys(addresses)
+    ]
+
+    for batch in peewee.chunked(rows, 100):
+        TransferLogCheckpoint.insert_many(batch).on_conflict(
+            conflict_target=[TransferLogCheckpoint.chain_code, TransferLogCheckpoint.address],
+            update={
+                TransferLogCheckpoint.next_block: peewee.EXCLUDED.next_block,
+                TransferLogCheckpoint.modified_time: peewee.EXCLUDED.modified_time,
+            },
+        ).execute()
+
+
+def delete_transfer_log_checkpoints(chain_code: str, addresses: List[str]) -> int:
+    return (
+        TransferLogCheckpoint.delete()
+        .where(TransferLogCheckpoint.chain_code == chain_code, TransferLogCheckpoint.address.in_(addresses))
+        .execute()
+    )
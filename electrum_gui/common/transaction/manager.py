@@ -1,20 +1,28 @@
+import collections
 import datetime
 import itertools
 import logging
 import time
 from decimal import Decimal
-from typing import Iterable, List, Literal, Optional, Tuple
+from typing import Dict, Iterable, List, Literal, Optional, Set, Tuple
 
 from electrum_gui.common.basic.functional.require import require
 from electrum_gui.common.basic.functional.timing import timing_logger
 from electrum_gui.common.basic.functional.wraps import error_interrupter, timeout_lock
 from electrum_gui.common.basic.orm.database import db
-from electrum_gui.common.basic.ticker.utils import on_interval
 from electrum_gui.common.coin import manager as coin_manager
 from electrum_gui.common.coin.data import ChainModel
-from electrum_gui.common.provider import provider_manager
-from electrum_gui.common.provider.data import Transaction, TxPaginate
-from electrum_gui.common.transaction import daos
+from electrum_gui.common.conf import settings
+from electrum_gui.common.provider import block_watcher, provider_manager
+from electrum_gui.common.provider.data import (
+    TokenTransferLog,
+    Transaction,
+    TransactionInput,
+    TransactionOutput,
+    TxPaginate,
+)
+from electrum_gui.common.provider.exceptions import TooManyTransferLogs
+from electrum_gui.common.transaction import daos, signals
 from electrum_gui.common.transaction.data import TX_TO_ACTION_STATUS_DIRECT_MAPPING, TxActionStatus
 from electrum_gui.common.transaction.models import TxAction
 
@@ -33,7 +41,7 @@ def create_action(
     raw_tx: str,
     **kwargs,
 ) -> TxAction:
-    return daos.new_action(
+    action = daos.new_action(
         txid=txid,
         status=status,
         chain_code=chain_code,
@@ -45,6 +53,19 @@ def create_action(
         raw_tx=raw_tx,
         **kwargs,
     ).save()
+    _notify_actions_changed(chain_code, [from_address, to_address])
+    return action
+
+
+def _notify_actions_changed(chain_code: str, addresses: Iterable[str]):
+    addresses = sorted({i for i in addresses if i})
+    if not addresses:
+        return
+
+    try:
+        signals.actions_changed_signal.send(chain_code=chain_code, addresses=addresses)
+    except Exception:
+        logger.exception(f"Error in sending actions changed signal. chain_code: {chain_code}, addresses: {addresses}")
 
 
 def get_action_by_id(action_id: int) -> TxAction:
@@ -78,38 +99,66 @@ def update_pending_actions(
         address=address,
         txid=txid,
     )
+    _update_pending_actions(pending_actions)
+
 
+def _update_pending_actions(pending_actions: List[TxAction]) -> Set[Tuple[str, str]]:
+    """
+    Update the pending actions by the transactions on chain
+    :param pending_actions: pending actions
+    :return: (chain_code, txid) of the actions confirmed
+    """
     if not pending_actions:
-        return
+        return set()
 
     txids_of_chain = {(i.chain_code, i.txid) for i in pending_actions}
-    confirmed_txids = set()
+    confirmed_txids_of_chain = set()
 
-    for chain_code, tx in _query_transactions_of_chain(txids_of_chain):
-        try:
+    for chain_code, transactions in _query_transactions_of_chain(txids_of_chain):
+        confirmed_transactions = []
+        for tx in transactions:
             action_status = TX_TO_ACTION_STATUS_DIRECT_MAPPING.get(tx.status)
             if tx.fee is None or tx.block_header is None or action_status is None:
                 continue
 
-            _on_transaction_confirmed(
-                chain_code=chain_code,
-                txid=tx.txid,
-                status=action_status,
-                fee_used=Decimal(tx.fee.used),
-                block_hash=tx.block_header.block_hash,
-                block_number=tx.block_header.block_number,
-                block_time=tx.block_header.block_time,
+            confirmed_transactions.append(
+                dict(
+                    txid=tx.txid,
+                    status=action_status,
+                    fee_used=Decimal(tx.fee.used),
+                    block_hash=tx.block_header.block_hash,
+                    block_number=tx.block_header.block_number,
+                    block_time=tx.block_header.block_time,
+                )
             )
-            confirmed_txids.add(tx.txid)
+
+        if not confirmed_transactions:
+            continue
+
+        try:
+            _on_transactions_confirmed(chain_code, confirmed_transactions)
+            confirmed_txids_of_chain.update((chain_code, i["txid"]) for i in confirmed_transactions)
             logger.info(
-                f"TxAction confirmed. chain_code: {chain_code}, txid: {tx.txid}, action_status: {action_status}"
+                f"TxActions confirmed. chain_code: {chain_code}, "
+                f"txids: {[(i['txid'], i['status']) for i in confirmed_transactions]}"
             )
         except Exception as e:
-            logger.exception(f"Error in updating actions. chain_code: {chain_code}, txid: {tx.txid}, error: {repr(e)}")
+            logger.exception(f"Error in updating actions. chain_code: {chain_code}, error: {repr(e)}")
+            continue
 
-    unconfirmed_actions = [i for i in pending_actions if i.txid not in confirmed_txids]
+        confirmed_txids = {i["txid"] for i in confirmed_transactions}
+        _notify_actions_changed(
+            chain_code,
+            itertools.chain.from_iterable(
+                (i.from_address, i.to_address)
+                for i in pending_actions
+                if i.chain_code == chain_code and i.txid in confirmed_txids
+            ),
+        )
+
+    unconfirmed_actions = [i for i in pending_actions if (i.chain_code, i.txid) not in confirmed_txids_of_chain]
     if not unconfirmed_actions:
-        return
+        return confirmed_txids_of_chain
 
     now = datetime.datetime.now()
     too_old = datetime.timedelta(days=3)
@@ -119,18 +168,21 @@ def update_pending_actions(
         for chain_code, txid in too_old_txids:
             daos.update_actions_status(chain_code, txid, status=TxActionStatus.UNKNOWN)
 
+    return confirmed_txids_of_chain
+
 
-def _query_transactions_of_chain(txids_of_chain: Iterable[Tuple[str, str]]) -> Iterable[Tuple[str, Transaction]]:
+def _query_transactions_of_chain(txids_of_chain: Iterable[Tuple[str, str]]) -> Iterable[Tuple[str, List[Transaction]]]:
     txids_of_chain = sorted(txids_of_chain, key=lambda i: i[0])  # in order to use itertools.groupby
 
     for chain_code, group in itertools.groupby(txids_of_chain, key=lambda i: i[0]):
-        for (_, txid) in group:
-            try:
-                yield chain_code, provider_manager.get_transaction_by_txid(chain_code, txid)
-            except Exception as e:
-                logger.exception(
-                    f"Error in getting transaction by txid. chain_code: {chain_code}, txid: {txid}, error: {repr(e)}"
-                )
+        txids = [txid for _, txid in group]
+        try:
+            transactions = provider_manager.get_transactions_by_txids(chain_code, txids)
+            yield chain_code, [i for i in transactions if i is not None]
+        except Exception as e:
+            logger.exception(
+                f"Error in getting transactions by txids. chain_code: {chain_code}, txids: {txids}, error: {repr(e)}"
+            )
 
 
 def _search_txs_by_address(
@@ -253,14 +305,20 @@ def query_actions_by_address(
     page_number: int = 1,
     items_per_page: int = 20,
     searching_address_as: Literal["sender", "receiver", "both"] = "both",
+    cursor: Tuple[datetime.datetime, int] = None,
 ) -> List[TxAction]:
+    """
+    Query actions by address, the latest first
+    :param cursor: (created_time, id) of the last action of the previous page,
+    deep pages are much cheaper to query by cursor than by page_number
+    """
     with timeout_lock("transaction_manager.query_actions_by_address") as acquired:
         if not acquired:
             return []
 
         address = provider_manager.verify_address(chain_code, address).normalized_address
         page_number = max(page_number, 1)
-        is_first_page = page_number == 1
+        is_first_page = page_number == 1 and cursor is None
 
         archived_id_cache_key = f"{chain_code}:{address}"
         archived_id = _LAST_ARCHIVED_ID_CACHE.get(archived_id_cache_key)
@@ -279,6 +337,7 @@ def query_actions_by_address(
                 page_number=page_number,
                 archived_ids=[archived_id, None],
                 searching_address_as=searching_address_as,
+                cursor=cursor,
             )
 
             if (
@@ -351,6 +410,9 @@ def _sync_actions_by_address(chain_code: str, address: str, archived_id: int, re
             daos.bulk_create(to_be_created_actions)
             expand_count += len(to_be_created_actions)
 
+    if to_be_confirmed_actions or to_be_created_actions:
+        _notify_actions_changed(chain_code, [address])
+
     return expand_count
 
 
@@ -394,11 +456,248 @@ def _on_transaction_confirmed(
         daos.update_actions_status(chain_code, txid, TxActionStatus.REPLACED)
 
 
+@db.atomic()
+def _on_transactions_confirmed(chain_code: str, confirmed_transactions: List[dict]):
+    """
+    Bulk version of _on_transaction_confirmed, all the changes are committed in one transaction
+    :param chain_code: chain code
+    :param confirmed_transactions: list of dict with keys txid, status, fee_used, block_hash, block_number, block_time
+    """
+    for tx in confirmed_transactions:
+        require(tx["status"] in (TxActionStatus.CONFIRM_SUCCESS, TxActionStatus.CONFIRM_REVERTED))
+        daos.on_transaction_confirmed(chain_code=chain_code, **tx)
+
+    chain_info = coin_manager.get_chain_info(chain_code)
+    if chain_info.nonce_supported is not True:
+        return
+
+    confirmed_txids = [i["txid"] for i in confirmed_transactions]
+    main_actions = daos.query_actions_by_txids(chain_code, confirmed_txids, index=0)
+    address_nonce_pairs = list({(i.from_address, i.nonce) for i in main_actions if i.nonce >= 0})
+
+    replaced_action_txids = daos.query_pending_txids_by_nonces(chain_code, address_nonce_pairs)
+    replaced_action_txids.difference_update(confirmed_txids)
+    if replaced_action_txids:
+        daos.update_actions_status_by_txids(chain_code, list(replaced_action_txids), TxActionStatus.REPLACED)
+
+
 def delete_actions_by_addresses(chain_code: str, addresses: List[str]) -> int:
+    daos.delete_transfer_log_checkpoints(chain_code, addresses)
     return daos.delete_actions_by_addresses(chain_code, addresses)
 
 
-@on_interval(60)
+_TRANSFER_LOG_BLOCK_RANGES: Dict[str, int] = {}  # chain_code -> blocks per request, adapted to the node
+
+
+def index_token_transfers(chain_code: str, addresses: List[str]) -> int:
+    """
+    Index the token transfers of the addresses by scanning the transfer logs on chain, without any explorer api.
+    The block range of each request is halved if the node refuses it as too wide, and doubled if not.
+    The progress is saved per address, so that the indexing continues from the checkpoint next time
+    :param chain_code: chain code
+    :param addresses: addresses to index
+    :return: number of actions created
+    """
+    config = settings.TOKEN_TRANSFER_INDEXER
+    to_block = provider_manager.get_best_block_number(chain_code) - config["confirmations"]
+    checkpoints = daos.query_transfer_log_checkpoints(chain_code, addresses)
+    new_addresses = [i for i in dict.fromkeys(addresses) if i not in checkpoints]
+    if new_addresses:
+        checkpoints.update(_init_transfer_log_checkpoints(chain_code, new_addresses, max(to_block + 1, 0)))
+
+    addresses_of_next_block = collections.defaultdict(list)
+    for address in dict.fromkeys(addresses):
+        addresses_of_next_block[checkpoints[address]].append(address)
+
+    next_blocks = sorted(addresses_of_next_block)
+    from_block = next_blocks[0] if next_blocks else to_block + 1
+    addresses_scanning = []
+    requests_left = config["max_requests"]
+    created_count = 0
+
+    while from_block <= to_block and requests_left > 0:
+        while next_blocks and next_blocks[0] <= from_block:  # join the scanning once it reaches their checkpoint
+            addresses_scanning = [*addresses_scanning, *addresses_of_next_block[next_blocks.pop(0)]]
+
+        requests_left -= 1
+        block_range = _TRANSFER_LOG_BLOCK_RANGES.get(chain_code, config["initial_block_range"])
+        end_block = min(from_block + block_range - 1, to_block, next_blocks[0] - 1 if next_blocks else to_block)
+
+        try:
+            logs = provider_manager.search_token_transfer_logs(chain_code, addresses_scanning, from_block, end_block)
+        except TooManyTransferLogs:
+            if block_range <= 1:
+                logger.warning(f"Too many transfer logs in one block. chain_code: {chain_code}, block: {from_block}")
+                break
+
+            _TRANSFER_LOG_BLOCK_RANGES[chain_code] = max(block_range // 2, 1)
+            continue
+
+        created, next_block = _save_token_transfers(chain_code, addresses_scanning, logs, end_block + 1)
+        created_count += created
+        if next_block <= end_block:  # deferred from the block of the tx failed to get, try again next time
+            break
+
+        _TRANSFER_LOG_BLOCK_RANGES[chain_code] = min(block_range * 2, config["max_block_range"])
+        from_block = end_block + 1
+
+    return created_count
+
+
+def _init_transfer_log_checkpoints(chain_code: str, addresses: List[str], tip_block: int) -> Dict[str, int]:
+    """
+    Start the addresses without checkpoint from the configured block, or else from their first known action,
+    or from the tip if none. The checkpoints of the latter are saved at once, so that the blocks since then are
+    not skipped even if no scanning happens this time
+    """
+    start_block = settings.TOKEN_TRANSFER_INDEXER["start_block"]
+    if start_block is not None:
+        return dict.fromkeys(addresses, start_block)
+
+    first_block_numbers = daos.query_first_block_numbers(chain_code, addresses)
+    checkpoints = {i: first_block_numbers.get(i, tip_block) for i in addresses}
+
+    addresses_of_next_block = collections.defaultdict(list)
+    for address, next_block in checkpoints.items():
+        addresses_of_next_block[next_block].append(address)
+
+    with db.atomic():
+        for next_block, addresses_to_save in addresses_of_next_block.items():
+            daos.save_transfer_log_checkpoints(chain_code, addresses_to_save, next_block)
+
+    return checkpoints
+
+
+def _save_token_transfers(
+    chain_code: str, addresses: List[str], logs: List[TokenTransferLog], next_block: int
+) -> Tuple[int, int]:
+    """
+    Save the actions of the transfer logs, and move the checkpoints of the addresses to next_block.
+    If any tx failed to get, the txs since its block are deferred, and the checkpoints stay at that block
+    :return: number of actions created, and the block number the checkpoints moved to
+    """
+    txids = list(dict.fromkeys(i.txid for i in logs))
+    existing_txids = daos.filter_existing_txids(chain_code, txids) if txids else set()
+    txids = [i for i in txids if i not in existing_txids]
+
+    actions = []
+    if txids:
+        transactions = provider_manager.get_transactions_by_txids(chain_code, txids)
+        failed_txids = {txid for txid, tx in zip(txids, transactions) if tx is None}
+        if failed_txids:
+            next_block = min(i.block_number for i in logs if i.txid in failed_txids)
+            logger.warning(
+                f"Failed to get transactions, defer the indexing since block {next_block}. "
+                f"chain_code: {chain_code}, txids: {sorted(failed_txids)}"
+            )
+            deferred_txids = {i.txid for i in logs if i.block_number >= next_block}
+            transactions = [i for i in transactions if i is not None and i.txid not in deferred_txids]
+
+        involved_addresses = set(addresses)
+        logs_of_txid = collections.defaultdict(list)
+        for log in logs:
+            if log.from_address in involved_addresses or log.to_address in involved_addresses:
+                logs_of_txid[log.txid].append(log)
+
+        transactions = [  # the token transfers follow the main coin one, likes blockbook
+            tx.clone(
+                inputs=[
+                    *tx.inputs,
+                    *(
+                        TransactionInput(address=i.from_address, value=i.value, token_address=i.token_address)
+                        for i in logs_of_txid[tx.txid]
+                    ),
+                ],
+                outputs=[
+                    *tx.outputs,
+                    *(
+                        TransactionOutput(address=i.to_address, value=i.value, token_address=i.token_address)
+                        for i in logs_of_txid[tx.txid]
+                    ),
+                ],
+            )
+            for tx in transactions
+        ]
+        actions = list(_tx_action_factory__account_model(chain_code, transactions))
+
+    with db.atomic():
+        if actions:
+            daos.bulk_create(actions)
+
+        daos.save_transfer_log_checkpoints(chain_code, addresses, next_block)
+
+    if actions:
+        _notify_actions_changed(
+            chain_code, itertools.chain.from_iterable((i.from_address, i.to_address) for i in actions)
+        )
+
+    return len(actions), next_block
+
+
+def get_pending_chain_codes() -> Set[str]:
+    return daos.query_chain_codes_by_status(TxActionStatus.PENDING)
+
+
+_PENDING_CHECK_SCHEDULES: Dict[Tuple[str, str], Tuple[int, int]] = {}  # (chain_code, txid) -> (times, next block)
+
+
+@timing_logger("transaction_manager.on_new_block")
+def on_new_block(chain_code: str, block_number: int):
+    """
+    Re-check the pending actions of the chain once its tip advanced.
+    The actions keeping pending are re-checked with exponential backoff, i.e. after 1, 2, 4 ... new blocks
+    :param chain_code: chain code
+    :param block_number: the best block number
+    """
+    pending_actions = daos.query_actions_by_status(TxActionStatus.PENDING, chain_code=chain_code)
+    pending_txids = {i.txid for i in pending_actions}
+
+    for key in [i for i in _PENDING_CHECK_SCHEDULES if i[0] == chain_code and i[1] not in pending_txids]:
+        _PENDING_CHECK_SCHEDULES.pop(key)
+
+    due_actions = [
+        i for i in pending_actions if _PENDING_CHECK_SCHEDULES.get((chain_code, i.txid), (0, 0))[1] <= block_number
+    ]
+    if not due_actions:
+        return
+
+    confirmed_txids_of_chain = _update_pending_actions(due_actions)
+    max_backoff_blocks = settings.TX_TRACKING["max_backoff_blocks"]
+
+    for txid in {i.txid for i in due_actions}:
+        key = (chain_code, txid)
+        if key in confirmed_txids_of_chain:
+            _PENDING_CHECK_SCHEDULES.pop(key, None)
+            continue
+
+        times = _PENDING_CHECK_SCHEDULES.get(key, (0, 0))[0] + 1
+        _PENDING_CHECK_SCHEDULES[key] = (times, block_number + min(2 ** (times - 1), max_backoff_blocks))
+
+
+_FALLBACK_CHECK_TIMES: Dict[str, float] = {}  # chain_code -> the time re-checked by the fallback last
+
+
 @timing_logger("transaction_manager.on_ticker_signal")
 def on_ticker_signal():
-    update_pending_actions()
+    if not block_watcher.is_watching():
+        update_pending_actions()
+        return
+
+    # the pending actions are tracked by on_new_block instead, except for the chains whose watcher
+    # has not reported a new block for a while, e.g. failed to get the best block number, which are polled slowly
+    now = time.time()
+    interval = settings.TX_TRACKING["fallback_check_interval"]
+    chain_codes = get_pending_chain_codes()
+
+    for chain_code in set(_FALLBACK_CHECK_TIMES) - chain_codes:
+        _FALLBACK_CHECK_TIMES.pop(chain_code)
+
+    for chain_code in sorted(chain_codes):
+        last_time = max(
+            block_watcher.get_last_new_block_time(chain_code) or 0, _FALLBACK_CHECK_TIMES.get(chain_code, 0)
+        )
+        if now - last_time < interval:
+            continue
+
+        _FALLBACK_CHECK_TIMES[chain_code] = now
+        update_pending_actions(chain_code=chain_code)
@@ -0,0 +1,7 @@
+def update(db, migrator, migrate):
+    migrate(
+        migrator.add_index("txaction", ("chain_code", "from_address", "created_time"), False),
+        migrator.add_index("txaction", ("chain_code", "to_address", "created_time"), False),
+        migrator.add_index("txaction", ("chain_code", "txid", "status"), False),
+        migrator.add_index("txaction", ("chain_code", "from_address", "nonce"), False),
+    )
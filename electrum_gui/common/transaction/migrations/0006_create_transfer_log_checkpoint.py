@@ -0,0 +1,18 @@
+import peewee
+
+from electrum_gui.common.basic.orm.models import AutoDateTimeField, BaseModel
+
+
+def update(db: peewee.Database, migrator, migrate):
+    class TransferLogCheckpoint(BaseModel):
+        id = peewee.AutoField(primary_key=True)
+        chain_code = peewee.CharField()
+        address = peewee.CharField()
+        next_block = peewee.IntegerField()
+        created_time = AutoDateTimeField()
+        modified_time = AutoDateTimeField()
+
+        class Meta:
+            indexes = ((("chain_code", "address"), True),)
+
+    db.create_tables((TransferLogCheckpoint,))
@@ -34,4 +34,22 @@ class TxAction(BaseModel):
         )
 
     class Meta:
-        indexes = ((("txid", "coin_code", "index"), True),)
+        indexes = (
+            (("txid", "coin_code", "index"), True),
+            (("chain_code", "from_address", "created_time"), False),
+            (("chain_code", "to_address", "created_time"), False),
+            (("chain_code", "txid", "status"), False),
+            (("chain_code", "from_address", "nonce"), False),
+        )
+
+
+class TransferLogCheckpoint(BaseModel):
+    id = peewee.AutoField(primary_key=True)
+    chain_code = peewee.CharField()
+    address = peewee.CharField()
+    next_block = peewee.IntegerField(help_text="the block number to scan the transfer logs from")
+    created_time = AutoDateTimeField()
+    modified_time = AutoDateTimeField()
+
+    class Meta:
+        indexes = ((("chain_code", "address"), True),)
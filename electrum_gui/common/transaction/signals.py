@@ -0,0 +1,4 @@
+from electrum_gui.common.basic.functional.signal import Signal
+
+# send(chain_code=..., addresses=...) once the actions of the addresses are created or confirmed
+actions_changed_signal = Signal("tx_actions_changed")
@@ -2,7 +2,7 @@ import datetime
 from decimal import Decimal
 from typing import List, Optional
 
-from electrum_gui.common.wallet.models import AssetModel
+from electrum_gui.common.wallet.models import AccountModel, AssetModel
 
 
 def create_asset(
@@ -46,6 +46,37 @@ def query_assets_by_ids(asset_ids: List[int]) -> List[AssetModel]:
     return list(models)
 
 
+def query_dirty_assets() -> List[AssetModel]:
+    models = AssetModel.select().where(AssetModel.is_dirty == True).order_by(AssetModel.id)  # noqa
+    return list(models)
+
+
+def mark_assets_dirty(asset_ids: List[int], is_dirty: bool = True) -> int:
+    if not asset_ids:
+        return 0
+
+    return AssetModel.update(is_dirty=is_dirty).where(AssetModel.id.in_(asset_ids)).execute()
+
+
+def mark_assets_dirty_by_addresses(chain_code: str, addresses: List[str]) -> int:
+    account_ids = AccountModel.select(AccountModel.id).where(
+        AccountModel.chain_code == chain_code, AccountModel.address.in_(addresses)
+    )
+    return (
+        AssetModel.update(is_dirty=True)
+        .where(AssetModel.account_id.in_(account_ids), AssetModel.is_dirty == False)  # noqa
+        .execute()
+    )
+
+
+def mark_stale_assets_dirty(modified_before: datetime.datetime) -> int:
+    return (
+        AssetModel.update(is_dirty=True)
+        .where(AssetModel.modified_time < modified_before, AssetModel.is_dirty == False)  # noqa
+        .execute()
+    )
+
+
 def bulk_update_balance(assets: List[AssetModel]):
     now = datetime.datetime.now()
     for i in assets:
@@ -5,6 +5,7 @@ import decimal
 import functools
 import itertools
 import logging
+from concurrent import futures
 from typing import Iterable, List, Tuple, Union
 
 import eth_account
@@ -17,14 +18,16 @@ from electrum_gui.common.basic.orm import database as orm_database
 from electrum_gui.common.coin import codes
 from electrum_gui.common.coin import data as coin_data
 from electrum_gui.common.coin import manager as coin_manager
+from electrum_gui.common.conf import settings
 from electrum_gui.common.hardware import manager as hardware_manager
 from electrum_gui.common.provider import data as provider_data
+from electrum_gui.common.provider import exceptions as provider_exceptions
 from electrum_gui.common.provider import manager as provider_manager
 from electrum_gui.common.secret import data as secret_data
 from electrum_gui.common.secret import manager as secret_manager
 from electrum_gui.common.transaction import data as transaction_data
 from electrum_gui.common.transaction import manager as transaction_manager
-from electrum_gui.common.wallet import daos, data, exceptions, models, utils
+from electrum_gui.common.wallet import daos, data, exceptions, models, signals, utils
 from electrum_gui.common.wallet.handlers import get_handler_by_chain_model
 
 logger = logging.getLogger("app.wallet")
@@ -221,56 +224,115 @@ def search_existing_wallets(
     mnemonic: str,
     passphrase: str = None,
     bip44_max_searching_address_index: int = 20,
+    bip44_gap_limit: int = 20,
 ) -> List[dict]:
+    """
+    Search the existing wallets derived from the mnemonic, chains are searched concurrently
+    :param chain_codes: chains to search
+    :param mnemonic: mnemonic
+    :param passphrase: passphrase, optional
+    :param bip44_max_searching_address_index: max number of addresses to search for each address encoding
+    :param bip44_gap_limit: stop searching an address encoding after N unused addresses in a row
+    :return: list of the existing wallets, or the first candidate if nothing existing on the chain
+    """
     require(0 < bip44_max_searching_address_index <= 20)
+    require(bip44_gap_limit > 0)
 
-    result = []
     master_seed = secret_manager.mnemonic_to_seed(mnemonic, passphrase=passphrase)
+    chain_infos = [coin_manager.get_chain_info(chain_code) for chain_code in chain_codes]
+
+    with futures.ThreadPoolExecutor(max_workers=max(len(chain_infos), 1)) as executor:
+        tasks = [
+            executor.submit(
+                _search_existing_wallets_on_chain,
+                chain_info,
+                master_seed,
+                bip44_max_searching_address_index,
+                bip44_gap_limit,
+            )
+            for chain_info in chain_infos
+        ]
+        return [wallet for task in tasks for wallet in task.result()]
 
-    for chain_code in chain_codes:
-        chain_info = coin_manager.get_chain_info(chain_code)
-        candidates: List[dict] = []
 
-        with timing_logger(f"search_existing_{chain_code}_wallets"):
-            for address_encoding, path in _generate_searching_bip44_address_paths(
+def _search_existing_wallets_on_chain(
+    chain_info: coin_data.ChainInfo,
+    master_seed: bytes,
+    bip44_max_searching_address_index: int,
+    bip44_gap_limit: int,
+) -> List[dict]:
+    chain_code = chain_info.chain_code
+    candidates_by_encoding = collections.defaultdict(list)
+
+    with timing_logger(f"search_existing_{chain_code}_wallets"):
+        searching_paths = list(
+            _generate_searching_bip44_address_paths(
                 chain_info, bip44_max_searching_address_index=bip44_max_searching_address_index
-            ):
-                verifier = secret_manager.raw_create_key_by_master_seed(chain_info.curve, master_seed, path)
-                address = provider_manager.pubkey_to_address(chain_code, verifier, encoding=address_encoding)
-                candidates.append(
-                    {
-                        "chain_code": chain_code,
-                        "bip44_path": path,
-                        "address_encoding": address_encoding,
-                        "address": address,
-                    }
-                )
+            )
+        )
+        verifiers = secret_manager.raw_create_keys_by_master_seed(
+            chain_info.curve, master_seed, [path for _, path in searching_paths]
+        )
+        for (address_encoding, path), verifier in zip(searching_paths, verifiers):
+            address = provider_manager.pubkey_to_address(chain_code, verifier, encoding=address_encoding)
+            candidates_by_encoding[address_encoding].append(
+                {
+                    "chain_code": chain_code,
+                    "bip44_path": path,
+                    "address_encoding": address_encoding,
+                    "address": address,
+                }
+            )
 
-            existing_wallets = []
-            for candidate in candidates:
-                try:
-                    address_info = provider_manager.get_address(candidate["chain_code"], candidate["address"])
-                    candidate["balance"] = address_info.balance
-                    if address_info.existing:
+        existing_wallets = []
+        for candidates in candidates_by_encoding.values():
+            searching_end, checked_count = bip44_gap_limit, 0
+
+            while checked_count < min(searching_end, len(candidates)):
+                window = candidates[checked_count : min(searching_end, len(candidates))]
+                _fill_candidates_by_address_info(chain_code, window)
+
+                for index, candidate in enumerate(window, start=checked_count):
+                    if candidate.pop("existing", False):
                         existing_wallets.append(candidate)
-                except Exception as e:
-                    logger.exception(f"Error in get address. chain_code: {chain_code}, address: {address}, error: {e}")
+                        searching_end = index + 1 + bip44_gap_limit
+
+                checked_count += len(window)
+
+    if existing_wallets:
+        return [
+            {
+                "name": f"{wallet['chain_code'].upper()}-{index + 1}",
+                **wallet,
+            }
+            for index, wallet in enumerate(existing_wallets)
+        ]
+    else:
+        first_wallet = next(iter(candidates_by_encoding.values()))[0]
+        first_wallet["name"] = f"{first_wallet['chain_code'].upper()}-1"
+        return [first_wallet]
 
-            if existing_wallets:
-                existing_wallets = [
-                    {
-                        "name": f"{wallet['chain_code'].upper()}-{index + 1}",
-                        **wallet,
-                    }
-                    for index, wallet in enumerate(existing_wallets)
-                ]
-                result.extend(existing_wallets)
-            else:
-                first_wallet = candidates[0]
-                first_wallet["name"] = f"{first_wallet['chain_code'].upper()}-1"
-                result.append(first_wallet)
 
-    return result
+_BATCH_GET_ADDRESS_TIMES = 3
+
+
+def _fill_candidates_by_address_info(chain_code: str, candidates: List[dict]):
+    """
+    Fill the address info of candidates, the failed batch is retried and then raised,
+    instead of being treated as not existing, which would stop searching by the gap limit
+    """
+    for times in range(1, _BATCH_GET_ADDRESS_TIMES + 1):
+        try:
+            address_infos = provider_manager.batch_get_address(chain_code, [i["address"] for i in candidates])
+            break
+        except Exception as e:
+            logger.warning(f"Error in batch get address. chain_code: {chain_code}, times: {times}, error: {e}")
+            if times >= _BATCH_GET_ADDRESS_TIMES:
+                raise
+
+    for candidate, address_info in zip(candidates, address_infos):
+        candidate["balance"] = address_info.balance
+        candidate["existing"] = address_info.existing
 
 
 def _generate_searching_bip44_address_paths(
@@ -497,7 +559,6 @@ def get_wallet_info_by_id(wallet_id: int, only_visible: bool = True) -> dict:
     wallet_model = _get_wallet_by_id(wallet_id)
     default_account = get_default_account_by_wallet(wallet_id)
     assets = daos.asset.query_assets_by_accounts([default_account.id], only_visible=only_visible)
-    assets = refresh_assets(assets)
     return _build_wallet_info(wallet_model, default_account, assets)
 
 
@@ -547,7 +608,8 @@ def get_all_wallets_info(chain_code: str = None, force_update: bool = False, onl
     accounts = daos.account.query_accounts_by_wallets([i.id for i in wallets])
 
     assets = daos.asset.query_assets_by_accounts([i.id for i in accounts], only_visible=only_visible)
-    assets = refresh_assets(assets, force_update=force_update)
+    if force_update:
+        assets = refresh_assets(assets, force_update=True)  # i.e. pull to refresh
 
     last_account_lookup = {i.wallet_id: i for i in accounts}  # bind the last account to the wallet
     asset_lookup = collections.defaultdict(list)
@@ -775,6 +837,9 @@ def create_or_show_asset(wallet_id: int, coin_code: str):
         daos.asset.create_asset(wallet_id, default_account.id, default_account.chain_code, coin_code, is_visible=True)
     else:
         daos.asset.show_asset(asset.id)
+        daos.asset.mark_assets_dirty([asset.id])
+
+    _notify_assets_changed([wallet_id])
 
 
 def hide_asset(wallet_id: int, coin_code: str):
@@ -785,45 +850,138 @@ def hide_asset(wallet_id: int, coin_code: str):
         raise exceptions.IllegalWalletOperation(f"Asset not found. wallet_id: {wallet_id}, coin_code: {coin_code}")
 
     daos.asset.hide_asset(asset.id)
+    _notify_assets_changed([wallet_id])
 
 
-def refresh_assets(
-    assets: List[models.AssetModel], force_update: bool = False, cache_in_seconds: int = 10
-) -> List[models.AssetModel]:
-    need_update_flag_datetime = datetime.datetime.now() - datetime.timedelta(seconds=cache_in_seconds)
-    need_update_assets = assets if force_update else [i for i in assets if i.modified_time < need_update_flag_datetime]
+def refresh_assets(assets: List[models.AssetModel], force_update: bool = False) -> List[models.AssetModel]:
+    """
+    Refresh the balances of the dirty assets, or all the assets if force_update
+    :param assets: assets
+    :param force_update: refresh all the assets no matter dirty or not
+    :return: the same assets, with the balances refreshed
+    """
+    need_update_assets = assets if force_update else [i for i in assets if i.is_dirty]
 
     if not need_update_assets:
         return assets
 
+    # clean the flags before fetching, so that the assets marked dirty in the meantime will be refreshed again
+    daos.asset.mark_assets_dirty([i.id for i in need_update_assets], is_dirty=False)
+
     accounts = daos.account.query_accounts_by_ids([i.account_id for i in need_update_assets])
     accounts_lookup = {i.id: i for i in accounts}
     coins = coin_manager.query_coins_by_codes([i.coin_code for i in need_update_assets])
     coins_lookup = {i.code: i for i in coins}
 
+    # never retry the assets whose account or coin is missing, or they stay dirty forever
+    unresolved_asset_ids = {
+        i.id for i in need_update_assets if i.account_id not in accounts_lookup or i.coin_code not in coins_lookup
+    }
+    if unresolved_asset_ids:
+        logger.warning(f"Skip the assets without account or coin. asset_ids: {sorted(unresolved_asset_ids)}")
+
     updated_assets = []
+    changed_wallet_ids = set()
     need_update_assets = sorted(need_update_assets, key=lambda i: (i.chain_code, i.account_id))
     for chain_code, group in itertools.groupby(need_update_assets, key=lambda i: i.chain_code):
-        for account_id, sub_group in itertools.groupby(group, key=lambda i: i.account_id):
-            for asset in sub_group:  # todo batch
-                try:
-                    account = accounts_lookup[account_id]
-                    coin = coins_lookup[asset.coin_code]
-                    balance = provider_manager.get_balance(chain_code, account.address, coin.token_address)
-                    asset.balance = decimal.Decimal(balance)
-                    updated_assets.append(asset)
-                except Exception as e:
-                    logger.exception(
-                        f"Error in get balance by asset. chain_code: {chain_code}, coin_code: {asset.coin_code}, "
-                        f"account_id: {account_id}, error: {e}"
-                    )
+        group = [i for i in group if i.id not in unresolved_asset_ids]
+        pairs = [(accounts_lookup[i.account_id].address, coins_lookup[i.coin_code].token_address) for i in group]
+
+        try:
+            balances = provider_manager.batch_get_balance(chain_code, pairs)
+        except Exception as e:
+            logger.exception(f"Error in batch get balance by assets. chain_code: {chain_code}, error: {e}")
+            continue
+
+        for asset, balance in zip(group, balances):
+            if balance is None:
+                logger.warning(
+                    f"Failed to get balance by asset. chain_code: {chain_code}, coin_code: {asset.coin_code}, "
+                    f"account_id: {asset.account_id}"
+                )
+                continue
+
+            if asset.balance != balance:
+                changed_wallet_ids.add(asset.wallet_id)
+
+            asset.balance = decimal.Decimal(balance)
+            updated_assets.append(asset)
+
+    updated_asset_ids = {i.id for i in updated_assets}
+    failed_asset_ids = [i.id for i in need_update_assets if i.id not in updated_asset_ids | unresolved_asset_ids]
+    for asset in need_update_assets:
+        asset.is_dirty = asset.id in failed_asset_ids
 
     with orm_database.db.atomic():
         daos.asset.bulk_update_balance(updated_assets)
+        daos.asset.mark_assets_dirty(failed_asset_ids)  # retry later
+
+    if changed_wallet_ids:
+        _notify_assets_changed(changed_wallet_ids)
 
     return assets
 
 
+def _notify_assets_changed(wallet_ids: Iterable[int]):
+    wallet_ids = sorted(set(wallet_ids))
+    try:
+        signals.assets_changed_signal.send(wallet_ids=wallet_ids)
+    except Exception:
+        logger.exception(f"Error in sending assets changed signal. wallet_ids: {wallet_ids}")
+
+
+def refresh_dirty_assets(batch_size: int = 50) -> int:
+    """
+    Refresh the dirty assets in batches
+    :param batch_size: max number of assets refreshed in one batch
+    :return: number of dirty assets
+    """
+    assets = daos.asset.query_dirty_assets()
+
+    for i in range(0, len(assets), batch_size):
+        refresh_assets(assets[i : i + batch_size])
+
+    return len(assets)
+
+
+def mark_assets_dirty_by_addresses(chain_code: str, addresses: List[str]) -> int:
+    return daos.asset.mark_assets_dirty_by_addresses(chain_code, addresses)
+
+
+def on_actions_changed(chain_code: str, addresses: List[str]):
+    mark_assets_dirty_by_addresses(chain_code, addresses)
+
+
+@timing_logger("wallet_manager.index_token_transfers")
+def index_token_transfers():
+    """
+    Index the token transfers of all the accounts, only for the chains with client supporting it
+    """
+    wallets = daos.wallet.list_all_wallets()
+    accounts = daos.account.query_accounts_by_wallets([i.id for i in wallets])
+    accounts = sorted(accounts, key=lambda i: i.chain_code)
+
+    for chain_code, group in itertools.groupby(accounts, key=lambda i: i.chain_code):
+        if coin_manager.get_chain_info(chain_code).chain_model != coin_data.ChainModel.ACCOUNT:
+            continue
+
+        addresses = [i.address for i in group]
+        try:
+            transaction_manager.index_token_transfers(chain_code, addresses)
+        except provider_exceptions.NoAvailableClient:
+            continue
+        except Exception as e:
+            logger.exception(f"Error in indexing token transfers. chain_code: {chain_code}, error: {e}")
+
+
+@timing_logger("wallet_manager.on_ticker_signal")
+def on_ticker_signal():
+    config = settings.ASSET_REFRESH
+    # the incoming transfers may not be noticed by any event, so refresh the stale assets as a fallback
+    daos.asset.mark_stale_assets_dirty(datetime.datetime.now() - datetime.timedelta(seconds=config["max_age"]))
+    refresh_dirty_assets(batch_size=config["batch_size"])
+
+
 @functools.lru_cache
 def get_default_bip44_path(chain_code: str, address_encoding: str = None) -> bip44.BIP44Path:
     chain_info = coin_manager.get_chain_info(chain_code)
@@ -0,0 +1,7 @@
+import peewee
+
+
+def update(db, migrator, migrate):
+    migrate(
+        migrator.add_column("assetmodel", "is_dirty", peewee.BooleanField(default=True)),
+    )
@@ -40,6 +40,7 @@ class AssetModel(BaseModel):
     coin_code = peewee.CharField()
     balance = peewee.DecimalField(default=0)
     is_visible = peewee.BooleanField(default=True)
+    is_dirty = peewee.BooleanField(default=True, help_text="Balance needs to be refreshed")
     created_time = AutoDateTimeField()
     modified_time = AutoDateTimeField()
 
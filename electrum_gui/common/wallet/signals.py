@@ -0,0 +1,4 @@
+from electrum_gui.common.basic.functional.signal import Signal
+
+# send(wallet_ids=...) once the balances or the visibility of the assets of the wallets changed
+assets_changed_signal = Signal("assets_changed")